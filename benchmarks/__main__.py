@@ -0,0 +1,42 @@
+import argparse
+import os
+import tempfile
+
+from benchmarks.benchmark_report import BenchmarkReport
+from benchmarks.benchmark_runner import BenchmarkRunner
+from benchmarks.scenarios import SCENARIOS
+
+REPORTS_PATH = os.path.join(".roundtable", "benchmarks")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the discussion pipeline against a local OpenAI compatible "
+                                                 "stub server and report the framework overhead.")
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds the stub server waits before every reply.')
+    parser.add_argument('--repetitions', type=int, default=3,
+                        help='Runs of every scenario, the median is reported.')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS), default=None,
+                        help='Scenario to run, can be repeated. All scenarios are run by default.')
+    parser.add_argument('--output', default=None,
+                        help=f'Report file, defaults to {REPORTS_PATH}/<commit>.json.')
+    parser.add_argument('--compare', metavar='REPORT', default=None,
+                        help='Previous report to compare the results with.')
+    args = parser.parse_args()
+
+    scenarios = {name: SCENARIOS[name] for name in args.scenario or SCENARIOS}
+    with tempfile.TemporaryDirectory(prefix="roundtable-benchmark-") as work_dir:
+        report = BenchmarkRunner(scenarios, work_dir, latency=args.latency, repetitions=args.repetitions).run()
+
+    output_path = args.output or os.path.join(REPORTS_PATH, f"{report.commit or report.created_at}.json")
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as report_file:
+        report_file.write(report.json(indent=2))
+    print(report.format())
+    print(f"Report saved to {output_path}")
+    if args.compare:
+        print(report.compare(BenchmarkReport.parse_file(args.compare)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+from typing import Optional
+
+from roundtable.models.custom_base_model import CustomBaseModel
+
+COMPARED_METRICS = ["rounds", "llm_calls", "room_build_time", "wall_time", "overhead_per_round", "peak_memory_mb"]
+
+
+class ScenarioResult(CustomBaseModel):
+    name: str
+    rounds: int = 0
+    llm_calls: int = 0
+    room_build_time: float = 0.0
+    wall_time: float = 0.0
+    llm_time: float = 0.0
+    overhead_per_round: float = 0.0
+    peak_memory_mb: float = 0.0
+
+
+class BenchmarkReport(CustomBaseModel):
+    commit: Optional[str] = None
+    python_version: str
+    created_at: str
+    latency: float
+    repetitions: int
+    index_build_time: float = 0.0
+    retrieval_setup_time: float = 0.0
+    scenarios: list[ScenarioResult] = []
+    logging_costs: dict[str, float] = {}
+
+    def get_scenario(self, name: str) -> ScenarioResult | None:
+        return next((scenario for scenario in self.scenarios if scenario.name == name), None)
+
+    def format(self) -> str:
+        lines = [f"Benchmark of {self.commit or 'unknown commit'} ({self.repetitions} repetitions, "
+                 f"{self.latency * 1000:.0f}ms stub latency)",
+                 f"  index build: {self.index_build_time * 1000:.1f}ms, "
+                 f"retrieval setup: {self.retrieval_setup_time * 1000:.1f}ms"]
+        for scenario in self.scenarios:
+            lines.append(f"  {scenario.name}: {scenario.rounds} rounds, {scenario.llm_calls} LLM calls, "
+                         f"build {scenario.room_build_time * 1000:.1f}ms, wall {scenario.wall_time * 1000:.1f}ms, "
+                         f"overhead {scenario.overhead_per_round * 1000:.2f}ms/round, "
+                         f"peak memory {scenario.peak_memory_mb:.1f}MB")
+        if self.logging_costs:
+            lines.append("  logging: " + ", ".join(f"{name} {cost:.0f}ns" for name, cost in self.logging_costs.items()))
+        return "\n".join(lines)
+
+    def compare(self, baseline: "BenchmarkReport") -> str:
+        lines = [f"Comparison of {self.commit or 'current'} against {baseline.commit or 'baseline'}"]
+        for metric in ["index_build_time", "retrieval_setup_time"]:
+            lines.append(self.format_delta(metric, getattr(baseline, metric), getattr(self, metric)))
+        for scenario in self.scenarios:
+            baseline_scenario = baseline.get_scenario(scenario.name)
+            if baseline_scenario is None:
+                continue
+            for metric in COMPARED_METRICS:
+                lines.append(self.format_delta(f"{scenario.name}.{metric}", getattr(baseline_scenario, metric),
+                                               getattr(scenario, metric)))
+        for name, cost in self.logging_costs.items():
+            if name in baseline.logging_costs:
+                lines.append(self.format_delta(f"logging.{name}", baseline.logging_costs[name], cost))
+        return "\n".join(lines)
+
+    @staticmethod
+    def format_delta(name: str, baseline_value: float, value: float) -> str:
+        delta = f"{(value - baseline_value) / baseline_value:+.1%}" if baseline_value else "n/a"
+        return f"  {name}: {baseline_value:.4g} -> {value:.4g} ({delta})"
@@ -0,0 +1,129 @@
+import contextlib
+import io
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks.benchmark_report import BenchmarkReport, ScenarioResult
+from benchmarks.hash_embedding_function import HashEmbeddingFunction
+from benchmarks.logging_benchmark import ITERATIONS, LoggingBenchmark
+from benchmarks.stub_server import StubOpenAIServer
+from roundtable.models.discussion_room_config import DiscussionRoomConfig
+from roundtable.services.discussion_room.discussion_room import DiscussionRoom
+from roundtable.services.retrieval.context_builder import count_context_tokens
+from roundtable.services.retrieval.document_index import DocumentIndex
+from roundtable.shared.utils.configurator import Configurator
+from roundtable.shared.utils.logger import Logger
+
+DOCUMENTS_PATH = os.path.join(os.path.dirname(__file__), "documents")
+
+
+class BenchmarkRunner:
+    def __init__(self, scenarios: dict[str, dict], work_dir: str, latency: float = 0.0, repetitions: int = 3,
+                 logging_iterations: int = ITERATIONS):
+        self.logger = Logger()
+        self.scenarios = scenarios
+        self.work_dir = work_dir
+        self.latency = latency
+        self.repetitions = max(1, repetitions)
+        self.logging_iterations = logging_iterations
+
+    def get_config(self, base_url: str, index_name: str = "index") -> DiscussionRoomConfig:
+        # The stub server replaces the Ollama endpoint configured by `OLLAMA_BASE_URL`.
+        return Configurator.instance().get_discussion_room_config().copy(update={
+            "base_url": base_url,
+            "use_human_input": False,
+            "use_streaming": False,
+            "use_llm_cache": False,
+            "use_code_execution": False,
+            "export_metrics": False,
+            "use_offline_retrieval": True,
+            "retrieval_index_path": os.path.join(self.work_dir, index_name),
+            "retrieval_docs_mirror_path": os.path.join(self.work_dir, "docs"),
+            "transcripts_path": os.path.join(self.work_dir, "transcripts"),
+        })
+
+    @staticmethod
+    def get_document_index(config: DiscussionRoomConfig) -> DocumentIndex:
+        # Tokens are estimated locally, the tiktoken encoding would be downloaded on first use.
+        return DocumentIndex(config, remote_documents=[], local_documents=[DOCUMENTS_PATH],
+                             embedding_function=HashEmbeddingFunction(), token_count_function=count_context_tokens)
+
+    @staticmethod
+    def get_commit() -> str | None:
+        try:
+            commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                    check=True).stdout.strip()
+            dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True,
+                                   text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        return f"{commit}-dirty" if dirty else commit
+
+    def measure_retrieval(self, base_url: str) -> tuple[float, float]:
+        config = self.get_config(base_url, index_name=f"index-{time.time_ns()}")
+        started_at = time.perf_counter()
+        self.get_document_index(config).refresh(offline=True)
+        index_build_time = time.perf_counter() - started_at
+        started_at = time.perf_counter()
+        self.get_document_index(config).get_retrieve_config()
+        retrieval_setup_time = time.perf_counter() - started_at
+        return index_build_time, retrieval_setup_time
+
+    def run_discussion(self, server: StubOpenAIServer, config: DiscussionRoomConfig, scenario: dict) -> dict:
+        server.set_script(scenario["script"])
+        config = config.copy(update=scenario.get("config", {}))
+        discussion_room = DiscussionRoom(config=config, document_index=self.get_document_index(config))
+        started_at = time.perf_counter()
+        discussion_room.build_discussion_room()
+        room_build_time = time.perf_counter() - started_at
+        # The transcript printed by autogen is discarded, the terminal would dominate the measured overhead.
+        with contextlib.redirect_stdout(io.StringIO()):
+            started_at = time.perf_counter()
+            discussion_room.discuss(scenario["problem"])
+            wall_time = time.perf_counter() - started_at
+        metrics = discussion_room.metrics_recorder.get_metrics()
+        rounds = len(discussion_room.manager.groupchat.messages)
+        # Time spent by the server on the critical path, replies generated concurrently are counted once.
+        llm_time = server.busy_time
+        return {
+            "rounds": rounds,
+            "llm_calls": sum(turn.llm_calls for turn in metrics.turns),
+            "room_build_time": room_build_time,
+            "wall_time": wall_time,
+            "llm_time": llm_time,
+            "overhead_per_round": (wall_time - llm_time) / max(rounds, 1),
+        }
+
+    def run_scenario(self, server: StubOpenAIServer, config: DiscussionRoomConfig, name: str,
+                     scenario: dict) -> ScenarioResult:
+        runs = [self.run_discussion(server, config, scenario) for _ in range(self.repetitions)]
+        result = ScenarioResult(name=name, rounds=runs[-1]["rounds"], llm_calls=runs[-1]["llm_calls"])
+        for metric in ["room_build_time", "wall_time", "llm_time", "overhead_per_round"]:
+            setattr(result, metric, statistics.median(run[metric] for run in runs))
+        # Memory is traced in a separate run since tracing slows down every allocation.
+        tracemalloc.start()
+        try:
+            self.run_discussion(server, config, scenario)
+            result.peak_memory_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+        return result
+
+    def run(self) -> BenchmarkReport:
+        report = BenchmarkReport(commit=self.get_commit(), python_version=platform.python_version(),
+                                 created_at=datetime.now(timezone.utc).isoformat(), latency=self.latency,
+                                 repetitions=self.repetitions)
+        with StubOpenAIServer(latency=self.latency) as server:
+            report.index_build_time, report.retrieval_setup_time = self.measure_retrieval(server.base_url)
+            config = self.get_config(server.base_url)
+            self.get_document_index(config).refresh(offline=True)
+            for name, scenario in self.scenarios.items():
+                self.logger.info("Running benchmark scenario %s", name)
+                report.scenarios.append(self.run_scenario(server, config, name, scenario))
+        report.logging_costs = LoggingBenchmark(self.logging_iterations).run()
+        return report
@@ -0,0 +1,21 @@
+import hashlib
+import math
+
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+
+DIMENSIONS = 64
+
+
+class HashEmbeddingFunction(EmbeddingFunction):
+    # Deterministic bag of words embedding, it keeps the benchmark offline and independent of the embedding model.
+    def __call__(self, input: Documents) -> Embeddings:
+        return [self.embed(text) for text in input]
+
+    @staticmethod
+    def embed(text: str) -> list[float]:
+        vector = [0.0] * DIMENSIONS
+        for word in text.lower().split():
+            bucket = int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=4).digest(), "little")
+            vector[bucket % DIMENSIONS] += 1.0
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
@@ -0,0 +1,80 @@
+import logging
+import os
+import time
+
+from roundtable.shared.utils.logger import Logger, TEXT_FORMAT, TextFormatter, build_queue_handler, log_context
+
+ITERATIONS = 5000
+SLOW_SINK_LATENCY = 0.0001
+
+
+class SlowStream:
+    # A terminal or a pipe whose reader lags behind, every write blocks the thread that performs it.
+    def __init__(self, latency: float = SLOW_SINK_LATENCY):
+        self.latency = latency
+
+    def write(self, text: str):
+        time.sleep(self.latency)
+
+    def flush(self):
+        pass
+
+
+class LoggingBenchmark:
+    def __init__(self, iterations: int = ITERATIONS):
+        self.iterations = iterations
+        self.benchmark_logger = logging.getLogger("roundtable-benchmark")
+        self.benchmark_logger.propagate = False
+        self.benchmark_logger.setLevel(logging.INFO)
+        self.logger = Logger()
+        self.logger.logger = self.benchmark_logger
+
+    def measure(self, log_call) -> float:
+        started_at = time.perf_counter_ns()
+        for index in range(self.iterations):
+            log_call(index)
+        return (time.perf_counter_ns() - started_at) / self.iterations
+
+    def set_handler(self, handler: logging.Handler):
+        for previous_handler in list(self.benchmark_logger.handlers):
+            self.benchmark_logger.removeHandler(previous_handler)
+        self.benchmark_logger.addHandler(handler)
+
+    def measure_blocking(self, stream) -> float:
+        stream_handler = logging.StreamHandler(stream)
+        stream_handler.setFormatter(TextFormatter(TEXT_FORMAT))
+        self.set_handler(stream_handler)
+        return self.measure(lambda index: self.logger.info("%s turn prompt tokens: %d", "Critic", index))
+
+    def measure_queued(self, stream) -> float:
+        queue_handler, listener = build_queue_handler(stream)
+        self.set_handler(queue_handler)
+        listener.start()
+        try:
+            with log_context(session="benchmark", discussion="benchmark", round=1, agent="Critic"):
+                return self.measure(lambda index: self.logger.info("%s turn prompt tokens: %d", "Critic", index))
+        finally:
+            # Records still queued are dropped, only the time spent by the caller is measured.
+            self.set_handler(logging.NullHandler())
+            listener.handlers = (logging.NullHandler(),)
+            listener.stop()
+
+    def run(self) -> dict[str, float]:
+        # Nanoseconds spent on the calling thread for every call.
+        costs = {}
+        turn = {"agent": "Critic", "tokens": 1234, "wall_time": 1.5}
+        costs["disabled_lazy"] = self.measure(lambda index: self.logger.debug(
+            "%s: %d prompt tokens in %.2fs", turn["agent"], turn["tokens"], turn["wall_time"]))
+        costs["disabled_eager"] = self.measure(lambda index: self.logger.debug(
+            f"{turn['agent']}: {turn['tokens']} prompt tokens in {turn['wall_time']:.2f}s"))
+        with open(os.devnull, "w") as devnull:
+            costs["blocking_devnull"] = self.measure_blocking(devnull)
+            costs["queued_devnull"] = self.measure_queued(devnull)
+        costs["blocking_slow_sink"] = self.measure_blocking(SlowStream())
+        costs["queued_slow_sink"] = self.measure_queued(SlowStream())
+        return costs
+
+
+if __name__ == '__main__':
+    for name, cost in LoggingBenchmark().run().items():
+        print(f"{name}: {cost:.0f}ns per call")
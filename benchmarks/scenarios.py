@@ -0,0 +1,47 @@
+from roundtable.services.discussion_room.roles import ADMIN, ASSISTANT, CRITIC, ENGINEER, EXECUTOR, \
+    NO_CODE_EXECUTED, NO_CODE_PROVIDED, SUPERVISOR, TERMINATE
+
+PLAN = (f"Plan: 1. The {ENGINEER} writes a python script that computes the result. 2. The {EXECUTOR} runs it. "
+        f"3. The {ASSISTANT} explains the output to the {ADMIN}.")
+CODE = "```python\nprint(sum(range(10)))\n```"
+FAILING_CODE = "```python\nprint(sum(range(10))\n```"
+
+SCENARIOS: dict[str, dict] = {
+    "no_code": {
+        "problem": "Who are the authors of Roundtable?",
+        "script": {
+            SUPERVISOR: ["The authors are listed in the documents, no code is needed."],
+            ENGINEER: [NO_CODE_PROVIDED],
+            EXECUTOR: [NO_CODE_EXECUTED],
+            ASSISTANT: [f"Roundtable is written by ZappaBoy and Luca Fulgenzi. {TERMINATE}"],
+        },
+    },
+    "code_block": {
+        "problem": "Compute the sum of the numbers from 0 to 9.",
+        "script": {
+            ADMIN: ["The plan is approved."],
+            SUPERVISOR: [PLAN],
+            CRITIC: ["The plan is complete and verifiable."],
+            ENGINEER: [CODE],
+            EXECUTOR: ["exitcode: 0 (execution succeeded)\nCode output: 45"],
+            ASSISTANT: [f"The sum of the numbers from 0 to 9 is 45. {TERMINATE}"],
+        },
+    },
+    "fix_loop": {
+        "problem": "Compute the sum of the numbers from 0 to 9, fixing errors if any.",
+        "script": {
+            SUPERVISOR: [PLAN],
+            CRITIC: ["The plan is complete and verifiable."],
+            ENGINEER: [FAILING_CODE, CODE],
+            EXECUTOR: ["exitcode: 1 (execution failed)\nCode output: SyntaxError: '(' was never closed",
+                       "exitcode: 0 (execution succeeded)\nCode output: 45"],
+            ASSISTANT: [f"After fixing a syntax error the script prints 45. {TERMINATE}"],
+        },
+    },
+}
+SCENARIOS["fan_out"] = {
+    **SCENARIOS["code_block"],
+    "script": {**SCENARIOS["code_block"]["script"], CRITIC: ["The plan is complete and verifiable.",
+                                                          "The output of the script is consistent with the plan."]},
+    "config": {"fan_out_agents": [CRITIC, ASSISTANT]},
+}
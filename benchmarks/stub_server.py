@@ -0,0 +1,165 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = "CONTINUE"
+LOAD_PATH = "/api/generate"
+
+
+class StubOpenAIServer:
+    # OpenAI compatible chat completions endpoint that answers with scripted replies, chosen by the role found at the
+    # beginning of the system message of the agents (e.g. "Engineer. You follow an approved plan...").
+    def __init__(self, latency: float = 0.0, token_latency: float = 0.0):
+        self.latency = latency
+        self.token_latency = token_latency
+        self.script: dict[str, list[str]] = {}
+        self.calls: dict[str, int] = {}
+        self.requests = 0
+        self.loads = 0
+        self.active_requests = 0
+        self.busy_since = 0.0
+        self.busy_time = 0.0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self.build_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/v1"
+
+    def __enter__(self) -> "StubOpenAIServer":
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-openai-server", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def set_script(self, script: dict[str, list[str]]):
+        with self._lock:
+            self.script = script
+            self.calls = {}
+            self.requests = 0
+            self.busy_time = 0.0
+
+    @staticmethod
+    def get_role(messages: list[dict]) -> str:
+        system_messages = [message for message in messages if message.get("role") == "system"]
+        if not system_messages:
+            return ""
+        return str(system_messages[0].get("content", "")).strip().split(".", 1)[0]
+
+    def on_request_start(self):
+        with self._lock:
+            if self.active_requests == 0:
+                self.busy_since = time.perf_counter()
+            self.active_requests += 1
+
+    def on_request_end(self):
+        # Time with at least one request being served, concurrent requests are counted once.
+        with self._lock:
+            self.active_requests -= 1
+            if self.active_requests == 0:
+                self.busy_time += time.perf_counter() - self.busy_since
+
+    def get_reply(self, role: str) -> str:
+        with self._lock:
+            self.requests += 1
+            replies = self.script.get(role) or [DEFAULT_REPLY]
+            call = self.calls.get(role, 0)
+            self.calls[role] = call + 1
+            return replies[min(call, len(replies) - 1)]
+
+    def build_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive connections, as served by Ollama.
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately, Nagle's algorithm would delay every reply on kept-alive
+            # connections.
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                if self.path == LOAD_PATH:
+                    self.send_load()
+                    return
+                server.on_request_start()
+                try:
+                    body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                    reply = server.get_reply(server.get_role(body.get("messages", [])))
+                    time.sleep(server.latency)
+                    if body.get("stream"):
+                        self.send_stream(body, reply)
+                    else:
+                        self.send_completion(body, reply)
+                finally:
+                    server.on_request_end()
+
+            def send_load(self):
+                # Native Ollama endpoint used to load a model without prompt.
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with server._lock:
+                    server.loads += 1
+                payload = json.dumps({"model": body["model"], "response": "", "done": True}).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def send_completion(self, body: dict, reply: str):
+                prompt_tokens = sum(len(str(message.get("content", "")).split()) for message in body["messages"])
+                completion_tokens = len(reply.split())
+                time.sleep(server.token_latency * completion_tokens)
+                payload = json.dumps({
+                    "id": f"stub-{server.requests}", "object": "chat.completion", "created": int(time.time()),
+                    "model": body["model"],
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": reply}}],
+                    "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                              "total_tokens": prompt_tokens + completion_tokens},
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def send_stream(self, body: dict, reply: str):
+                model = body["model"]
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                for token in reply.split(" "):
+                    time.sleep(server.token_latency)
+                    chunk = {"id": f"stub-{server.requests}", "object": "chat.completion.chunk",
+                             "created": int(time.time()), "model": model,
+                             "choices": [{"index": 0, "delta": {"content": token + " "}, "finish_reason": None}]}
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                if body.get("stream_options", {}).get("include_usage"):
+                    prompt_tokens = sum(len(str(message.get("content", "")).split()) for message in body["messages"])
+                    completion_tokens = len(reply.split())
+                    chunk = {"id": f"stub-{server.requests}", "object": "chat.completion.chunk",
+                             "created": int(time.time()), "model": model, "choices": [],
+                             "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                                       "total_tokens": prompt_tokens + completion_tokens}}
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.write(b"data: [DONE]\n\n")
+
+        return Handler
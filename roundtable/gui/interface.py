@@ -1,9 +1,64 @@
+import uuid
+
 import streamlit as st
 
-from roundtable.services.discussion_room.discussion_room import DiscussionRoom
+from roundtable.gui.transcript_store import TranscriptStore
+from roundtable.models.discussion_metrics import DiscussionMetrics
+from roundtable.models.stream_stats import StreamStats
+from roundtable.models.transcript_entry import TranscriptEntry
+from roundtable.models.transcript_section import CODE, TEXT, TranscriptSection
+from roundtable.services.discussion_room.discussion_room_pool import DiscussionRoomPool
+from roundtable.services.llm.stream_listener import StreamListener
+from roundtable.services.metrics.metrics_exporter import MetricsExporter
+from roundtable.shared.utils.config_watcher import ConfigWatcher
+from roundtable.shared.utils.configurator import Configurator
 from roundtable.shared.utils.logger import Logger
 
 USER_NAME = "User"
+SESSION_ID_KEY = "session_id"
+TRANSCRIPT_KEY = "transcript"
+PAGE_KEY = "transcript_page"
+METRICS_KEY = "metrics"
+PREVIEW_LINES = 5
+
+
+@st.cache_resource
+def get_discussion_room_pool() -> DiscussionRoomPool:
+    # Streamlit re-executes this script on every interaction, the pool is cached per process so that the agents and the
+    # retriever of a session are built once and reused across reruns.
+    settings = Configurator.instance().get_settings()
+    ConfigWatcher(settings.config_reload_interval).start()
+    return DiscussionRoomPool(max_rooms=settings.max_live_rooms, idle_timeout=settings.room_idle_timeout)
+
+
+class StreamlitStreamListener(StreamListener):
+    def __init__(self):
+        self.parent = None
+        self.container = None
+        self.placeholder = None
+        self.content = ""
+        self.streamed_agents: list[str] = []
+
+    def on_stream_start(self, agent_name: str):
+        self.content = ""
+        self.container = (self.parent or st).chat_message(agent_name)
+        self.placeholder = self.container.empty()
+
+    def on_token(self, agent_name: str, token: str):
+        self.content += token
+        self.placeholder.markdown(self.content + "▌")
+
+    def on_stream_end(self, agent_name: str, stats: StreamStats):
+        self.placeholder.markdown(self.content)
+        if stats.time_to_first_token is not None:
+            self.container.caption(f"First token after {stats.time_to_first_token:.2f}s")
+        self.streamed_agents.append(agent_name)
+
+    def was_streamed(self, agent_name: str) -> bool:
+        if agent_name in self.streamed_agents:
+            self.streamed_agents.remove(agent_name)
+            return True
+        return False
 
 
 class Interface:
@@ -14,28 +69,113 @@ class Interface:
         self.subheader = 'Meeting room'
         self.input_message_placeholder = "Enter text here..."
         self.button_label = "Send"
-        self.discussion_room = DiscussionRoom(callback=self.show_message)
+        self.session_id = st.session_state.setdefault(SESSION_ID_KEY, str(uuid.uuid4()))
+        if TRANSCRIPT_KEY not in st.session_state:
+            settings = Configurator.instance().get_settings()
+            st.session_state[TRANSCRIPT_KEY] = TranscriptStore(
+                page_size=settings.gui_page_size, max_entries=settings.gui_max_messages,
+                collapse_lines=settings.gui_collapse_lines, max_section_chars=settings.gui_max_section_chars)
+        self.transcript: TranscriptStore = st.session_state[TRANSCRIPT_KEY]
+        self.discussion_room_pool = get_discussion_room_pool()
+        self.stream_listener = StreamlitStreamListener()
+        self.live_container = None
 
     def build(self):
         st.title(self.title)
         st.subheader(self.subheader)
 
+        self.show_transcript()
+        # Messages of the running discussion are appended below the transcript as they arrive.
+        self.live_container = st.container()
+        self.stream_listener.parent = self.live_container
+
         with st.form("user_chat_form", clear_on_submit=True):
             st.write("Enter your message:")
             input_text = st.text_input(label="Message", placeholder=self.input_message_placeholder, key="input_text")
             submit_form = st.form_submit_button(self.button_label)
             if submit_form:
                 try:
-                    discussion, manager = self.discussion_room.get_discussion()
-                    discussion.initiate_chat(manager, message=input_text)
+                    with self.discussion_room_pool.use(self.session_id, callback=self.add_message,
+                                                       stream_listener=self.stream_listener) as discussion_room:
+                        discussion, manager = discussion_room.get_discussion()
+                        discussion_room.prepare_discussion(problem=input_text)
+                        try:
+                            discussion.initiate_chat(manager, message=input_text)
+                        finally:
+                            discussion_room.close_transcript_log()
+                        if discussion_room.config.export_metrics:
+                            discussion_room.export_metrics()
+                        st.session_state[METRICS_KEY] = discussion_room.get_metrics()
                 except Exception as e:
                     self.logger.error(e)
                     st.warning('Sorry, something goes wrong. Try with a different input')
 
+        if METRICS_KEY in st.session_state:
+            self.show_metrics(st.session_state[METRICS_KEY])
+
+    def add_message(self, sender: str, message: str | dict):
+        content = message.get("content", "") if isinstance(message, dict) else message
+        entry = self.transcript.add(sender, content)
+        if not self.stream_listener.was_streamed(sender):
+            # A widget would rerun the script and stop the discussion, long sections are expanded after it ends.
+            self.show_entry(self.live_container, entry, expandable=False)
+
+    def show_transcript(self):
+        # Only one page is rendered on each rerun, older messages are reached through the page selector.
+        page = 0
+        page_count = self.transcript.get_page_count()
+        if page_count > 1:
+            page = st.selectbox("Transcript", range(page_count), format_func=self.transcript.get_page_label,
+                                key=PAGE_KEY)
+        if self.transcript.dropped_entries:
+            st.caption(f"{self.transcript.dropped_entries} older messages are no longer kept")
+        for entry in self.transcript.get_page(page):
+            self.show_entry(st, entry, expandable=True)
+
+    def show_entry(self, container, entry: TranscriptEntry, expandable: bool):
+        with container.chat_message(entry.sender):
+            for position, section in enumerate(entry.sections):
+                if not section.collapsed:
+                    self.show_section(section)
+                    continue
+                st.caption(self.get_section_summary(section))
+                if expandable and st.toggle("Show all", key=f"section-{entry.index}-{position}"):
+                    self.show_section(section)
+                else:
+                    self.show_section(section, preview=True)
+
+    @staticmethod
+    def get_section_summary(section: TranscriptSection) -> str:
+        if section.kind == CODE:
+            name = f"{section.language} code" if section.language else "Code"
+        else:
+            name = "Execution output"
+        summary = f"{name}, {section.lines} lines"
+        if section.omitted_characters:
+            summary += f", {section.omitted_characters} characters omitted"
+        return summary
+
+    @staticmethod
+    def show_section(section: TranscriptSection, preview: bool = False):
+        content = section.get_preview(PREVIEW_LINES) if preview else section.content
+        if section.kind == TEXT:
+            st.markdown(content)
+        else:
+            st.code(content, language=section.language or "text")
+
     @staticmethod
-    def show_message(sender: str, message: str):
-        with st.chat_message(sender):
-            st.markdown(message)
+    def show_metrics(metrics: DiscussionMetrics):
+        with st.expander("Metrics"):
+            st.caption(f"Discussion completed in {metrics.wall_time:.1f}s, "
+                       f"{metrics.retrieval_time:.2f}s spent retrieving documents")
+            st.dataframe([agent.dict() for agent in metrics.agents], hide_index=True)
+            for pool in metrics.http_pools:
+                st.caption(f"HTTP pool of {pool.base_url}: {pool.open_connections}/{pool.max_connections} "
+                           f"connections open, {pool.get_utilization():.0%} in use")
+            st.download_button("Download JSON", MetricsExporter.to_json(metrics),
+                               file_name=f"{metrics.discussion_id}.json", mime="application/json")
+            st.download_button("Download Prometheus", MetricsExporter.to_prometheus(metrics),
+                               file_name=f"{metrics.discussion_id}.prom", mime="text/plain")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,71 @@
+import re
+
+from roundtable.models.transcript_entry import TranscriptEntry
+from roundtable.models.transcript_section import CODE, OUTPUT, TEXT, TranscriptSection
+from roundtable.shared.utils.truncation import truncate_middle
+
+CODE_BLOCK_PATTERN = re.compile(r"```[ \t]*([\w+-]*)[^\n]*\n(.*?)\n?```", re.DOTALL)
+EXECUTION_OUTPUT_PATTERN = re.compile(r"^exitcode: ")
+
+
+class TranscriptStore:
+    # Messages shown by the interface, kept in the session across reruns. Only the last messages are kept and long
+    # sections are truncated, so that the memory of a session stays bounded however long the discussions are.
+    def __init__(self, page_size: int, max_entries: int, collapse_lines: int, max_section_chars: int):
+        self.page_size = max(1, page_size)
+        self.max_entries = max_entries
+        self.collapse_lines = collapse_lines
+        self.max_section_chars = max_section_chars
+        self.entries: list[TranscriptEntry] = []
+        self.next_index = 0
+        self.dropped_entries = 0
+
+    def build_section(self, kind: str, content: str, language: str = "") -> TranscriptSection:
+        omitted_characters = 0
+        if kind != TEXT and len(content) > self.max_section_chars:
+            omitted_characters = len(content) - self.max_section_chars
+            content = truncate_middle(content, self.max_section_chars)
+        lines = content.count("\n") + 1
+        return TranscriptSection(kind=kind, content=content, language=language, lines=lines,
+                                 omitted_characters=omitted_characters,
+                                 collapsed=kind != TEXT and lines > self.collapse_lines)
+
+    def get_sections(self, content: str) -> list[TranscriptSection]:
+        if EXECUTION_OUTPUT_PATTERN.match(content):
+            return [self.build_section(OUTPUT, content)]
+        sections = []
+        position = 0
+        for match in CODE_BLOCK_PATTERN.finditer(content):
+            text = content[position:match.start()].strip()
+            if text:
+                sections.append(self.build_section(TEXT, text))
+            sections.append(self.build_section(CODE, match.group(2), language=match.group(1)))
+            position = match.end()
+        text = content[position:].strip()
+        if text:
+            sections.append(self.build_section(TEXT, text))
+        return sections
+
+    def add(self, sender: str, content: str) -> TranscriptEntry:
+        entry = TranscriptEntry(index=self.next_index, sender=sender, sections=self.get_sections(content or ""))
+        self.next_index += 1
+        self.entries.append(entry)
+        if len(self.entries) > self.max_entries:
+            dropped_entries = len(self.entries) - self.max_entries
+            del self.entries[:dropped_entries]
+            self.dropped_entries += dropped_entries
+        return entry
+
+    def get_page_count(self) -> int:
+        return max(1, -(-len(self.entries) // self.page_size))
+
+    def get_page(self, page: int) -> list[TranscriptEntry]:
+        # Pages are counted from the latest messages, new messages only change the first page.
+        end = len(self.entries) - page * self.page_size
+        return self.entries[max(end - self.page_size, 0):max(end, 0)]
+
+    def get_page_label(self, page: int) -> str:
+        entries = self.get_page(page)
+        if page == 0 or not entries:
+            return "Latest messages"
+        return f"Messages {entries[0].index + 1}-{entries[-1].index + 1}"
@@ -0,0 +1,6 @@
+from roundtable.models.custom_base_model import CustomBaseModel
+
+
+class BatchProblem(CustomBaseModel):
+    id: str
+    problem: str
@@ -0,0 +1,13 @@
+from typing import Optional
+
+from roundtable.models.custom_base_model import CustomBaseModel
+
+
+class BudgetUsage(CustomBaseModel):
+    deadline: float = 0.0
+    elapsed_time: float = 0.0
+    prompt_token_budget: int = 0
+    prompt_tokens: int = 0
+    completion_token_budget: int = 0
+    completion_tokens: int = 0
+    exhausted_reason: Optional[str] = None
@@ -0,0 +1,21 @@
+from typing import Optional
+
+from roundtable.models.custom_base_model import CustomBaseModel
+
+PENDING = "pending"
+PASSED = "passed"
+FAILED = "failed"
+NO_CODE = "no_code"
+CANCELLED = "cancelled"
+ERROR = "error"
+
+
+class CodeCandidateMetrics(CustomBaseModel):
+    index: int
+    turn: int = 0
+    model: str
+    temperature: float
+    status: str = PENDING
+    generation_time: float = 0.0
+    execution_time: float = 0.0
+    exit_code: Optional[int] = None
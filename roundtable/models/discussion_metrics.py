@@ -0,0 +1,18 @@
+from roundtable.models.agent_metrics import AgentMetrics
+from roundtable.models.code_candidate_metrics import CodeCandidateMetrics
+from roundtable.models.custom_base_model import CustomBaseModel
+from roundtable.models.http_pool_stats import HttpPoolStats
+from roundtable.models.turn_metrics import TurnMetrics
+
+
+class DiscussionMetrics(CustomBaseModel):
+    discussion_id: str
+    wall_time: float = 0.0
+    retrieval_time: float = 0.0
+    model_loads: int = 0
+    model_swaps: int = 0
+    model_load_time: float = 0.0
+    turns: list[TurnMetrics] = []
+    agents: list[AgentMetrics] = []
+    http_pools: list[HttpPoolStats] = []
+    code_candidates: list[CodeCandidateMetrics] = []
@@ -0,0 +1,23 @@
+from typing import Optional
+
+from roundtable.models.budget_usage import BudgetUsage
+from roundtable.models.custom_base_model import CustomBaseModel
+
+
+class DiscussionResult(CustomBaseModel):
+    id: str
+    problem: str
+    completed: bool = False
+    answer: Optional[str] = None
+    rounds: int = 0
+    llm_calls_saved: int = 0
+    rounds_saved: int = 0
+    termination_reason: Optional[str] = None
+    wall_time: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    model_swaps: int = 0
+    model_load_time: float = 0.0
+    budget: Optional[BudgetUsage] = None
+    error: Optional[str] = None
@@ -8,3 +8,58 @@ class DiscussionRoomConfig(CustomBaseModel):
     code_model_name: str
     use_code_execution: bool
     execute_code_in_docker: bool
+    executor_pool_size: int
+    executor_timeout: int
+    executor_memory_limit_mb: int
+    executor_max_runs_per_worker: int
+    executor_preload_modules: list[str]
+    executor_env_path: str
+    executor_workspace_path: str
+    use_execution_cache: bool
+    execution_cache_max_entries: int
+    execution_cache_max_bytes: int
+    code_candidates: int
+    code_candidate_temperatures: list[float]
+    http_max_connections: int
+    http_timeout: float
+    http_connect_timeout: float
+    use_model_scheduling: bool
+    max_loaded_models: int
+    model_keep_alive: int
+    use_streaming: bool
+    use_llm_cache: bool
+    llm_cache_path: str
+    llm_cache_max_entries: int
+    retrieval_index_path: str
+    retrieval_docs_mirror_path: str
+    retrieval_collection_name: str
+    retrieval_chunk_token_size: int
+    use_offline_retrieval: bool
+    retrieval_context_max_tokens: int
+    retrieval_dedup_similarity: float
+    use_retrieval_cache: bool
+    retrieval_cache_max_entries: int
+    speaker_selection_method: str
+    fan_out_agents: list[str]
+    fan_out_triggers: list[str]
+    use_convergence_detection: bool
+    convergence_similarity: float
+    use_conversation_compaction: bool
+    compaction_keep_turns: int
+    compaction_keep_turns_by_role: dict[str, int]
+    compaction_max_message_tokens: int
+    compaction_summary_max_tokens: int
+    discussion_deadline: float
+    prompt_token_budget: int
+    completion_token_budget: int
+    final_answer_timeout: float
+    final_answer_max_tokens: int
+    use_transcript_log: bool
+    transcripts_path: str
+    export_metrics: bool
+    metrics_path: str
+    use_human_input: bool = True
+
+    class Config:
+        # Snapshots are shared by every room, changes go through `copy(update=...)`.
+        allow_mutation = False
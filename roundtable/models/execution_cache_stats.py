@@ -0,0 +1,12 @@
+from roundtable.models.custom_base_model import CustomBaseModel
+
+
+class ExecutionCacheStats(CustomBaseModel):
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    def get_hit_rate(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
@@ -0,0 +1,14 @@
+from roundtable.models.custom_base_model import CustomBaseModel
+
+
+class HttpPoolStats(CustomBaseModel):
+    base_url: str
+    max_connections: int
+    open_connections: int = 0
+    idle_connections: int = 0
+    requests_in_flight: int = 0
+    peak_requests_in_flight: int = 0
+    requests: int = 0
+
+    def get_utilization(self) -> float:
+        return self.requests_in_flight / self.max_connections if self.max_connections else 0.0
@@ -0,0 +1,13 @@
+from roundtable.models.custom_base_model import CustomBaseModel
+
+
+class IndexRefreshReport(CustomBaseModel):
+    added: list[str] = []
+    updated: list[str] = []
+    removed: list[str] = []
+    unchanged: list[str] = []
+    embedded_chunks: int = 0
+    rebuilt: bool = False
+
+    def has_changes(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
@@ -0,0 +1,9 @@
+from typing import Optional
+
+from roundtable.models.custom_base_model import CustomBaseModel
+
+
+class ModelLoad(CustomBaseModel):
+    model: str
+    evicted_model: Optional[str] = None
+    load_time: float = 0.0
@@ -0,0 +1,15 @@
+from roundtable.models.custom_base_model import CustomBaseModel
+
+
+class ResponseCacheStats(CustomBaseModel):
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+
+    def get_hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    def get_hit_rate(self) -> float:
+        requests = self.get_hits() + self.misses
+        return self.get_hits() / requests if requests else 0.0
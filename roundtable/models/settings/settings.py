@@ -10,16 +10,81 @@ class Settings(BaseSettings):
     version: str = "0.1.0"
     environment: Environment = Environment.DEVELOPMENT
     log_level: LogLevel = LogLevel.DEBUG
+    log_format: str = "text"
     ollama_base_url: str = "http://localhost:11434/v1"
     ollama_api_key: str = "public_access"
     llm_model: str = "mistral:latest"
     code_model: str = "codellama:latest"
     code_execution: bool = False
     docker_code_execution: bool = False
+    executor_pool_size: int = 2
+    executor_timeout: int = 60
+    executor_memory_limit_mb: int = 1024
+    executor_max_runs_per_worker: int = 20
+    executor_preload_modules: list[str] = []
+    executor_env_path: str = ".roundtable/executor-env"
+    executor_workspace_path: str = ".roundtable/workspaces"
+    execution_cache: bool = True
+    execution_cache_max_entries: int = 256
+    execution_cache_max_bytes: int = 16 * 1024 * 1024
+    code_candidates: int = 1
+    code_candidate_temperatures: list[float] = [0.2, 0.7, 1.0]
+    http_max_connections: int = 8
+    http_timeout: float = 600.0
+    http_connect_timeout: float = 5.0
+    model_scheduling: bool = True
+    ollama_max_loaded_models: int = 1
+    ollama_keep_alive: int = 1800
+    stream_responses: bool = False
+    llm_cache: bool = True
+    llm_cache_path: str = ".roundtable/llm_cache.sqlite"
+    llm_cache_max_entries: int = 1024
+    retrieval_index_path: str = ".roundtable/index"
+    retrieval_docs_mirror_path: str = ".roundtable/docs"
+    retrieval_collection_name: str = "roundtable-docs"
+    retrieval_chunk_token_size: int = 2000
+    retrieval_offline: bool = False
+    retrieval_context_max_tokens: int = 2000
+    retrieval_dedup_similarity: float = 0.8
+    retrieval_cache: bool = True
+    retrieval_cache_max_entries: int = 128
+    speaker_selection: str = "round_robin"
+    fan_out_agents: list[str] = []
+    fan_out_triggers: list[str] = ["Engineer", "Executor"]
+    convergence_detection: bool = True
+    convergence_similarity: float = 0.9
+    conversation_compaction: bool = True
+    compaction_keep_turns: int = 6
+    compaction_keep_turns_by_role: dict[str, int] = {"Executor": 1, "Critic": 3}
+    compaction_max_message_tokens: int = 1000
+    compaction_summary_max_tokens: int = 500
+    discussion_deadline: float = 0.0
+    discussion_prompt_token_budget: int = 0
+    discussion_completion_token_budget: int = 0
+    final_answer_timeout: float = 120.0
+    final_answer_max_tokens: int = 1024
+    transcript_log: bool = False
+    transcripts_path: str = ".roundtable/transcripts"
+    metrics_export: bool = False
+    metrics_path: str = ".roundtable/metrics"
+    config_reload_interval: float = 2.0
+    max_live_rooms: int = 8
+    room_idle_timeout: int = 1800
+    gui_page_size: int = 10
+    gui_max_messages: int = 200
+    gui_collapse_lines: int = 20
+    gui_max_section_chars: int = 20000
+    batch_concurrency: int = 2
+    server_host: str = "127.0.0.1"
+    server_port: int = 8765
+    server_workers: int = 4
+    server_max_queued_discussions: int = 16
 
     class Config:
         env_file = ".env"
 
     @validator("log_level", pre=True)
-    def parse_log_level(cls, value: str) -> LogLevel:
+    def parse_log_level(cls, value: str | LogLevel) -> LogLevel:
+        if isinstance(value, LogLevel):
+            return value
         return LogLevel.from_string(value)
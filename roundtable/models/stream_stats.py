@@ -0,0 +1,12 @@
+from typing import Optional
+
+from roundtable.models.custom_base_model import CustomBaseModel
+
+
+class StreamStats(CustomBaseModel):
+    agent_name: str
+    model: str
+    time_to_first_token: Optional[float] = None
+    duration: float = 0.0
+    chunks: int = 0
+    cached: bool = False
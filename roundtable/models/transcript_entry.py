@@ -0,0 +1,8 @@
+from roundtable.models.custom_base_model import CustomBaseModel
+from roundtable.models.transcript_section import TranscriptSection
+
+
+class TranscriptEntry(CustomBaseModel):
+    index: int
+    sender: str
+    sections: list[TranscriptSection] = []
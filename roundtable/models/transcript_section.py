@@ -0,0 +1,17 @@
+from roundtable.models.custom_base_model import CustomBaseModel
+
+TEXT = "text"
+CODE = "code"
+OUTPUT = "output"
+
+
+class TranscriptSection(CustomBaseModel):
+    kind: str = TEXT
+    content: str
+    language: str = ""
+    lines: int = 0
+    omitted_characters: int = 0
+    collapsed: bool = False
+
+    def get_preview(self, lines: int) -> str:
+        return "\n".join(self.content.split("\n")[:lines])
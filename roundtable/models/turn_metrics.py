@@ -0,0 +1,16 @@
+from typing import Optional
+
+from roundtable.models.custom_base_model import CustomBaseModel
+
+
+class TurnMetrics(CustomBaseModel):
+    agent_name: str
+    model: Optional[str] = None
+    wall_time: float = 0.0
+    wait_time: float = 0.0
+    llm_time: float = 0.0
+    retrieval_time: float = 0.0
+    llm_calls: int = 0
+    cached_llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
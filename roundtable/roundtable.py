@@ -1,31 +1,80 @@
 import argparse
 import importlib.metadata as metadata
+import os
 from argparse import Namespace
 
 __version__ = metadata.version(__package__ or __name__)
 
-from roundtable.gui.gui import GUI
 from roundtable.models.log_level import LogLevel
-from roundtable.services.discussion_room.discussion_room import DiscussionRoom
-from roundtable.shared.utils.logger import Logger
 
 
 class Roundtable:
     def __init__(self):
-        self.logger = Logger()
+        # Arguments are parsed before anything else so that `--help`, `--version` and usage errors exit without
+        # loading the settings, the logger or any of the heavy subsystems (autogen, chromadb, streamlit).
         self.args = self.parse_args()
+        from roundtable.shared.utils.logger import Logger
+        self.logger = Logger()
         self.set_verbosity()
 
     def run(self):
         self.check_args()
-        self.logger.info(f"Running...")
+        self.logger.info("Running...")
         self.logger.debug(self.args)
+        if self.args.index:
+            self.build_index()
+        if self.args.batch:
+            self.run_batch()
+        if self.args.serve:
+            self.serve()
         if self.args.gui:
+            from roundtable.gui.gui import GUI
             gui = GUI()
             gui.show()
-        if self.args.cli:
-            discussion_room = DiscussionRoom()
-            discussion_room.start()
+        if self.args.cli or self.args.resume:
+            from roundtable.services.discussion_room.discussion_room import DiscussionRoom
+            discussion_room = DiscussionRoom(config=self.get_discussion_room_config())
+            discussion_room.start(discussion_id=self.args.resume)
+
+    def get_config_overrides(self) -> dict:
+        return {"use_llm_cache": False} if self.args.no_cache else {}
+
+    def get_discussion_room_config(self):
+        from roundtable.shared.utils.configurator import Configurator
+        return Configurator.instance().get_discussion_room_config(**self.get_config_overrides())
+
+    def build_index(self):
+        from roundtable.services.retrieval.document_index import DocumentIndex
+        config = self.get_discussion_room_config()
+        offline = self.args.offline or config.use_offline_retrieval
+        DocumentIndex(config).refresh(offline=offline)
+
+    def run_batch(self):
+        from roundtable.services.batch.batch_runner import BatchRunner
+        from roundtable.shared.utils.configurator import Configurator
+        concurrency = self.args.concurrency or Configurator.instance().get_settings().batch_concurrency
+        output_path = self.args.output or f"{os.path.splitext(self.args.batch)[0]}.results.jsonl"
+        batch_runner = BatchRunner(self.get_discussion_room_config(), self.args.batch, output_path, concurrency)
+        batch_runner.run()
+
+    def serve(self):
+        from roundtable.server.server import Server
+        from roundtable.server.session_manager import SessionManager
+        from roundtable.shared.utils.config_watcher import ConfigWatcher
+        from roundtable.shared.utils.configurator import Configurator
+        settings = Configurator.instance().get_settings()
+        # Nobody can answer on the terminal of a server, the discussions never ask for human input.
+        config_overrides = {**self.get_config_overrides(), "use_human_input": False}
+        session_manager = SessionManager(workers=settings.server_workers,
+                                         max_queued=settings.server_max_queued_discussions,
+                                         max_rooms=settings.max_live_rooms, idle_timeout=settings.room_idle_timeout,
+                                         config_overrides=config_overrides)
+        config_watcher = ConfigWatcher(settings.config_reload_interval)
+        config_watcher.start()
+        try:
+            Server(settings.server_host, settings.server_port, session_manager).serve()
+        finally:
+            config_watcher.stop()
 
     @staticmethod
     def parse_args() -> Namespace:
@@ -42,13 +91,30 @@ class Roundtable:
                             help='Run the tool in CLI mode.')
         parser.add_argument('--gui', action='store_true', default=False,
                             help='Run the tool in GUI mode.')
+        parser.add_argument('--serve', action='store_true', default=False,
+                            help='Serve discussions through an HTTP and WebSocket API.')
+        parser.add_argument('--resume', metavar='DISCUSSION_ID', default=None,
+                            help='Resume an interrupted CLI discussion from its transcript log.')
+        parser.add_argument('--index', action='store_true', default=False,
+                            help='Build or refresh the retrieval index used by the discussion rooms.')
+        parser.add_argument('--offline', action='store_true', default=False,
+                            help='Build the retrieval index only from the local mirror of the remote documents.')
+        parser.add_argument('--batch', metavar='PROBLEMS', default=None,
+                            help='Run the problems of a JSONL file (one {"id", "problem"} object per line).')
+        parser.add_argument('--output', metavar='RESULTS', default=None,
+                            help='JSONL file where batch results are appended, used to resume interrupted batches.')
+        parser.add_argument('--concurrency', type=int, default=None,
+                            help='Number of discussions run concurrently in batch mode.')
+        parser.add_argument('--no-cache', action='store_true', default=False,
+                            help='Bypass the LLM response cache, useful for non-deterministic runs.')
         return parser.parse_args()
 
     def check_args(self) -> None:
         error_message = ""
 
-        if not self.args.cli and not self.args.gui:
-            error_message += "You must select at least one mode (--cli or --gui). "
+        if (not self.args.cli and not self.args.gui and not self.args.index and not self.args.batch
+                and not self.args.resume and not self.args.serve):
+            error_message += "You must select at least one mode (--cli, --gui, --serve, --index, --batch or --resume). "
 
         if error_message != "":
             self.logger.error(error_message)
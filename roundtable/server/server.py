@@ -0,0 +1,164 @@
+import asyncio
+import json
+
+from tornado.httpserver import HTTPServer
+from tornado.web import Application, HTTPError, RequestHandler
+from tornado.websocket import WebSocketClosedError, WebSocketHandler
+
+from roundtable.server.session import DISCONNECTED_EVENT, ERROR_EVENT, Session
+from roundtable.server.session_manager import SessionManager
+from roundtable.shared.exceptions.server_saturated_exception import ServerSaturatedException
+from roundtable.shared.exceptions.session_busy_exception import SessionBusyException
+from roundtable.shared.utils.logger import Logger
+
+RETRY_AFTER_SECONDS = 5
+SLOW_CLIENT_CLOSE_CODE = 1008
+
+
+def get_message(body: bytes | str) -> str:
+    try:
+        message = json.loads(body).get("message")
+    except (ValueError, AttributeError):
+        message = None
+    if not isinstance(message, str) or not message.strip():
+        raise HTTPError(400, reason='Expected a JSON object with a non empty "message"')
+    return message
+
+
+class JsonHandler(RequestHandler):
+    def initialize(self, session_manager: SessionManager):
+        self.session_manager = session_manager
+
+    def get_session(self, session_id: str) -> Session:
+        session = self.session_manager.get_session(session_id)
+        if session is None:
+            raise HTTPError(404, reason=f"Session {session_id} not found")
+        return session
+
+    def write_json(self, body: dict, status: int = 200):
+        self.set_status(status)
+        self.set_header("Content-Type", "application/json")
+        self.finish(json.dumps(body))
+
+    def write_error(self, status_code: int, **kwargs):
+        self.finish({"error": self._reason})
+
+
+class HealthHandler(JsonHandler):
+    def get(self):
+        self.write_json(self.session_manager.get_status())
+
+
+class SessionsHandler(JsonHandler):
+    def post(self):
+        try:
+            config_overrides = json.loads(self.request.body or b"{}").get("config")
+        except (ValueError, AttributeError):
+            raise HTTPError(400, reason='Expected an optional JSON object with the "config" of the session')
+        try:
+            session = self.session_manager.create_session(config_overrides)
+        except ValueError as e:
+            self.write_json({"error": str(e)}, status=400)
+            return
+        self.write_json(session.to_dict(), status=201)
+
+
+class SessionHandler(JsonHandler):
+    def get(self, session_id: str):
+        self.write_json(self.get_session(session_id).to_dict())
+
+
+class MessagesHandler(JsonHandler):
+    def post(self, session_id: str):
+        session = self.get_session(session_id)
+        try:
+            position = self.session_manager.submit(session, get_message(self.request.body))
+        except SessionBusyException as e:
+            self.write_json({"error": str(e)}, status=409)
+            return
+        except ServerSaturatedException as e:
+            # Raising `HTTPError` would clear the headers, the response is written directly to keep `Retry-After`.
+            self.set_header("Retry-After", str(RETRY_AFTER_SECONDS))
+            self.write_json({"error": str(e)}, status=503)
+            return
+        self.write_json({"session_id": session_id, "position": position}, status=202)
+
+
+class EventsHandler(WebSocketHandler):
+    def initialize(self, session_manager: SessionManager):
+        self.session_manager = session_manager
+        self.session: Session | None = None
+        self.subscriber: asyncio.Queue | None = None
+        self.forwarder: asyncio.Task | None = None
+
+    def open(self, session_id: str):
+        self.session = self.session_manager.get_session(session_id)
+        if self.session is None:
+            self.close(4004, f"Session {session_id} not found")
+            return
+        self.subscriber = self.session.subscribe()
+        self.forwarder = asyncio.create_task(self.forward_events())
+
+    async def forward_events(self):
+        # Waiting for each write keeps the events in the bounded queue of the subscriber instead of the socket buffer.
+        try:
+            while True:
+                event = await self.subscriber.get()
+                await self.write_message(json.dumps(event))
+                if event["type"] == DISCONNECTED_EVENT:
+                    self.close(SLOW_CLIENT_CLOSE_CODE, event["error"])
+                    return
+        except WebSocketClosedError:
+            pass
+
+    def on_message(self, body: str | bytes):
+        try:
+            self.session_manager.submit(self.session, get_message(body))
+        except HTTPError as e:
+            self.write_message(json.dumps({"type": ERROR_EVENT, "error": e.reason}))
+        except (SessionBusyException, ServerSaturatedException) as e:
+            self.write_message(json.dumps({"type": ERROR_EVENT, "error": str(e)}))
+
+    def on_close(self):
+        if self.session is not None and self.subscriber is not None:
+            self.session.unsubscribe(self.subscriber)
+        if self.forwarder is not None:
+            self.forwarder.cancel()
+
+
+class Server:
+    def __init__(self, host: str, port: int, session_manager: SessionManager):
+        self.logger = Logger()
+        self.host = host
+        self.port = port
+        self.session_manager = session_manager
+
+    def get_application(self) -> Application:
+        handler_args = {"session_manager": self.session_manager}
+        return Application([
+            (r"/health", HealthHandler, handler_args),
+            (r"/sessions", SessionsHandler, handler_args),
+            (r"/sessions/([^/]+)", SessionHandler, handler_args),
+            (r"/sessions/([^/]+)/messages", MessagesHandler, handler_args),
+            (r"/sessions/([^/]+)/events", EventsHandler, handler_args),
+        ])
+
+    def listen(self) -> HTTPServer:
+        http_server = self.get_application().listen(self.port, address=self.host)
+        self.logger.info("Serving discussions on http://%s:%d with %d workers", self.host, self.port,
+                         self.session_manager.workers)
+        return http_server
+
+    async def run(self):
+        http_server = self.listen()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            http_server.stop()
+            self.session_manager.close()
+
+    def serve(self):
+        try:
+            asyncio.run(self.run())
+        except KeyboardInterrupt:
+            self.logger.info("Server stopped")
@@ -0,0 +1,101 @@
+import asyncio
+import time
+import uuid
+from collections import deque
+
+from roundtable.models.stream_stats import StreamStats
+from roundtable.services.llm.stream_listener import StreamListener
+
+IDLE = "idle"
+QUEUED = "queued"
+RUNNING = "running"
+
+MESSAGE_EVENT = "message"
+TOKEN_EVENT = "token"
+STREAM_START_EVENT = "stream_start"
+STREAM_END_EVENT = "stream_end"
+QUEUED_EVENT = "queued"
+STARTED_EVENT = "started"
+FINISHED_EVENT = "finished"
+ERROR_EVENT = "error"
+DISCONNECTED_EVENT = "disconnected"
+
+MAX_STORED_EVENTS = 500
+MAX_QUEUED_EVENTS = 1000
+SLOW_SUBSCRIBER_MSG = "The client did not keep up with the events of the session"
+
+
+class Session:
+    def __init__(self, loop: asyncio.AbstractEventLoop, config_overrides: dict = None):
+        self.session_id = str(uuid.uuid4())
+        self.loop = loop
+        self.config_overrides = config_overrides or {}
+        self.state = IDLE
+        self.last_active = time.monotonic()
+        # The oldest events are dropped from the history, the queue of a subscriber always fits the whole history.
+        self.events: deque[dict] = deque(maxlen=MAX_STORED_EVENTS)
+        self.subscribers: set[asyncio.Queue] = set()
+
+    def publish(self, event: dict):
+        # Tokens are only relayed live, the history keeps the complete messages for late subscribers.
+        if event["type"] != TOKEN_EVENT:
+            self.events.append(event)
+        self.last_active = time.monotonic()
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.put_nowait(event)
+            except asyncio.QueueFull:
+                self.disconnect(subscriber)
+
+    def disconnect(self, subscriber: asyncio.Queue):
+        # A subscriber that does not keep up is dropped instead of buffering the discussion in memory.
+        self.unsubscribe(subscriber)
+        while not subscriber.empty():
+            subscriber.get_nowait()
+        subscriber.put_nowait({"type": DISCONNECTED_EVENT, "error": SLOW_SUBSCRIBER_MSG})
+
+    def publish_threadsafe(self, event: dict):
+        self.loop.call_soon_threadsafe(self.publish, event)
+
+    def set_state(self, state: str):
+        self.state = state
+        self.last_active = time.monotonic()
+
+    def set_state_threadsafe(self, state: str):
+        self.loop.call_soon_threadsafe(self.set_state, state)
+
+    def on_message(self, sender: str, message: str | dict):
+        content = message.get("content", "") if isinstance(message, dict) else message
+        self.publish_threadsafe({"type": MESSAGE_EVENT, "sender": sender, "content": content})
+
+    def subscribe(self) -> asyncio.Queue:
+        subscriber = asyncio.Queue(maxsize=MAX_QUEUED_EVENTS)
+        for event in self.events:
+            subscriber.put_nowait(event)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: asyncio.Queue):
+        self.subscribers.discard(subscriber)
+
+    def is_expired(self, idle_timeout: float) -> bool:
+        return self.state == IDLE and not self.subscribers and time.monotonic() - self.last_active > idle_timeout
+
+    def to_dict(self) -> dict:
+        return {"session_id": self.session_id, "state": self.state, "config": self.config_overrides,
+                "events": list(self.events)}
+
+
+class SessionStreamListener(StreamListener):
+    def __init__(self, session: Session):
+        self.session = session
+
+    def on_stream_start(self, agent_name: str):
+        self.session.publish_threadsafe({"type": STREAM_START_EVENT, "sender": agent_name})
+
+    def on_token(self, agent_name: str, token: str):
+        self.session.publish_threadsafe({"type": TOKEN_EVENT, "sender": agent_name, "content": token})
+
+    def on_stream_end(self, agent_name: str, stats: StreamStats):
+        self.session.publish_threadsafe({"type": STREAM_END_EVENT, "sender": agent_name,
+                                         "time_to_first_token": stats.time_to_first_token})
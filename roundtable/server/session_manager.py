@@ -0,0 +1,105 @@
+import asyncio
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from roundtable.models.discussion_result import DiscussionResult
+from roundtable.server.session import ERROR_EVENT, FINISHED_EVENT, IDLE, QUEUED, QUEUED_EVENT, RUNNING, \
+    STARTED_EVENT, Session, SessionStreamListener
+from roundtable.services.discussion_room.discussion_room_pool import DiscussionRoomPool
+from roundtable.shared.exceptions.server_saturated_exception import ServerSaturatedException
+from roundtable.shared.exceptions.session_busy_exception import SessionBusyException
+from roundtable.shared.utils.configurator import Configurator
+from roundtable.shared.utils.logger import Logger, log_context
+
+SESSION_CONFIG_FIELDS = {"llm_model_name", "code_model_name", "use_code_execution"}
+
+
+class SessionManager:
+    def __init__(self, workers: int, max_queued: int, max_rooms: int, idle_timeout: float,
+                 config_overrides: dict = None):
+        self.logger = Logger()
+        self.idle_timeout = idle_timeout
+        # Every running discussion holds a room, more workers than rooms would only wait on the pool.
+        self.workers = max(1, min(workers, max_rooms))
+        self.max_queued = max_queued
+        self.discussion_room_pool = DiscussionRoomPool(max_rooms=max_rooms, idle_timeout=idle_timeout,
+                                                       config_overrides=config_overrides)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="session")
+        self.sessions: dict[str, Session] = {}
+        self.pending_discussions = 0
+        self._tasks: set[asyncio.Task] = set()
+
+    def create_session(self, config_overrides: dict = None) -> Session:
+        config_overrides = config_overrides or {}
+        unknown_fields = set(config_overrides) - SESSION_CONFIG_FIELDS
+        if unknown_fields:
+            raise ValueError(f"Settings {', '.join(sorted(unknown_fields))} cannot be changed by a session")
+        config_overrides = Configurator.instance().validate_overrides(config_overrides)
+        self.evict_expired_sessions()
+        session = Session(asyncio.get_running_loop(), config_overrides)
+        self.sessions[session.session_id] = session
+        return session
+
+    def get_session(self, session_id: str) -> Session | None:
+        return self.sessions.get(session_id)
+
+    def evict_expired_sessions(self):
+        for session_id, session in list(self.sessions.items()):
+            if session.is_expired(self.idle_timeout):
+                del self.sessions[session_id]
+                self.discussion_room_pool.remove(session_id)
+
+    def is_saturated(self) -> bool:
+        return self.pending_discussions >= self.workers + self.max_queued
+
+    def get_status(self) -> dict:
+        running_discussions = min(self.pending_discussions, self.workers)
+        return {
+            "sessions": len(self.sessions),
+            "workers": self.workers,
+            "running_discussions": running_discussions,
+            "queued_discussions": self.pending_discussions - running_discussions,
+            "max_queued_discussions": self.max_queued,
+        }
+
+    def submit(self, session: Session, message: str) -> int:
+        # Only called from the event loop, the counters need no lock.
+        if session.state != IDLE:
+            raise SessionBusyException(session.session_id)
+        if self.is_saturated():
+            raise ServerSaturatedException(self.pending_discussions)
+        position = max(self.pending_discussions - self.workers + 1, 0)
+        self.pending_discussions += 1
+        session.set_state(QUEUED)
+        session.publish({"type": QUEUED_EVENT, "position": position})
+        task = asyncio.create_task(self.run(session, message))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return position
+
+    async def run(self, session: Session, message: str):
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, self.start_discussion, session,
+                                                                      message)
+            session.publish({"type": FINISHED_EVENT, **result.dict(exclude={"problem"})})
+        except Exception as e:
+            self.logger.error("Discussion of session %s failed: %s", session.session_id, e)
+            session.publish({"type": ERROR_EVENT, "error": str(e)})
+        finally:
+            self.pending_discussions -= 1
+            session.set_state(IDLE)
+
+    def start_discussion(self, session: Session, message: str) -> DiscussionResult:
+        session.set_state_threadsafe(RUNNING)
+        session.publish_threadsafe({"type": STARTED_EVENT})
+        with log_context(session=session.session_id):
+            return self.run_discussion(session, message)
+
+    def run_discussion(self, session: Session, message: str) -> DiscussionResult:
+        with self.discussion_room_pool.use(session.session_id, callback=session.on_message,
+                                           stream_listener=SessionStreamListener(session),
+                                           config_overrides=session.config_overrides) as discussion_room:
+            return discussion_room.run(str(uuid.uuid4()), message)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
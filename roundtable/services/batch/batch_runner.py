@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from roundtable.models.batch_problem import BatchProblem
+from roundtable.models.discussion_result import DiscussionResult
+from roundtable.models.discussion_room_config import DiscussionRoomConfig
+from roundtable.services.discussion_room.discussion_room import DiscussionRoom
+from roundtable.services.retrieval.document_index import DocumentIndex
+from roundtable.shared.utils.logger import Logger
+
+
+class BatchRunner:
+    def __init__(self, config: DiscussionRoomConfig, input_path: str, output_path: str, concurrency: int):
+        self.logger = Logger()
+        self.config = config.copy(update={"use_human_input": False, "use_streaming": False})
+        self.input_path = input_path
+        self.output_path = output_path
+        self.concurrency = max(1, concurrency)
+        self._output_lock = threading.Lock()
+
+    def load_problems(self) -> list[BatchProblem]:
+        problems = []
+        with open(self.input_path, "r", encoding="utf-8") as input_file:
+            for line_number, line in enumerate(input_file, start=1):
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                if isinstance(row, str):
+                    row = {"problem": row}
+                problems.append(BatchProblem(id=str(row.get("id", line_number)), problem=row["problem"]))
+        return problems
+
+    def load_completed_ids(self) -> set[str]:
+        if not os.path.isfile(self.output_path):
+            return set()
+        completed_ids = set()
+        with open(self.output_path, "r", encoding="utf-8") as output_file:
+            for line in output_file:
+                try:
+                    result = DiscussionResult.parse_raw(line)
+                except ValueError:
+                    # A line truncated by an interruption, the discussion is run again.
+                    continue
+                if result.completed:
+                    completed_ids.add(result.id)
+        return completed_ids
+
+    def terminate_truncated_line(self):
+        if not os.path.isfile(self.output_path) or os.path.getsize(self.output_path) == 0:
+            return
+        with open(self.output_path, "rb+") as output_file:
+            output_file.seek(-1, os.SEEK_END)
+            if output_file.read(1) != b"\n":
+                output_file.write(b"\n")
+
+    def write_result(self, result: DiscussionResult):
+        with self._output_lock:
+            with open(self.output_path, "a", encoding="utf-8") as output_file:
+                output_file.write(result.json() + "\n")
+                output_file.flush()
+
+    def run_discussion(self, problem: BatchProblem) -> DiscussionResult:
+        discussion_room = DiscussionRoom(config=self.config)
+        result = discussion_room.run(problem.id, problem.problem)
+        self.write_result(result)
+        return result
+
+    def run(self) -> list[DiscussionResult]:
+        problems = self.load_problems()
+        completed_ids = self.load_completed_ids()
+        pending_problems = [problem for problem in problems if problem.id not in completed_ids]
+        self.logger.info("Batch of %d problems, %d already completed, %d to run with concurrency %d", len(problems),
+                         len(completed_ids), len(pending_problems), self.concurrency)
+        if not pending_problems:
+            return []
+        self.terminate_truncated_line()
+
+        # The index is prepared once so that concurrent rooms only open the existing collection.
+        document_index = DocumentIndex(self.config)
+        if not document_index.is_built():
+            document_index.refresh(offline=self.config.use_offline_retrieval)
+
+        results = []
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="discussion") as executor:
+            futures = [executor.submit(self.run_discussion, problem) for problem in pending_problems]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                status = "completed" if result.completed else f"failed ({result.error})"
+                self.logger.info("Discussion %s %s in %.1fs, %d rounds (%d saved), %d tokens [%d/%d]", result.id,
+                                 status, result.wall_time, result.rounds, result.rounds_saved, result.total_tokens,
+                                 len(results), len(pending_problems))
+        return results
@@ -0,0 +1,108 @@
+import re
+
+from autogen.code_utils import content_str
+
+from roundtable.services.discussion_room.roles import ASSISTANT, CONTINUE, EXECUTOR, NO_CODE_EXECUTED, \
+    NO_CODE_PROVIDED
+from roundtable.services.discussion_room.speaker_selector import APPROVAL_PATTERN, TRIVIAL_MESSAGE_MAX_LENGTH
+from roundtable.services.execution.execution_cache import CACHED_RESULT_MARKER
+
+SHINGLE_SIZE = 3
+WORD_PATTERN = re.compile(r"\w+")
+DEFAULT_REPETITION_LIMIT = 2
+# An unchanged answer of the Assistant or an unchanged output of the Executor means that the next cycle cannot add
+# anything new, the discussion is ended on the first repetition.
+REPETITION_LIMITS = {ASSISTANT: 1, EXECUTOR: 1}
+# Replies stating that there is no code are expected at every cycle without code, they are not outputs.
+SENTINEL_REPLIES = [NO_CODE_EXECUTED, NO_CODE_PROVIDED]
+TRIVIAL_STREAK_LIMIT = 3
+
+
+class ConvergenceDetector:
+    def __init__(self, similarity_threshold: float):
+        self.similarity_threshold = similarity_threshold
+        self.processed_messages = 0
+        self.last_shingles: dict[str, set[tuple]] = {}
+        self.repetitions: dict[str, int] = {}
+        self.trivial_streak = 0
+        self.has_answer = False
+        self.reason: str | None = None
+
+    def reset(self):
+        self.processed_messages = 0
+        self.last_shingles = {}
+        self.repetitions = {}
+        self.trivial_streak = 0
+        self.has_answer = False
+        self.reason = None
+
+    def update(self, messages: list[dict]) -> bool:
+        if len(messages) < self.processed_messages:
+            self.reset()
+        for message in messages[self.processed_messages:]:
+            self.observe(message)
+        self.processed_messages = len(messages)
+        return self.reason is not None
+
+    def observe(self, message: dict):
+        if self.reason is not None:
+            return
+        speaker_name = message.get("name", message.get("role"))
+        # A replayed execution result is the same output as the run it replays.
+        content = content_str(message.get("content")).replace(CACHED_RESULT_MARKER, "")
+
+        if self.is_trivial(content):
+            # Approvals are expected while the plan is agreed, they only end the discussion once there is an answer.
+            self.trivial_streak += int(self.has_answer)
+            if self.trivial_streak >= TRIVIAL_STREAK_LIMIT:
+                self.reason = f"{self.trivial_streak} consecutive replies only approved or asked to continue"
+                return
+        else:
+            self.trivial_streak = 0
+        if self.is_sentinel(content):
+            return
+        if speaker_name == ASSISTANT and not self.is_trivial(content):
+            self.has_answer = True
+
+        shingles = self.get_shingles(content)
+        last_shingles = self.last_shingles.get(speaker_name)
+        self.last_shingles[speaker_name] = shingles
+        if last_shingles is None or self.get_similarity(last_shingles, shingles) < self.similarity_threshold:
+            self.repetitions[speaker_name] = 0
+            return
+        self.repetitions[speaker_name] = self.repetitions.get(speaker_name, 0) + 1
+        if not self.has_answer:
+            # Without an answer of the Assistant, ending the discussion would leave the raw output as the answer.
+            return
+        if self.repetitions[speaker_name] >= REPETITION_LIMITS.get(speaker_name, DEFAULT_REPETITION_LIMIT):
+            if speaker_name == ASSISTANT:
+                self.reason = f"{ASSISTANT} answer unchanged across cycles"
+            elif speaker_name == EXECUTOR:
+                self.reason = f"{EXECUTOR} output stable across cycles"
+            else:
+                self.reason = f"{speaker_name} repeated the same reply {self.repetitions[speaker_name] + 1} times"
+
+    @staticmethod
+    def is_trivial(content: str) -> bool:
+        stripped_content = content.strip()
+        if len(stripped_content) > TRIVIAL_MESSAGE_MAX_LENGTH:
+            return False
+        return CONTINUE in stripped_content.upper() or APPROVAL_PATTERN.search(stripped_content) is not None
+
+    @staticmethod
+    def is_sentinel(content: str) -> bool:
+        stripped_content = content.strip()
+        return len(stripped_content) <= TRIVIAL_MESSAGE_MAX_LENGTH and any(
+            sentinel in stripped_content.upper() for sentinel in SENTINEL_REPLIES)
+
+    @staticmethod
+    def get_shingles(content: str) -> set[tuple]:
+        words = WORD_PATTERN.findall(content.lower())
+        if len(words) < SHINGLE_SIZE:
+            return {tuple(words)}
+        return {tuple(words[index:index + SHINGLE_SIZE]) for index in range(len(words) - SHINGLE_SIZE + 1)}
+
+    @staticmethod
+    def get_similarity(shingles: set[tuple], other_shingles: set[tuple]) -> float:
+        union = len(shingles | other_shingles)
+        return len(shingles & other_shingles) / union if union else 1.0
@@ -0,0 +1,86 @@
+from autogen.code_utils import content_str
+
+from roundtable.services.discussion_room.roles import ENGINEER
+from roundtable.shared.utils.logger import Logger
+from roundtable.shared.utils.truncation import truncate_middle
+
+CHARACTERS_PER_TOKEN = 4
+SUMMARY_LINE_MAX_LENGTH = 200
+SUMMARY_HEADER = "Summary of the earlier turns of the discussion:"
+# Code written by the Engineer is executed as is, so it is never truncated.
+VERBATIM_ROLES = [ENGINEER]
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARACTERS_PER_TOKEN
+
+
+class ConversationCompactor:
+    def __init__(self, agent_name: str, keep_turns: int, max_message_tokens: int, summary_max_tokens: int):
+        self.logger = Logger()
+        self.agent_name = agent_name
+        self.keep_turns = keep_turns
+        self.max_message_tokens = max_message_tokens
+        self.summary_max_tokens = summary_max_tokens
+        self.summarized_turns = 0
+        self.summary_lines: list[str] = []
+
+    def reset(self):
+        self.summarized_turns = 0
+        self.summary_lines = []
+
+    def compact(self, messages: list[dict]) -> list[dict]:
+        # The first message holds the problem and the retrieved context, it is always kept.
+        first_message, history = messages[:1], messages[1:]
+        evicted_turns = max(len(history) - self.keep_turns, 0)
+        for message in history[self.summarized_turns:evicted_turns]:
+            self.summary_lines.append(self.summarize_message(message))
+        self.summarized_turns = max(self.summarized_turns, evicted_turns)
+
+        compacted_messages = [self.truncate_message(message) for message in first_message]
+        summary = self.get_summary()
+        if summary:
+            compacted_messages.append({"role": "user", "content": summary})
+        compacted_messages += [self.truncate_message(message) for message in history[evicted_turns:]]
+
+        if self.logger.is_debug_enabled():
+            # Counting the tokens of the whole prompt is only worth it when the record is emitted.
+            self.logger.debug("%s prompt: %d messages compacted to %d, ~%d tokens reduced to ~%d", self.agent_name,
+                              len(messages), len(compacted_messages), self.count_tokens(messages),
+                              self.count_tokens(compacted_messages))
+        return compacted_messages
+
+    @staticmethod
+    def count_tokens(messages: list[dict]) -> int:
+        return sum(estimate_tokens(content_str(message.get("content"))) for message in messages)
+
+    @staticmethod
+    def summarize_message(message: dict) -> str:
+        content = " ".join(content_str(message.get("content")).split())
+        if len(content) > SUMMARY_LINE_MAX_LENGTH:
+            content = content[:SUMMARY_LINE_MAX_LENGTH].rstrip() + "..."
+        return f"- {message.get('name', message.get('role'))}: {content}"
+
+    def get_summary(self) -> str | None:
+        if not self.summary_lines:
+            return None
+        lines = []
+        summary_tokens = estimate_tokens(SUMMARY_HEADER)
+        for line in reversed(self.summary_lines):
+            summary_tokens += estimate_tokens(line)
+            if summary_tokens > self.summary_max_tokens:
+                break
+            lines.insert(0, line)
+        omitted_lines = len(self.summary_lines) - len(lines)
+        if omitted_lines:
+            lines.insert(0, f"- ({omitted_lines} earlier turns omitted)")
+        return "\n".join([SUMMARY_HEADER, *lines])
+
+    def truncate_message(self, message: dict) -> dict:
+        content = message.get("content")
+        if not isinstance(content, str) or message.get("name") in VERBATIM_ROLES:
+            return message
+        max_length = self.max_message_tokens * CHARACTERS_PER_TOKEN
+        if len(content) <= max_length:
+            return message
+        return {**message, "content": truncate_middle(content, max_length)}
@@ -0,0 +1,104 @@
+import threading
+import time
+from typing import Any
+
+from roundtable.models.budget_usage import BudgetUsage
+from roundtable.shared.exceptions.discussion_budget_exhausted_exception import DiscussionBudgetExhaustedException
+
+MIN_CALL_TIMEOUT = 1.0
+
+
+class DiscussionBudget:
+    # Wall-clock deadline and token budgets of a discussion, zero disables a limit. Calls to the models and code
+    # executions are refused once the budget is exhausted, except the final turn which has limits of its own.
+    def __init__(self, deadline: float = 0.0, prompt_token_budget: int = 0, completion_token_budget: int = 0,
+                 final_turn_timeout: float = 0.0, final_turn_max_tokens: int = 0):
+        self.deadline = deadline
+        self.prompt_token_budget = prompt_token_budget
+        self.completion_token_budget = completion_token_budget
+        self.final_turn_timeout = final_turn_timeout
+        self.final_turn_max_tokens = final_turn_max_tokens
+        self._lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.exhausted_reason: str | None = None
+        self.final_turn = False
+
+    def has_limits(self) -> bool:
+        return bool(self.deadline or self.prompt_token_budget or self.completion_token_budget)
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.monotonic()
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+            self.exhausted_reason = None
+            self.final_turn = False
+
+    def record_tokens(self, prompt_tokens: int, completion_tokens: int):
+        with self._lock:
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+
+    def get_elapsed_time(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def get_exhausted_reason(self) -> str | None:
+        with self._lock:
+            # The first limit reached is kept, the final turn may go past the others.
+            if self.exhausted_reason is None:
+                if self.deadline and self.get_elapsed_time() >= self.deadline:
+                    self.exhausted_reason = f"deadline of {self.deadline:g}s reached"
+                elif self.prompt_token_budget and self.prompt_tokens >= self.prompt_token_budget:
+                    self.exhausted_reason = f"{self.prompt_tokens} of {self.prompt_token_budget} prompt tokens used"
+                elif self.completion_token_budget and self.completion_tokens >= self.completion_token_budget:
+                    self.exhausted_reason = (f"{self.completion_tokens} of {self.completion_token_budget} completion "
+                                             f"tokens used")
+            return self.exhausted_reason
+
+    def is_exhausted(self) -> bool:
+        return self.get_exhausted_reason() is not None
+
+    def check(self):
+        if self.final_turn:
+            return
+        exhausted_reason = self.get_exhausted_reason()
+        if exhausted_reason is not None:
+            raise DiscussionBudgetExhaustedException(exhausted_reason)
+
+    def start_final_turn(self):
+        self.final_turn = True
+
+    def get_remaining_time(self) -> float | None:
+        if self.final_turn:
+            return self.final_turn_timeout or None
+        if not self.deadline:
+            return None
+        return max(self.deadline - self.get_elapsed_time(), 0.0)
+
+    def get_max_tokens(self) -> int | None:
+        if self.final_turn:
+            return self.final_turn_max_tokens or None
+        if not self.completion_token_budget:
+            return None
+        with self._lock:
+            return max(self.completion_token_budget - self.completion_tokens, 1)
+
+    def limit_params(self, params: dict[str, Any]) -> dict[str, Any]:
+        # The model stops generating at the remaining completion tokens and the call times out at the deadline.
+        params = dict(params)
+        remaining_time = self.get_remaining_time()
+        if remaining_time is not None:
+            params["timeout"] = max(remaining_time, MIN_CALL_TIMEOUT)
+        max_tokens = self.get_max_tokens()
+        if max_tokens is not None:
+            params["max_tokens"] = min(params.get("max_tokens") or max_tokens, max_tokens)
+        return params
+
+    def get_usage(self) -> BudgetUsage:
+        with self._lock:
+            return BudgetUsage(deadline=self.deadline, elapsed_time=self.get_elapsed_time(),
+                               prompt_token_budget=self.prompt_token_budget, prompt_tokens=self.prompt_tokens,
+                               completion_token_budget=self.completion_token_budget,
+                               completion_tokens=self.completion_tokens, exhausted_reason=self.exhausted_reason)
@@ -1,26 +1,46 @@
-import os
+import re
+import time
+import uuid
 from textwrap import dedent
 from typing import Callable
 
-from autogen import AssistantAgent, GroupChat, GroupChatManager
-from autogen.agentchat.contrib.retrieve_user_proxy_agent import RetrieveUserProxyAgent
+from autogen import AssistantAgent, GroupChat, OpenAIWrapper
 
+from roundtable.models.code_candidate_metrics import CodeCandidateMetrics
+from roundtable.models.discussion_metrics import DiscussionMetrics
+from roundtable.models.discussion_result import DiscussionResult
 from roundtable.models.discussion_room_config import DiscussionRoomConfig
-from roundtable.services.discussion_room.trackable_agent import CallbackGroupChatManager
+from roundtable.services.discussion_room.conversation_compactor import ConversationCompactor
+from roundtable.services.discussion_room.convergence_detector import ConvergenceDetector
+from roundtable.services.discussion_room.discussion_budget import DiscussionBudget
+from roundtable.services.discussion_room.roles import ADMIN, ASSISTANT, CONTINUE, CRITIC, ENGINEER, EXECUTOR, \
+    NEVER, NO_CODE_EXECUTED, NO_CODE_PROVIDED, SUPERVISOR, TERMINATE
+from roundtable.services.discussion_room.speaker_selector import ADAPTIVE, AdaptiveSpeakerSelector
+from roundtable.services.discussion_room.speculative_coder import SpeculativeCoder
+from roundtable.services.discussion_room.trackable_agent import CallbackGroupChatManager, \
+    TrackableRetrieveUserProxyAgent
+from roundtable.services.discussion_room.transcript_log import TranscriptLog
+from roundtable.services.execution.execution_cache import ExecutionCache
+from roundtable.services.execution.warm_code_executor import WarmCodeExecutor
+from roundtable.services.execution.warm_executor_pool import get_executor_pool
+from roundtable.services.llm.http_client_registry import SharedHttpClient, get_http_pool_stats, \
+    get_shared_http_client
+from roundtable.services.llm.model_client import RoundtableModelClient
+from roundtable.services.llm.model_scheduler import ModelScheduler, get_model_scheduler
+from roundtable.services.llm.response_cache import ResponseCache, get_response_cache
+from roundtable.services.llm.stream_listener import ConsoleStreamListener, StreamListener, StreamRelay
+from roundtable.services.metrics.metrics_exporter import MetricsExporter
+from roundtable.services.metrics.metrics_recorder import MetricsRecorder
+from roundtable.services.retrieval.context_builder import ContextBuilder
+from roundtable.services.retrieval.document_index import DocumentIndex
+from roundtable.services.retrieval.retrieval_cache import RetrievalCache, get_retrieval_cache
+from roundtable.shared.exceptions.transcript_not_found_exception import TranscriptNotFoundException
 from roundtable.shared.utils.configurator import Configurator
-from roundtable.shared.utils.logger import Logger
+from roundtable.shared.utils.logger import Logger, log_context
 
-ADMIN = "Admin"
-SUPERVISOR = "Supervisor"
-CRITIC = "Critic"
-ENGINEER = "Engineer"
-EXECUTOR = "Executor"
-ASSISTANT = "Assistant"
-RETRIEVE_ASSISTANT = "RetrieveAssistant"
-
-TERMINATE = "TERMINATE"
-NEVER = "NEVER"
-CONTINUE = "CONTINUE"
+MAX_ROUND = 20
+CODE_CANDIDATE_TEMPERATURE = 0.7
+TERMINATION_PATTERN = re.compile(rf"{TERMINATE}[\W_]*$")
 
 REPLY_TERMINATE_ON_SUCCESS = dedent(f"""
     Reply {TERMINATE} if the task has been solved at full satisfaction.
@@ -28,33 +48,142 @@ REPLY_TERMINATE_ON_SUCCESS = dedent(f"""
 
 
 class DiscussionRoom:
-    def __init__(self, callback: Callable = None):
+    def __init__(self, callback: Callable = None, stream_listener: StreamListener = None,
+                 config: DiscussionRoomConfig = None, document_index: DocumentIndex = None):
         self.logger = Logger()
         self.callback: Callable = callback
+        self.stream_relay = StreamRelay(stream_listener)
         self.discussion = None
         self.manager = None
-        configurator = Configurator.instance()
-        self.config: DiscussionRoomConfig = configurator.get_discussion_room_config()
+        self.speaker_selector: AdaptiveSpeakerSelector | None = None
+        self.metrics_recorder = MetricsRecorder()
+        self.convergence_detector: ConvergenceDetector | None = None
+        self.conversation_compactors: list[ConversationCompactor] = []
+        self.termination_reason: str | None = None
+        self.transcript_log: TranscriptLog | None = None
+        self.code_executor: WarmCodeExecutor | None = None
+        self.speculative_coder: SpeculativeCoder | None = None
+        if config is None:
+            config = Configurator.instance().get_discussion_room_config()
+        self.config: DiscussionRoomConfig = config
+        self.discussion_budget = DiscussionBudget(
+            deadline=self.config.discussion_deadline, prompt_token_budget=self.config.prompt_token_budget,
+            completion_token_budget=self.config.completion_token_budget,
+            final_turn_timeout=self.config.final_answer_timeout,
+            final_turn_max_tokens=self.config.final_answer_max_tokens)
+        self.document_index = document_index or DocumentIndex(config)
+        self.response_cache: ResponseCache | None = None
+        if self.config.use_llm_cache:
+            self.response_cache = get_response_cache(self.config.llm_cache_path, self.config.llm_cache_max_entries)
+        self.retrieval_cache: RetrievalCache | None = None
+        if self.config.use_retrieval_cache:
+            self.retrieval_cache = get_retrieval_cache(self.config.retrieval_cache_max_entries)
+        self.execution_cache: ExecutionCache | None = None
+        if self.config.use_code_execution and self.config.use_execution_cache:
+            self.execution_cache = ExecutionCache(self.config.execution_cache_max_entries,
+                                                  self.config.execution_cache_max_bytes)
+        self.shared_http_client: SharedHttpClient = get_shared_http_client(
+            self.config.base_url, self.config.api_key, max_connections=self.config.http_max_connections,
+            timeout=self.config.http_timeout, connect_timeout=self.config.http_connect_timeout)
+        self.model_scheduler: ModelScheduler | None = None
+        if self.config.use_model_scheduling:
+            self.model_scheduler = get_model_scheduler(self.config.base_url, self.shared_http_client.http_client,
+                                                       max_loaded_models=self.config.max_loaded_models,
+                                                       keep_alive=self.config.model_keep_alive)
+
+    def set_callback(self, callback: Callable):
+        self.callback = callback
+        if self.manager is not None:
+            self.manager.set_callback(callback)
+
+    def set_stream_listener(self, stream_listener: StreamListener):
+        self.stream_relay.listener = stream_listener
+
+    def get_discussion_budget(self) -> DiscussionBudget | None:
+        return self.discussion_budget if self.discussion_budget.has_limits() else None
 
     def get_llm_config(self, model_name: str):
-        llm_config = [{"base_url": self.config.base_url, "api_key": self.config.api_key, "model": model_name}]
-        return {"config_list": llm_config}
+        llm_config = [{"base_url": self.config.base_url, "api_key": self.config.api_key, "model": model_name,
+                       "model_client_cls": RoundtableModelClient.__name__}]
+        if self.config.discussion_deadline:
+            # A call timed out at the deadline is not retried.
+            llm_config[0]["max_retries"] = 0
+        # Responses are cached by the model client, autogen's legacy disk cache is disabled to avoid caching twice.
+        return {"config_list": llm_config, "cache_seed": None}
 
-    def build_discussion_room(self):
-        if self.callback:
-            group_chat_manager = CallbackGroupChatManager
-        else:
-            group_chat_manager = GroupChatManager
+    def register_model_clients(self, agents: list):
+        stream_listener = self.stream_relay if self.config.use_streaming else None
+        for agent in agents:
+            self.register_model_client(agent, agent.name, stream_listener)
+
+    def register_model_client(self, agent_or_client: AssistantAgent | OpenAIWrapper, agent_name: str,
+                              stream_listener: StreamListener = None):
+        agent_or_client.register_model_client(model_client_cls=RoundtableModelClient, agent_name=agent_name,
+                                              stream_listener=stream_listener, response_cache=self.response_cache,
+                                              metrics_recorder=self.metrics_recorder,
+                                              shared_http_client=self.shared_http_client,
+                                              model_scheduler=self.model_scheduler,
+                                              discussion_budget=self.get_discussion_budget())
+
+    def register_speculative_coder(self, engineer: AssistantAgent):
+        if self.code_executor is None:
+            self.logger.warning("Code candidates need the code execution without Docker, generating one candidate")
+            return
+        models = [self.config.code_model_name, self.config.llm_model_name]
+        if self.model_scheduler is not None and self.config.max_loaded_models < len(set(models)):
+            # The scheduler would run the candidates of the two models one model at a time, swapping the models at
+            # every turn of the Engineer, all the candidates use the code model instead.
+            models = [self.config.code_model_name]
+        temperatures = self.config.code_candidate_temperatures or [CODE_CANDIDATE_TEMPERATURE]
+        clients, candidates = [], []
+        for index in range(self.config.code_candidates):
+            candidate = CodeCandidateMetrics(index=index, model=models[index % len(models)],
+                                             temperature=temperatures[index % len(temperatures)])
+            llm_config = self.get_llm_config(candidate.model)
+            llm_config["config_list"][0]["temperature"] = candidate.temperature
+            client = OpenAIWrapper(**llm_config)
+            # Candidates are not streamed, only the selected one is added to the conversation.
+            self.register_model_client(client, ENGINEER)
+            clients.append(client)
+            candidates.append(candidate)
+        self.speculative_coder = SpeculativeCoder(clients, candidates, self.code_executor, self.metrics_recorder)
+        self.speculative_coder.register(engineer)
+
+    def register_conversation_compactors(self, agents: list):
+        for agent in agents:
+            keep_turns = self.config.compaction_keep_turns_by_role.get(agent.name, self.config.compaction_keep_turns)
+            compactor = ConversationCompactor(agent.name, keep_turns=keep_turns,
+                                              max_message_tokens=self.config.compaction_max_message_tokens,
+                                              summary_max_tokens=self.config.compaction_summary_max_tokens)
+            agent.register_hook("process_all_messages_before_reply", compactor.compact)
+            self.conversation_compactors.append(compactor)
+
+    def get_code_execution_config(self) -> dict | bool:
+        if not self.config.use_code_execution:
+            return False
+        if self.config.execute_code_in_docker:
+            return {"work_dir": "generated_code", "use_docker": True}
+        executor_pool = get_executor_pool(
+            self.config.executor_env_path, self.config.executor_workspace_path, size=self.config.executor_pool_size,
+            timeout=self.config.executor_timeout, memory_limit_mb=self.config.executor_memory_limit_mb,
+            max_runs_per_worker=self.config.executor_max_runs_per_worker,
+            preload_modules=self.config.executor_preload_modules)
+        executor_pool.start()
+        self.code_executor = WarmCodeExecutor(executor_pool, execution_cache=self.execution_cache,
+                                              discussion_budget=self.get_discussion_budget())
+        return {"executor": self.code_executor}
 
+    def build_discussion_room(self):
         llm_config = self.get_llm_config(self.config.llm_model_name)
         code_config = self.get_llm_config(self.config.code_model_name)
 
-        code_execution_config = {}
-        if self.config.use_code_execution:
-            code_execution_config = {"work_dir": "generated_code", "use_docker": self.config.execute_code_in_docker}
+        retrieve_config = self.document_index.get_retrieve_config()
+
+        code_execution_config = self.get_code_execution_config()
 
-        admin = RetrieveUserProxyAgent(
+        admin = TrackableRetrieveUserProxyAgent(
             name=ADMIN,
+            human_input_mode="ALWAYS" if self.config.use_human_input else NEVER,
             max_consecutive_auto_reply=10,
             llm_config=llm_config,
             system_message=dedent(f"""
@@ -64,20 +193,16 @@ class DiscussionRoom:
                 """),
             retrieve_config={
                 "task": "default",
-                "docs_path": [
-                    "https://raw.githubusercontent.com/lucafulgenzi/lucafulgenzi/main/README.md",
-                    "https://raw.githubusercontent.com/ZappaBoy/ZappaBoy/main/README.md",
-                    os.path.join(os.path.dirname(__file__), "..", "..", "..", "assets"),
-                ],
-                # "custom_text_types": ["non-existent-type"],
-                "chunk_token_size": 2000,
                 "model": self.config.llm_model_name,
-                "vector_db": "chroma",
-                "overwrite": False,
-                "get_or_create": True,
+                **retrieve_config,
             },
         )
 
+        admin.set_context_builder(ContextBuilder(self.config.retrieval_context_max_tokens,
+                                                 self.config.retrieval_dedup_similarity,
+                                                 index_version=self.document_index.get_index_version()),
+                                  self.retrieval_cache)
+
         supervisor = AssistantAgent(
             name=SUPERVISOR,
             llm_config=llm_config,
@@ -115,7 +240,7 @@ class DiscussionRoom:
                 code instead of partial code or code changes. If the error can't be fixed or if the task is not solved
                 even after the code is executed successfully, analyze the problem, revisit your assumption, collect 
                 additional info you need, and think of a different approach to try.
-                If you think that the task does not require code, answer with "NO CODE PROVIDED".
+                If you think that the task does not require code, answer with "{NO_CODE_PROVIDED}".
                 """),
         )
 
@@ -126,9 +251,9 @@ class DiscussionRoom:
             human_input_mode=NEVER,
             system_message=dedent(f"""
                 {EXECUTOR}. If the {ENGINEER} provide code, you must execute the code written and report the result. 
-                Install all the required dependencies before running the code. If the code execution fails, report the 
-                error message.
-                If the {ENGINEER} DO NOT provide code answer with "NO CODE EXECUTED".
+                Dependencies already installed are kept between executions, install only the missing ones before 
+                running the code. If the code execution fails, report the error message.
+                If the {ENGINEER} DO NOT provide code answer with "{NO_CODE_EXECUTED}".
                 """),
         )
 
@@ -147,39 +272,280 @@ class DiscussionRoom:
                 """),
         )
 
-        group_chat = GroupChat(messages=[], max_round=20, admin_name=ADMIN,
-                               speaker_selection_method="round_robin",
-                               agents=[admin, supervisor, critic, engineer, executor, assistant])
+        if self.config.code_candidates > 1:
+            self.register_speculative_coder(engineer)
 
-        self.manager = group_chat_manager(groupchat=group_chat, llm_config=llm_config,
-                                          human_input_mode=TERMINATE,
-                                          is_termination_msg=DiscussionRoom.is_termination_message)
-        if self.callback:
-            self.manager.set_callback(self.callback)
+        agents = [admin, supervisor, critic, engineer, executor, assistant]
+        speaker_selection_method = self.config.speaker_selection_method
+        if speaker_selection_method == ADAPTIVE:
+            self.speaker_selector = AdaptiveSpeakerSelector()
+            speaker_selection_method = self.speaker_selector
+        group_chat = GroupChat(messages=[], max_round=MAX_ROUND, admin_name=ADMIN,
+                               speaker_selection_method=speaker_selection_method,
+                               agents=agents)
+
+        self.manager = CallbackGroupChatManager(groupchat=group_chat, llm_config=llm_config,
+                                                human_input_mode=TERMINATE,
+                                                is_termination_msg=self.should_terminate)
+        self.manager.set_callback(self.callback)
+        self.manager.set_metrics_recorder(self.metrics_recorder)
+        if self.config.fan_out_agents and not self.config.use_streaming:
+            # Streamed replies are rendered one agent at a time, fan-out is only used without streaming.
+            self.manager.set_fan_out(self.config.fan_out_agents, self.config.fan_out_triggers)
+        self.manager.set_discussion_budget(self.get_discussion_budget(), ASSISTANT)
+        admin.set_metrics_recorder(self.metrics_recorder)
+        if self.config.use_streaming:
+            # Replies are already printed token by token while they are streamed.
+            self.manager.print_received_messages = False
+        if self.config.use_convergence_detection:
+            self.convergence_detector = ConvergenceDetector(self.config.convergence_similarity)
+        self.register_model_clients(agents + [self.manager])
+        if self.config.use_conversation_compaction:
+            self.register_conversation_compactors(agents)
+        if self.model_scheduler is not None:
+            self.warm_up_models(agents)
 
         self.discussion = admin
 
+    def warm_up_models(self, agents: list):
+        # Agents are listed in speaking order, the models of the first speakers are the last ones to be evicted.
+        models = [agent.llm_config["config_list"][0]["model"] for agent in agents if agent.llm_config]
+        self.model_scheduler.warm_up(models)
+
     @staticmethod
     def is_termination_message(message: dict) -> bool:
-        raw_content = message.get("content", "")
-        content = ''.join(letter for letter in raw_content if letter.isalnum())
-        return content.rstrip().endswith(TERMINATE)
+        content = message.get("content")
+        return isinstance(content, str) and TERMINATION_PATTERN.search(content) is not None
 
-    def start(self):
+    def should_terminate(self, message: dict) -> bool:
+        if DiscussionRoom.is_termination_message(message):
+            self.termination_reason = f"{message.get('name', 'An agent')} requested termination"
+            return True
+        if self.convergence_detector is not None and self.convergence_detector.update(self.manager.groupchat.messages):
+            self.termination_reason = f"Converged: {self.convergence_detector.reason}"
+            return True
+        return False
+
+    def get_rounds(self) -> int:
+        return 0 if self.manager is None else len(self.manager.groupchat.messages)
+
+    def get_rounds_saved(self) -> int:
+        if self.convergence_detector is None or self.convergence_detector.reason is None:
+            return 0
+        return max(MAX_ROUND - self.get_rounds(), 0)
+
+    def start(self, discussion_id: str = None):
         self.logger.info("Meeting started")
+        if self.config.use_streaming and self.stream_relay.listener is None:
+            self.set_stream_listener(ConsoleStreamListener())
         self.build_discussion_room()
         try:
-            user_input = input("Enter your message: ")
-            self.discuss(user_input)
+            if discussion_id is not None:
+                self.resume(discussion_id)
+            else:
+                user_input = input("Enter your message: ")
+                discussion_id = str(uuid.uuid4())
+                if self.config.use_transcript_log:
+                    self.logger.info("Discussion %s started, run `roundtable --resume %s` to resume it if interrupted",
+                                     discussion_id, discussion_id)
+                self.discuss(user_input, discussion_id=discussion_id)
         except Exception as e:
             self.logger.error(e)
             print('Sorry, something goes wrong. Try with a different input')
+        for agent_name, time_to_first_token in self.stream_relay.get_time_to_first_token().items():
+            self.logger.info("%s average time to first token: %.2fs", agent_name, time_to_first_token)
+        if self.response_cache is not None:
+            stats = self.response_cache.stats
+            self.logger.info("LLM response cache: %d hits, %d misses (%.0f%% hit rate)", stats.get_hits(), stats.misses,
+                             stats.get_hit_rate() * 100)
+        if self.retrieval_cache is not None:
+            stats = self.retrieval_cache.stats
+            self.logger.info("Retrieval cache: %d hits, %d misses (%.0f%% hit rate)", stats.hits, stats.misses,
+                             stats.get_hit_rate() * 100)
+        if self.execution_cache is not None:
+            stats = self.execution_cache.stats
+            self.logger.info("Execution cache: %d hits, %d misses (%.0f%% hit rate)", stats.hits, stats.misses,
+                             stats.get_hit_rate() * 100)
+        if self.model_scheduler is not None:
+            self.logger.info("Models loaded %d times (%d swaps) in %.2fs", self.metrics_recorder.model_loads,
+                             self.metrics_recorder.model_swaps, self.metrics_recorder.model_load_time)
+        if self.config.export_metrics:
+            self.export_metrics()
+        if self.termination_reason is not None:
+            self.logger.info("Discussion ended after %d rounds: %s (%d rounds saved)", self.get_rounds(),
+                             self.termination_reason, self.get_rounds_saved())
+        if self.speaker_selector is not None:
+            self.logger.info("Adaptive speaker selection saved %d LLM calls over %d turns compared with round robin",
+                             self.get_llm_calls_saved(), self.speaker_selector.turns)
 
-    def get_discussion(self) -> tuple[RetrieveUserProxyAgent, GroupChatManager]:
+    def get_discussion(self) -> tuple[TrackableRetrieveUserProxyAgent, CallbackGroupChatManager]:
         if self.discussion is None:
             self.build_discussion_room()
         return self.discussion, self.manager
 
-    def discuss(self, message: str):
+    def prepare_discussion(self, discussion_id: str = None, problem: str = None):
+        self.reset_discussion(discussion_id)
+        if self.config.use_transcript_log:
+            self.transcript_log = TranscriptLog(self.config.transcripts_path, self.metrics_recorder.discussion_id)
+            self.transcript_log.start(problem)
+            self.logger.debug("Transcript of discussion %s logged to %s", self.transcript_log.discussion_id,
+                              self.transcript_log.path)
+        self.manager.set_transcript_log(self.transcript_log)
+
+    def reset_discussion(self, discussion_id: str = None):
+        self.close_transcript_log()
+        self.metrics_recorder.reset(discussion_id)
+        self.stream_relay.reset()
+        self.discussion_budget.reset()
+        self.termination_reason = None
+        if self.convergence_detector is not None:
+            self.convergence_detector.reset()
+        for compactor in self.conversation_compactors:
+            compactor.reset()
+        if self.speaker_selector is not None:
+            self.speaker_selector.reset()
+        if self.code_executor is not None:
+            self.code_executor.reset()
+        if self.execution_cache is not None:
+            self.execution_cache.clear()
+
+    def close_transcript_log(self):
+        if self.transcript_log is not None:
+            self.transcript_log.close()
+            self.transcript_log = None
+        if self.manager is not None:
+            self.manager.set_transcript_log(None)
+
+    def get_metrics(self) -> DiscussionMetrics:
+        metrics = self.metrics_recorder.get_metrics()
+        metrics.http_pools = get_http_pool_stats()
+        return metrics
+
+    def export_metrics(self):
+        metrics = self.get_metrics()
+        json_path, prometheus_path = MetricsExporter.export(metrics, self.config.metrics_path)
+        self.logger.info("Discussion metrics exported to %s and %s", json_path, prometheus_path)
+        for agent in metrics.agents:
+            self.logger.debug("%s: %d turns, %.2fs (%.2fs in the model), %d prompt tokens, %d completion tokens",
+                              agent.agent_name, agent.turns, agent.wall_time, agent.llm_time, agent.prompt_tokens,
+                              agent.completion_tokens)
+        self.logger.debug("%d models loaded (%d swaps) in %.2fs", metrics.model_loads, metrics.model_swaps,
+                          metrics.model_load_time)
+        for pool in metrics.http_pools:
+            self.logger.debug("HTTP pool of %s: %d/%d connections open (%d idle), %d requests, "
+                              "peak of %d concurrent requests", pool.base_url, pool.open_connections,
+                              pool.max_connections, pool.idle_connections, pool.requests,
+                              pool.peak_requests_in_flight)
+
+    def discuss(self, message: str, discussion_id: str = None):
         discussion, manager = self.get_discussion()
-        return discussion.initiate_chat(manager, message=discussion.message_generator, problem=message)
+        self.prepare_discussion(discussion_id, problem=message)
+        try:
+            with log_context(discussion=self.metrics_recorder.discussion_id):
+                return discussion.initiate_chat(manager, message=discussion.message_generator, problem=message)
+        finally:
+            self.end_discussion()
+
+    def can_resume(self, discussion_id: str, problem: str) -> bool:
+        if not self.config.use_transcript_log:
+            return False
+        transcript_log = TranscriptLog(self.config.transcripts_path, discussion_id)
+        return transcript_log.exists() and transcript_log.load()[0] == problem
+
+    def resume(self, discussion_id: str):
+        transcript_log = TranscriptLog(self.config.transcripts_path, discussion_id)
+        if not transcript_log.exists():
+            raise TranscriptNotFoundException(discussion_id)
+        problem, entries, valid_size = transcript_log.load()
+        if not entries:
+            self.logger.info("Discussion %s was interrupted before the first message, starting it again",
+                             discussion_id)
+            return self.discuss(problem, discussion_id=discussion_id)
+        _, manager = self.get_discussion()
+        self.reset_discussion(discussion_id)
+        transcript_log.reopen(valid_size)
+        self.transcript_log = transcript_log
+        manager.set_transcript_log(transcript_log)
+        self.logger.info("Resuming discussion %s after %d messages", discussion_id, len(entries))
+        try:
+            with log_context(discussion=discussion_id):
+                return manager.resume_chat(entries)
+        finally:
+            self.end_discussion()
+
+    def end_discussion(self):
+        self.close_transcript_log()
+        if self.code_executor is not None:
+            self.code_executor.reset()
+        if self.discussion_budget.exhausted_reason is not None:
+            self.termination_reason = f"Discussion budget exhausted: {self.discussion_budget.exhausted_reason}"
+
+    def run(self, problem_id: str, problem: str) -> DiscussionResult:
+        result = DiscussionResult(id=problem_id, problem=problem)
+        started_at = time.perf_counter()
+        try:
+            self.get_discussion()
+            self.clear_token_usage()
+            if self.can_resume(problem_id, problem):
+                self.resume(problem_id)
+            else:
+                self.discuss(problem, discussion_id=problem_id)
+            result.completed = True
+            result.answer = self.get_final_answer()
+        except Exception as e:
+            self.logger.error("Discussion %s failed: %s", problem_id, e)
+            result.error = str(e)
+        result.wall_time = time.perf_counter() - started_at
+        if self.manager is not None:
+            result.rounds = self.get_rounds()
+            result.termination_reason = self.termination_reason
+            if result.termination_reason is None and result.rounds >= MAX_ROUND:
+                result.termination_reason = "Maximum number of rounds reached"
+            result.rounds_saved = self.get_rounds_saved()
+            result.llm_calls_saved = self.get_llm_calls_saved()
+            if self.config.export_metrics:
+                self.export_metrics()
+            result.prompt_tokens, result.completion_tokens, result.total_tokens = self.get_token_usage()
+            result.model_swaps = self.metrics_recorder.model_swaps
+            result.model_load_time = self.metrics_recorder.model_load_time
+            if self.discussion_budget.has_limits():
+                result.budget = self.discussion_budget.get_usage()
+        return result
+
+    def get_llm_calls_saved(self) -> int:
+        return 0 if self.speaker_selector is None else self.speaker_selector.get_turns_saved()
+
+    def get_agents(self) -> list:
+        return [] if self.manager is None else self.manager.groupchat.agents + [self.manager]
+
+    def get_clients(self) -> list[OpenAIWrapper]:
+        clients = [agent.client for agent in self.get_agents() if agent.client is not None]
+        if self.speculative_coder is not None:
+            clients += self.speculative_coder.clients
+        return clients
+
+    def clear_token_usage(self):
+        for client in self.get_clients():
+            client.clear_usage_summary()
+
+    def get_token_usage(self) -> tuple[int, int, int]:
+        prompt_tokens, completion_tokens = 0, 0
+        for client in self.get_clients():
+            for model_usage in (client.total_usage_summary or {}).values():
+                if isinstance(model_usage, dict):
+                    prompt_tokens += model_usage.get("prompt_tokens", 0)
+                    completion_tokens += model_usage.get("completion_tokens", 0)
+        return prompt_tokens, completion_tokens, prompt_tokens + completion_tokens
+
+    def get_final_answer(self) -> str | None:
+        messages = self.manager.groupchat.messages if self.manager is not None else []
+        answers = [message for message in messages if message.get("content")]
+        assistant_answers = [message for message in answers if message.get("name") == ASSISTANT]
+        if assistant_answers:
+            answers = assistant_answers
+        if not answers:
+            return None
+        answer = answers[-1]["content"].rstrip()
+        if answer.endswith(TERMINATE):
+            answer = answer[:-len(TERMINATE)].rstrip()
+        return answer
@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from roundtable.services.discussion_room.discussion_room import DiscussionRoom
+from roundtable.services.llm.stream_listener import StreamListener
+from roundtable.shared.exceptions.room_pool_exhausted_exception import RoomPoolExhaustedException
+from roundtable.shared.utils.configurator import Configurator
+from roundtable.shared.utils.logger import Logger
+
+
+class PooledDiscussionRoom:
+    def __init__(self, discussion_room: DiscussionRoom):
+        self.discussion_room = discussion_room
+        self.last_used = time.monotonic()
+        self.busy = False
+
+
+class DiscussionRoomPool:
+    def __init__(self, max_rooms: int, idle_timeout: float, config_overrides: dict = None):
+        self.logger = Logger()
+        self.max_rooms = max_rooms
+        self.idle_timeout = idle_timeout
+        self.config_overrides = config_overrides or {}
+        self._rooms: OrderedDict[str, PooledDiscussionRoom] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rooms)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._rooms
+
+    @contextmanager
+    def use(self, session_id: str, callback: Callable = None, stream_listener: StreamListener = None,
+            config_overrides: dict = None) -> Iterator[DiscussionRoom]:
+        pooled_room = self.acquire(session_id, callback, stream_listener, config_overrides)
+        try:
+            yield pooled_room.discussion_room
+        finally:
+            self.release(pooled_room)
+
+    def acquire(self, session_id: str, callback: Callable = None, stream_listener: StreamListener = None,
+                config_overrides: dict = None) -> PooledDiscussionRoom:
+        with self._lock:
+            self.evict_idle_rooms()
+            pooled_room = self._rooms.get(session_id)
+            if pooled_room is None:
+                self.make_room()
+                # New rooms take the current configuration snapshot, rooms already live keep the one they started with.
+                config = Configurator.instance().get_discussion_room_config(**self.config_overrides,
+                                                                            **(config_overrides or {}))
+                pooled_room = PooledDiscussionRoom(DiscussionRoom(callback=callback, stream_listener=stream_listener,
+                                                                   config=config))
+                self._rooms[session_id] = pooled_room
+                self.logger.debug("Discussion room created for session %s (%d live)", session_id, len(self._rooms))
+            else:
+                pooled_room.discussion_room.set_callback(callback)
+                pooled_room.discussion_room.set_stream_listener(stream_listener)
+            self._rooms.move_to_end(session_id)
+            pooled_room.busy = True
+            pooled_room.last_used = time.monotonic()
+            return pooled_room
+
+    def release(self, pooled_room: PooledDiscussionRoom):
+        with self._lock:
+            pooled_room.busy = False
+            pooled_room.last_used = time.monotonic()
+
+    def remove(self, session_id: str):
+        with self._lock:
+            self._rooms.pop(session_id, None)
+
+    def evict_idle_rooms(self):
+        now = time.monotonic()
+        for session_id, pooled_room in list(self._rooms.items()):
+            if not pooled_room.busy and now - pooled_room.last_used > self.idle_timeout:
+                del self._rooms[session_id]
+                self.logger.debug("Discussion room of session %s evicted after being idle", session_id)
+
+    def make_room(self):
+        if len(self._rooms) < self.max_rooms:
+            return
+        for session_id, pooled_room in self._rooms.items():
+            if not pooled_room.busy:
+                del self._rooms[session_id]
+                self.logger.debug("Discussion room of session %s evicted to make room", session_id)
+                return
+        raise RoomPoolExhaustedException(self.max_rooms)
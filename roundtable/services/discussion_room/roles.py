@@ -0,0 +1,14 @@
+ADMIN = "Admin"
+SUPERVISOR = "Supervisor"
+CRITIC = "Critic"
+ENGINEER = "Engineer"
+EXECUTOR = "Executor"
+ASSISTANT = "Assistant"
+RETRIEVE_ASSISTANT = "RetrieveAssistant"
+
+TERMINATE = "TERMINATE"
+NEVER = "NEVER"
+CONTINUE = "CONTINUE"
+
+NO_CODE_PROVIDED = "NO CODE PROVIDED"
+NO_CODE_EXECUTED = "NO CODE EXECUTED"
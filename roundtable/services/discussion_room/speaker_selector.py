@@ -0,0 +1,93 @@
+import re
+
+from autogen import Agent, GroupChat
+from autogen.code_utils import UNKNOWN, content_str, extract_code
+
+from roundtable.services.discussion_room.roles import ADMIN, ASSISTANT, CRITIC, ENGINEER, EXECUTOR, \
+    NO_CODE_EXECUTED, NO_CODE_PROVIDED, SUPERVISOR, TERMINATE
+
+ROUND_ROBIN = "round_robin"
+ADAPTIVE = "adaptive"
+
+TRIVIAL_MESSAGE_MAX_LENGTH = 80
+EXECUTION_FAILED = "execution failed"
+APPROVAL_PATTERN = re.compile(r"\b(approved?|lgtm|go ahead|proceed)\b", re.IGNORECASE)
+REJECTION_PATTERN = re.compile(r"\b(not|don't|do not|cannot|can't)\s+(be\s+)?(approved?|go ahead|proceed)\b",
+                               re.IGNORECASE)
+
+
+class AdaptiveSpeakerSelector:
+    def __init__(self):
+        self.turns = 0
+        self.skipped_turns = 0
+        self.added_turns = 0
+        self.reviewing_execution = False
+
+    def reset(self):
+        self.turns = 0
+        self.skipped_turns = 0
+        self.added_turns = 0
+        self.reviewing_execution = False
+
+    def get_turns_saved(self) -> int:
+        return self.skipped_turns - self.added_turns
+
+    def __call__(self, last_speaker: Agent, groupchat: GroupChat) -> Agent:
+        round_robin_speaker = groupchat.next_agent(last_speaker)
+        content = content_str(groupchat.messages[-1].get("content")) if groupchat.messages else ""
+        speaker_name = self.select_speaker_name(last_speaker.name, content)
+        speaker = round_robin_speaker
+        if speaker_name is not None and speaker_name in groupchat.agent_names:
+            speaker = groupchat.agent_by_name(speaker_name)
+        self.turns += 1
+        # Agents jumped over going forward are skipped turns, routing back to an earlier agent adds the turn of that
+        # agent, which round robin would not have called at this point.
+        offset = groupchat.agents.index(speaker) - groupchat.agents.index(round_robin_speaker)
+        if offset >= 0:
+            self.skipped_turns += offset
+        else:
+            self.added_turns += 1
+        return speaker
+
+    def select_speaker_name(self, last_speaker_name: str, content: str) -> str | None:
+        if last_speaker_name != ASSISTANT and self.is_termination_pending(content):
+            return ASSISTANT
+        if last_speaker_name == CRITIC and self.reviewing_execution:
+            self.reviewing_execution = False
+            return ASSISTANT if self.is_approval(content) else ENGINEER
+        if last_speaker_name == ADMIN and self.is_approval(content):
+            return ENGINEER
+        if last_speaker_name == SUPERVISOR and self.is_trivial(content):
+            return ENGINEER
+        if last_speaker_name == ENGINEER:
+            return EXECUTOR if self.has_code_block(content) else ASSISTANT
+        if last_speaker_name == EXECUTOR:
+            if self.is_execution_failed(content):
+                return ENGINEER
+            # The Critic reviews the executed code before the Assistant drafts the answer.
+            self.reviewing_execution = True
+            return CRITIC
+        return None
+
+    @staticmethod
+    def is_termination_pending(content: str) -> bool:
+        return TERMINATE in content
+
+    @staticmethod
+    def is_approval(content: str) -> bool:
+        return APPROVAL_PATTERN.search(content) is not None and REJECTION_PATTERN.search(content) is None
+
+    @staticmethod
+    def is_trivial(content: str) -> bool:
+        return len(content.strip()) <= TRIVIAL_MESSAGE_MAX_LENGTH
+
+    @staticmethod
+    def has_code_block(content: str) -> bool:
+        if NO_CODE_PROVIDED in content:
+            return False
+        code_blocks = extract_code(content)
+        return not (len(code_blocks) == 1 and code_blocks[0][0] == UNKNOWN)
+
+    @staticmethod
+    def is_execution_failed(content: str) -> bool:
+        return NO_CODE_EXECUTED not in content and EXECUTION_FAILED in content
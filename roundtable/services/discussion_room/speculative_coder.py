@@ -0,0 +1,128 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from autogen import Agent, ConversableAgent, OpenAIWrapper
+
+from roundtable.models.code_candidate_metrics import CANCELLED, ERROR, FAILED, NO_CODE, PASSED, PENDING, \
+    CodeCandidateMetrics
+from roundtable.services.execution.warm_code_executor import WarmCodeExecutor
+from roundtable.services.execution.warm_executor_pool import CANCELLED_EXIT_CODE
+from roundtable.services.metrics.metrics_recorder import MetricsRecorder
+from roundtable.shared.exceptions.discussion_budget_exhausted_exception import DiscussionBudgetExhaustedException
+from roundtable.shared.utils.logger import Logger
+
+
+class SpeculativeCoder:
+    # Reply function of the Engineer generating several candidate replies concurrently, with different models and
+    # temperatures. The code of every candidate is run as soon as it is generated and the first one that runs
+    # successfully is the reply of the Engineer, the other candidates are cancelled.
+    def __init__(self, clients: list[OpenAIWrapper], candidates: list[CodeCandidateMetrics],
+                 code_executor: WarmCodeExecutor, metrics_recorder: MetricsRecorder = None):
+        self.logger = Logger()
+        self.clients = clients
+        self.candidates = candidates
+        self.code_executor = code_executor
+        self.metrics_recorder = metrics_recorder
+
+    def register(self, agent: ConversableAgent):
+        # Takes the place of the model reply, the termination and human input checks still come first.
+        agent.replace_reply_func(ConversableAgent.generate_oai_reply, self.generate_reply)
+
+    def generate_reply(self, recipient: ConversableAgent, messages: list[dict] = None, sender: Agent = None,
+                       config=None) -> tuple[bool, str | None]:
+        if messages is None:
+            messages = recipient._oai_messages[sender]
+        reply = self.generate(recipient._oai_system_message + messages)
+        if reply is None:
+            self.logger.warning("No code candidate replied, generating the reply of the %s with its own model",
+                                recipient.name)
+            return recipient.generate_oai_reply(messages, sender, config)
+        return True, reply
+
+    def generate(self, messages: list[dict]) -> str | None:
+        started_at = time.perf_counter()
+        candidates = [candidate.copy() for candidate in self.candidates]
+        replies: list[str | None] = [None] * len(candidates)
+        cancel_event = threading.Event()
+        # The threads of the executor do not inherit the logging context of the discussion, it is copied explicitly.
+        context = contextvars.copy_context()
+        executor = ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix="code-candidate")
+        futures: dict[Future, int] = {
+            executor.submit(context.copy().run, self.run_candidate, candidate, messages, cancel_event): index
+            for index, candidate in enumerate(candidates)}
+        winner: int | None = None
+        try:
+            pending = set(futures)
+            while pending and winner is None:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=futures.get):
+                    index = futures[future]
+                    try:
+                        replies[index] = future.result()
+                    except DiscussionBudgetExhaustedException:
+                        raise
+                    except Exception as e:
+                        self.logger.warning("Code candidate %d failed: %s", index, e)
+                        candidates[index].status = ERROR
+                    if winner is None and candidates[index].status == PASSED:
+                        winner = index
+        finally:
+            # The code of the other candidates is stopped, their replies are discarded. Model calls already sent are
+            # not interrupted, they end in the background.
+            cancel_event.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.record_candidates(candidates, time.perf_counter() - started_at)
+        if winner is None:
+            winner = next((index for index, reply in enumerate(replies) if reply is not None), None)
+            if winner is None:
+                return None
+            self.logger.info("No code candidate ran successfully, keeping candidate %d", winner)
+        else:
+            self.logger.info("Code candidate %d (%s, temperature %.1f) ran successfully first", winner,
+                             candidates[winner].model, candidates[winner].temperature)
+        return replies[winner]
+
+    def run_candidate(self, candidate: CodeCandidateMetrics, messages: list[dict],
+                      cancel_event: threading.Event) -> str | None:
+        started_at = time.perf_counter()
+        client = self.clients[candidate.index]
+        response = client.create(messages=messages, cache=None)
+        reply = client.extract_text_or_completion_object(response)[0]
+        candidate.generation_time = time.perf_counter() - started_at
+        if not isinstance(reply, str):
+            candidate.status = NO_CODE
+            return None
+        code_blocks = self.code_executor.code_extractor.extract_code_blocks(reply)
+        if not code_blocks:
+            candidate.status = NO_CODE
+            return reply
+        if cancel_event.is_set():
+            candidate.status = CANCELLED
+            return reply
+        started_at = time.perf_counter()
+        result = self.code_executor.execute_code_blocks(code_blocks, cancel_event=cancel_event)
+        candidate.execution_time = time.perf_counter() - started_at
+        candidate.exit_code = result.exit_code
+        if result.exit_code == CANCELLED_EXIT_CODE:
+            candidate.status = CANCELLED
+        else:
+            candidate.status = PASSED if result.exit_code == 0 else FAILED
+        return reply
+
+    def record_candidates(self, candidates: list[CodeCandidateMetrics], elapsed_time: float):
+        for candidate in candidates:
+            candidate = candidate.copy()
+            if candidate.status == PENDING:
+                # Still waiting for the model or running its code when the candidates were cancelled.
+                candidate.status = CANCELLED
+                if candidate.generation_time:
+                    candidate.execution_time = max(elapsed_time - candidate.generation_time, 0.0)
+                else:
+                    candidate.generation_time = elapsed_time
+            self.logger.debug("Code candidate %d (%s, temperature %.1f): %s, %.2fs generating, %.2fs executing",
+                              candidate.index, candidate.model, candidate.temperature, candidate.status,
+                              candidate.generation_time, candidate.execution_time)
+            if self.metrics_recorder is not None:
+                self.metrics_recorder.record_code_candidate(candidate)
@@ -1,17 +1,224 @@
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable
 
-from autogen import GroupChatManager
+from autogen import Agent, GroupChat, GroupChatManager
+from autogen.agentchat.groupchat import NoEligibleSpeaker
+from autogen.agentchat.contrib.retrieve_user_proxy_agent import RetrieveUserProxyAgent
+
+from roundtable.services.discussion_room.discussion_budget import DiscussionBudget
+from roundtable.services.discussion_room.transcript_log import TranscriptLog
+from roundtable.services.metrics.metrics_recorder import MetricsRecorder
+from roundtable.services.retrieval.context_builder import ContextBuilder
+from roundtable.services.retrieval.retrieval_cache import RetrievalCache
+from roundtable.shared.utils.logger import Logger, log_context
+
+FINAL_TURN_MESSAGE = ("The discussion has to end now ({reason}). Give the best answer possible with what has been "
+                      "found so far, without asking for anything else.")
 
 
 class CallbackGroupChatManager(GroupChatManager):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.logger = Logger()
         self.callback = None
+        self.metrics_recorder: MetricsRecorder | None = None
+        self.transcript_log: TranscriptLog | None = None
+        self.print_received_messages = True
+        self.fan_out_agent_names: list[str] = []
+        self.fan_out_trigger_names: list[str] = []
+        self.discussion_budget: DiscussionBudget | None = None
+        self.final_speaker_name: str | None = None
+        self.replace_reply_func(GroupChatManager.run_chat, CallbackGroupChatManager.run_chat)
 
     def set_callback(self, callback: Callable):
         self.callback = callback
 
+    def set_metrics_recorder(self, metrics_recorder: MetricsRecorder):
+        self.metrics_recorder = metrics_recorder
+
+    def set_transcript_log(self, transcript_log: TranscriptLog | None):
+        self.transcript_log = transcript_log
+
+    def set_fan_out(self, agent_names: list[str], trigger_names: list[str]):
+        self.fan_out_agent_names = agent_names
+        self.fan_out_trigger_names = trigger_names
+
+    def set_discussion_budget(self, discussion_budget: DiscussionBudget | None, final_speaker_name: str):
+        self.discussion_budget = discussion_budget
+        self.final_speaker_name = final_speaker_name
+
+    def is_budget_exhausted(self) -> bool:
+        return self.discussion_budget is not None and self.discussion_budget.is_exhausted()
+
+    def _print_received_message(self, message, sender):
+        if self.print_received_messages:
+            super()._print_received_message(message, sender)
+
     def _process_received_message(self, message, sender, silent):
-        self.callback(sender.name, message)
+        if self.metrics_recorder:
+            self.metrics_recorder.end_turn(sender.name)
+        if self.callback:
+            self.callback(sender.name, message)
+        if self.transcript_log:
+            self.transcript_log.append(sender.name, self._message_to_dict(message))
         return super()._process_received_message(message, sender, silent)
+
+    def restore_message(self, message: dict, speaker: Agent) -> dict:
+        # Same bookkeeping of `speaker.send(message, self)` without going through the receive path again.
+        speaker._append_oai_message(message, "assistant", self)
+        self._append_oai_message(message, "user", speaker)
+        return self.last_message(speaker)
+
+    def resume_chat(self, entries: list[tuple[str, dict]]) -> tuple[bool, str | None]:
+        # The histories are rebuilt from the logged messages without calling any model, then the chat continues from
+        # the last message as if it had just been received.
+        groupchat = self.groupchat
+        groupchat.reset()
+        self.clear_history()
+        for agent in groupchat.agents:
+            agent.clear_history()
+            agent.reset_consecutive_auto_reply_counter()
+        for sender_name, message in entries[:-1]:
+            speaker = groupchat.agent_by_name(sender_name)
+            message = self.restore_message(message, speaker)
+            groupchat.append(message, speaker)
+            for agent in groupchat.agents:
+                if agent != speaker:
+                    self._append_oai_message(message, "assistant", agent)
+                    agent._append_oai_message(message, "user", self)
+        sender_name, message = entries[-1]
+        speaker = groupchat.agent_by_name(sender_name)
+        self.restore_message(message, speaker)
+        # The restored messages count towards the maximum number of rounds, the last one is appended by the loop.
+        return self.run_chat(messages=self._oai_messages[speaker], sender=speaker, config=groupchat,
+                             first_round=len(entries) - 1)
+
+    def get_fan_out_group(self, speaker: Agent, last_speaker: Agent, groupchat: GroupChat) -> list[Agent]:
+        if speaker.name not in self.fan_out_agent_names or last_speaker.name not in self.fan_out_trigger_names:
+            return [speaker]
+        return [agent for agent in groupchat.agents if agent.name in self.fan_out_agent_names]
+
+    def generate_agent_reply(self, agent: Agent) -> str | dict | None:
+        with log_context(agent=agent.name):
+            return agent.generate_reply(sender=self)
+
+    def generate_replies(self, agents: list[Agent]) -> list[tuple[Agent, str | dict | None]]:
+        if len(agents) == 1:
+            return [(agents[0], self.generate_agent_reply(agents[0]))]
+        # Every agent of the group replies to the same transcript, the replies are appended in the order of the agents.
+        # The threads of the executor do not inherit the logging context of the discussion, it is copied explicitly.
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=len(agents), thread_name_prefix="fan-out") as executor:
+            replies = list(executor.map(lambda agent: context.copy().run(self.generate_agent_reply, agent), agents))
+        return [(agent, reply) for agent, reply in zip(agents, replies) if reply is not None]
+
+    def generate_final_turn(self, groupchat: GroupChat) -> list[tuple[Agent, str | dict | None]]:
+        # Once the budget is exhausted the discussion is not aborted, the final speaker answers with what has been
+        # found so far.
+        exhausted_reason = self.discussion_budget.get_exhausted_reason()
+        if self.final_speaker_name not in groupchat.agent_names:
+            return []
+        final_speaker = groupchat.agent_by_name(self.final_speaker_name)
+        self.logger.info("Discussion budget exhausted (%s), %s gives the final answer", exhausted_reason,
+                         final_speaker.name)
+        self.discussion_budget.start_final_turn()
+        self.send({"content": FINAL_TURN_MESSAGE.format(reason=exhausted_reason)}, final_speaker,
+                  request_reply=False, silent=True)
+        try:
+            return [(final_speaker, self.generate_agent_reply(final_speaker))]
+        except Exception as e:
+            self.logger.error("Final answer of %s failed: %s", final_speaker.name, e)
+            return []
+
+    def run_chat(self, messages: list[dict] = None, sender: Agent = None, config: GroupChat = None,
+                 first_round: int = 0) -> tuple[bool, str | None]:
+        # Same loop of `GroupChatManager.run_chat`, except that the speakers of a fan-out group are queried together.
+        if messages is None:
+            messages = self._oai_messages[sender]
+        message = messages[-1]
+        speaker = sender
+        groupchat = config
+        pending_replies: list[tuple[Agent, str | dict | None]] = []
+        final_turn = False
+        for i in range(first_round, groupchat.max_round):
+            groupchat.append(message, speaker)
+            for agent in groupchat.agents:
+                if agent != speaker:
+                    self.send(message, agent, request_reply=False, silent=True)
+            if final_turn or self._is_termination_msg(message) or i == groupchat.max_round - 1:
+                break
+            if not pending_replies and self.is_budget_exhausted():
+                final_turn = True
+                with log_context(round=i + 1):
+                    pending_replies = self.generate_final_turn(groupchat)
+            if not pending_replies and not final_turn:
+                try:
+                    with log_context(round=i + 1):
+                        next_speaker = groupchat.select_speaker(speaker, self)
+                        pending_replies = self.generate_replies(self.get_fan_out_group(next_speaker, speaker,
+                                                                                       groupchat))
+                except KeyboardInterrupt:
+                    if groupchat.admin_name not in groupchat.agent_names:
+                        raise
+                    admin = groupchat.agent_by_name(groupchat.admin_name)
+                    pending_replies = [(admin, admin.generate_reply(sender=self))]
+                except NoEligibleSpeaker:
+                    break
+                except Exception:
+                    # Calls refused, or cut by the deadline, once the budget is exhausted.
+                    if not self.is_budget_exhausted():
+                        raise
+                    final_turn = True
+                    with log_context(round=i + 1):
+                        pending_replies = self.generate_final_turn(groupchat)
+            if not pending_replies:
+                break
+            speaker, reply = pending_replies.pop(0)
+            if reply is None:
+                break
+            if (groupchat.enable_clear_history and isinstance(reply, dict) and reply["content"]
+                    and "CLEAR HISTORY" in reply["content"].upper()):
+                reply["content"] = self.clear_agents_history(reply, groupchat)
+            speaker.send(reply, self, request_reply=False)
+            message = self.last_message(speaker)
+        return True, None
+
+
+class TrackableRetrieveUserProxyAgent(RetrieveUserProxyAgent):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics_recorder: MetricsRecorder | None = None
+        self.context_builder: ContextBuilder | None = None
+        self.retrieval_cache: RetrievalCache | None = None
+
+    def set_metrics_recorder(self, metrics_recorder: MetricsRecorder):
+        self.metrics_recorder = metrics_recorder
+
+    def set_context_builder(self, context_builder: ContextBuilder | None, retrieval_cache: RetrievalCache = None):
+        self.context_builder = context_builder
+        self.retrieval_cache = retrieval_cache
+
+    def retrieve_docs(self, problem: str, n_results: int = 20, search_string: str = ""):
+        started_at = time.perf_counter()
+        try:
+            self.retrieve_context(problem, n_results=n_results, search_string=search_string)
+        finally:
+            if self.metrics_recorder:
+                self.metrics_recorder.record_retrieval(self.name, time.perf_counter() - started_at)
+
+    def retrieve_context(self, problem: str, n_results: int, search_string: str):
+        if self.context_builder is None:
+            return super().retrieve_docs(problem, n_results=n_results, search_string=search_string)
+        key = self.context_builder.get_key(problem, n_results, search_string)
+        results = self.retrieval_cache.get(key) if self.retrieval_cache is not None else None
+        if results is None:
+            super().retrieve_docs(problem, n_results=n_results, search_string=search_string)
+            results = self.context_builder.build(self._results, problem)
+            if self.retrieval_cache is not None:
+                self.retrieval_cache.set(key, results)
+        self._results = results
+        self._search_string = search_string
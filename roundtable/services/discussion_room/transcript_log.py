@@ -0,0 +1,70 @@
+import json
+import os
+from typing import IO, Optional
+
+from roundtable.shared.utils.logger import Logger
+
+PROBLEM_KEY = "problem"
+SENDER_KEY = "sender"
+MESSAGE_KEY = "message"
+
+
+class TranscriptLog:
+    def __init__(self, transcripts_path: str, discussion_id: str):
+        self.logger = Logger()
+        self.discussion_id = discussion_id
+        self.path = os.path.join(transcripts_path, f"{discussion_id}.jsonl")
+        self._file: Optional[IO[str]] = None
+
+    def exists(self) -> bool:
+        return os.path.isfile(self.path)
+
+    def start(self, problem: str = None):
+        self.close()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self.write({PROBLEM_KEY: problem})
+
+    def reopen(self, valid_size: int):
+        # Anything after the last complete entry was cut by a crash and is dropped before appending again.
+        self.close()
+        with open(self.path, "rb+") as log_file:
+            log_file.truncate(valid_size)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def append(self, sender_name: str, message: dict):
+        if self._file is None:
+            return
+        message = {key: value for key, value in message.items() if value is not None}
+        self.write({SENDER_KEY: sender_name, MESSAGE_KEY: message})
+
+    def write(self, entry: dict):
+        # One line per entry flushed right away, a crash loses at most the message being written.
+        self._file.write(json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def load(self) -> tuple[str | None, list[tuple[str, dict]], int]:
+        problem = None
+        entries = []
+        valid_size = 0
+        with open(self.path, "rb") as log_file:
+            for line in log_file:
+                try:
+                    entry = json.loads(line) if line.endswith(b"\n") else None
+                except ValueError:
+                    entry = None
+                if entry is None:
+                    self.logger.warning("Transcript of discussion %s is truncated, resuming from the last complete "
+                                        "message", self.discussion_id)
+                    break
+                valid_size += len(line)
+                if SENDER_KEY in entry:
+                    entries.append((entry[SENDER_KEY], entry[MESSAGE_KEY]))
+                else:
+                    problem = entry.get(PROBLEM_KEY)
+        return problem, entries, valid_size
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,73 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from autogen.coding.base import CodeBlock, CodeResult
+
+from roundtable.models.execution_cache_stats import ExecutionCacheStats
+from roundtable.services.execution.warm_executor_pool import CANCELLED_EXIT_CODE, TIMEOUT_EXIT_CODE
+
+CACHED_RESULT_MARKER = "[Cached result of an identical previous execution, the code was not run again]\n"
+NOT_CACHED_EXIT_CODES = {TIMEOUT_EXIT_CODE, CANCELLED_EXIT_CODE}
+
+
+class ExecutionCache:
+    # Results are only replayed within a discussion, code depending on time, randomness or external state would
+    # otherwise replay stale results to other discussions.
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = ExecutionCacheStats()
+        self._results: OrderedDict[str, tuple[int, str]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self._size = 0
+            self.stats = ExecutionCacheStats()
+
+    @staticmethod
+    def normalize_code(code: str) -> str:
+        # Trailing whitespace and surrounding blank lines do not change the behaviour of the code, indentation does.
+        lines = [line.rstrip() for line in code.replace("\r\n", "\n").split("\n")]
+        return "\n".join(lines).strip("\n")
+
+    @staticmethod
+    def get_key(code_blocks: list[CodeBlock], fingerprint: str) -> str:
+        blocks = [[code_block.language.lower(), ExecutionCache.normalize_code(code_block.code)]
+                  for code_block in code_blocks]
+        serialized_blocks = json.dumps({"blocks": blocks, "fingerprint": fingerprint})
+        return hashlib.sha256(serialized_blocks.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[CodeResult]:
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self.stats.misses += 1
+                return None
+            self._results.move_to_end(key)
+            self.stats.hits += 1
+            exit_code, output = result
+            return CodeResult(exit_code=exit_code, output=CACHED_RESULT_MARKER + output)
+
+    def set(self, key: str, result: CodeResult):
+        # Timeouts depend on the load of the machine and cancelled runs did not finish, running the code again may
+        # succeed.
+        if result.exit_code in NOT_CACHED_EXIT_CODES or len(result.output) > self.max_bytes:
+            return
+        with self._lock:
+            previous_result = self._results.pop(key, None)
+            if previous_result is not None:
+                self._size -= len(previous_result[1])
+            self._results[key] = (result.exit_code, result.output)
+            self._size += len(result.output)
+            self.stats.writes += 1
+            while len(self._results) > self.max_entries or self._size > self.max_bytes:
+                _, (_, output) = self._results.popitem(last=False)
+                self._size -= len(output)
+                self.stats.evictions += 1
+
@@ -0,0 +1,82 @@
+# Entry point of the warm worker processes, it only depends on the standard library since it runs in the
+# interpreter of the shared execution environment.
+import importlib
+import json
+import os
+import resource
+import sys
+import traceback
+
+MAX_OUTPUT_LENGTH = 20000
+
+
+def set_memory_limit(memory_limit_mb: int):
+    if memory_limit_mb > 0:
+        memory_limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+
+def preload_modules(modules: list[str]):
+    for module in modules:
+        try:
+            importlib.import_module(module)
+        except Exception:
+            pass
+
+
+def execute(code: str, workspace: str, output_path: str) -> dict:
+    os.chdir(workspace)
+    exit_code = 0
+    with open(output_path, "w+b") as output_file:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        saved_stdout, saved_stderr = os.dup(1), os.dup(2)
+        # File descriptors are redirected so that the output of subprocesses started by the code is captured too.
+        os.dup2(output_file.fileno(), 1)
+        os.dup2(output_file.fileno(), 2)
+        try:
+            exec(compile(code, "<generated code>", "exec"), {"__name__": "__main__"})
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except BaseException:
+            error_type, error, error_traceback = sys.exc_info()
+            # The frame of this worker is skipped, the traceback starts from the generated code.
+            traceback.print_exception(error_type, error, error_traceback.tb_next)
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(saved_stdout, 1)
+            os.dup2(saved_stderr, 2)
+            os.close(saved_stdout)
+            os.close(saved_stderr)
+        output_file.seek(0)
+        output = output_file.read(MAX_OUTPUT_LENGTH + 1).decode("utf-8", errors="replace")
+    if len(output) > MAX_OUTPUT_LENGTH:
+        output = output[:MAX_OUTPUT_LENGTH] + "\n[output truncated]"
+    return {"exit_code": exit_code, "output": output}
+
+
+def open_protocol_pipe(fd: int, mode: str):
+    # Processes started by the executed code must not write on, or keep open, the pipes of the protocol.
+    os.set_inheritable(fd, False)
+    return os.fdopen(fd, mode, encoding="utf-8")
+
+
+def main():
+    options = json.loads(sys.argv[1])
+    # Requests and results go through dedicated pipes, stdin, stdout and stderr are left to the executed code.
+    requests = open_protocol_pipe(options["request_fd"], "r")
+    results = open_protocol_pipe(options["result_fd"], "w")
+    set_memory_limit(options.get("memory_limit_mb", 0))
+    preload_modules(options.get("preload_modules", []))
+    results.write(json.dumps({"ready": True}) + "\n")
+    results.flush()
+    for line in requests:
+        request = json.loads(line)
+        results.write(json.dumps(execute(request["code"], request["workspace"], request["output_path"])) + "\n")
+        results.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import os
+import threading
+import uuid
+
+from autogen.code_utils import PYTHON_VARIANTS
+from autogen.coding.base import CodeBlock, CodeExtractor, CodeResult
+from autogen.coding.markdown_code_extractor import MarkdownCodeExtractor
+
+from roundtable.services.discussion_room.discussion_budget import MIN_CALL_TIMEOUT, DiscussionBudget
+from roundtable.services.execution.execution_cache import ExecutionCache
+from roundtable.services.execution.warm_executor_pool import WarmExecutorPool
+
+SHELL_VARIANTS = ["bash", "shell", "sh"]
+FILENAME_PREFIX = "# filename: "
+
+
+class WarmCodeExecutor:
+    # Code executor of autogen running python blocks in the warm workers of the pool. The code blocks of a discussion
+    # share one workspace, so that files written by a block are read by the next ones.
+    def __init__(self, executor_pool: WarmExecutorPool, execution_cache: ExecutionCache = None,
+                 discussion_budget: DiscussionBudget = None):
+        self.executor_pool = executor_pool
+        self.execution_cache = execution_cache
+        self.discussion_budget = discussion_budget
+        self.workspace = self.new_workspace()
+        self._code_extractor = MarkdownCodeExtractor()
+
+    def new_workspace(self) -> str:
+        return os.path.join(self.executor_pool.workspace_path, f"discussion-{uuid.uuid4().hex[:8]}")
+
+    def reset(self):
+        # The files and the interpreters of a discussion are not visible to the next one.
+        self.executor_pool.release_workspace(self.workspace)
+        self.workspace = self.new_workspace()
+
+    @property
+    def code_extractor(self) -> CodeExtractor:
+        return self._code_extractor
+
+    def execute_code_blocks(self, code_blocks: list[CodeBlock], cancel_event: threading.Event = None) -> CodeResult:
+        if self.discussion_budget is not None:
+            self.discussion_budget.check()
+        if self.execution_cache is None:
+            return self.execute_uncached(code_blocks, cancel_event)
+        key = self.execution_cache.get_key(code_blocks, self.executor_pool.get_fingerprint())
+        result = self.execution_cache.get(key)
+        if result is None:
+            result = self.execute_uncached(code_blocks, cancel_event)
+            self.execution_cache.set(key, result)
+        return result
+
+    def get_timeout(self) -> float:
+        # Code is stopped at the deadline of the discussion, as a timeout.
+        remaining_time = self.discussion_budget.get_remaining_time() if self.discussion_budget is not None else None
+        if remaining_time is None:
+            return self.executor_pool.timeout
+        return max(min(self.executor_pool.timeout, remaining_time), MIN_CALL_TIMEOUT)
+
+    def save_code_file(self, code: str) -> str | None:
+        # As autogen does, a block starting with `# filename: <path>` is saved in the workspace before being run.
+        if not code.startswith(FILENAME_PREFIX):
+            return None
+        filename = code.split("\n", 1)[0][len(FILENAME_PREFIX):].strip()
+        workspace = os.path.realpath(self.workspace)
+        path = os.path.realpath(os.path.join(workspace, filename))
+        if not path.startswith(workspace + os.sep):
+            return f"{filename} is outside of the workspace"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as code_file:
+            code_file.write(code)
+        return None
+
+    def execute_code_block(self, code_block: CodeBlock, cancel_event: threading.Event = None) -> CodeResult:
+        language = code_block.language.lower()
+        error = self.save_code_file(code_block.code)
+        if error is not None:
+            return CodeResult(exit_code=1, output=error)
+        if language in PYTHON_VARIANTS:
+            return self.executor_pool.run_python(code_block.code, self.workspace, timeout=self.get_timeout(),
+                                                 cancel_event=cancel_event)
+        if language in SHELL_VARIANTS:
+            return self.executor_pool.run_shell(code_block.code, self.workspace, timeout=self.get_timeout(),
+                                                cancel_event=cancel_event)
+        return CodeResult(exit_code=1, output=f"unknown language {language}")
+
+    def execute_uncached(self, code_blocks: list[CodeBlock], cancel_event: threading.Event = None) -> CodeResult:
+        outputs = []
+        exit_code = 0
+        for code_block in code_blocks:
+            result = self.execute_code_block(code_block, cancel_event)
+            outputs.append(result.output)
+            exit_code = result.exit_code
+            if exit_code != 0:
+                break
+        return CodeResult(exit_code=exit_code, output="".join(outputs))
+
+    def restart(self):
+        pass
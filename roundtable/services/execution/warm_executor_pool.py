@@ -0,0 +1,320 @@
+import atexit
+import hashlib
+import json
+import os
+import queue
+import re
+import select
+import shlex
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+import uuid
+import venv
+
+from autogen.code_utils import TIMEOUT_MSG
+from autogen.coding.base import CodeResult
+
+from roundtable.shared.utils.logger import Logger
+
+WORKER_PATH = os.path.join(os.path.dirname(__file__), "python_worker.py")
+WORKER_START_TIMEOUT = 30
+TIMEOUT_EXIT_CODE = 124
+CANCELLED_EXIT_CODE = 130
+CANCELLED_MSG = "Execution cancelled"
+CANCEL_POLL_INTERVAL = 0.1
+WORKER_FAILED_MSG = "The executor worker stopped unexpectedly"
+PIP_INSTALL_PATTERN = re.compile(r"^\s*(?:python3? -m )?pip3? install (?P<arguments>.+)$")
+
+
+class ExecutorWorker:
+    def __init__(self, python_path: str, output_path: str, memory_limit_mb: int, preload_modules: list[str]):
+        self.output_path = output_path
+        # Workspace of the discussion served by the worker, None until its first run.
+        self.workspace: str | None = None
+        self.runs = 0
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        request_read_fd, request_write_fd = os.pipe()
+        result_read_fd, result_write_fd = os.pipe()
+        options = json.dumps({"memory_limit_mb": memory_limit_mb, "preload_modules": preload_modules,
+                              "request_fd": request_read_fd, "result_fd": result_write_fd})
+        # Output written outside of an execution (e.g. by preloaded modules or background threads) and reads of stdin
+        # by the executed code do not interfere with the protocol.
+        try:
+            self.process = subprocess.Popen([python_path, "-u", WORKER_PATH, options],
+                                            cwd=os.path.dirname(output_path), stdin=subprocess.DEVNULL,
+                                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                            pass_fds=(request_read_fd, result_write_fd), start_new_session=True)
+        except Exception:
+            os.close(request_write_fd)
+            os.close(result_read_fd)
+            raise
+        finally:
+            os.close(request_read_fd)
+            os.close(result_write_fd)
+        self.requests = os.fdopen(request_write_fd, "wb")
+        self.results = os.fdopen(result_read_fd, "rb")
+        if not self.read_line(WORKER_START_TIMEOUT):
+            self.kill()
+            raise RuntimeError("The executor worker did not start")
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def read_line(self, timeout: float) -> str | None:
+        # None when the timeout expires, an empty string when the worker exited.
+        ready, _, _ = select.select([self.results], [], [], timeout)
+        if not ready:
+            return None
+        return self.results.readline().decode("utf-8", errors="replace")
+
+    def wait_line(self, timeout: float, cancel_event: threading.Event = None) -> str | None:
+        if cancel_event is None:
+            return self.read_line(timeout)
+        deadline = time.monotonic() + timeout
+        while not cancel_event.is_set():
+            remaining_time = deadline - time.monotonic()
+            if remaining_time <= 0:
+                return None
+            line = self.read_line(min(remaining_time, CANCEL_POLL_INTERVAL))
+            if line is not None:
+                return line
+        return None
+
+    def run(self, code: str, workspace: str, timeout: float, cancel_event: threading.Event = None) -> CodeResult:
+        self.runs += 1
+        self.workspace = workspace
+        if not self.is_alive():
+            return CodeResult(exit_code=1, output=WORKER_FAILED_MSG)
+        request = json.dumps({"code": code, "workspace": workspace, "output_path": self.output_path}) + "\n"
+        try:
+            self.requests.write(request.encode("utf-8"))
+            self.requests.flush()
+        except BrokenPipeError:
+            return CodeResult(exit_code=1, output=WORKER_FAILED_MSG)
+        line = self.wait_line(timeout, cancel_event)
+        if not line:
+            self.kill()
+            if cancel_event is not None and cancel_event.is_set():
+                return CodeResult(exit_code=CANCELLED_EXIT_CODE, output=CANCELLED_MSG)
+            if line is None:
+                return CodeResult(exit_code=TIMEOUT_EXIT_CODE, output=TIMEOUT_MSG)
+            return CodeResult(exit_code=1, output=WORKER_FAILED_MSG)
+        try:
+            return CodeResult(**json.loads(line))
+        except (ValueError, TypeError):
+            # The worker is killed, and then replaced, since the protocol cannot be trusted anymore.
+            self.kill()
+            return CodeResult(exit_code=1, output=WORKER_FAILED_MSG)
+
+    def remove_output(self):
+        if os.path.isfile(self.output_path):
+            os.remove(self.output_path)
+
+    def kill(self):
+        if self.is_alive():
+            try:
+                # Processes started by the executed code belong to the session of the worker.
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        self.process.wait()
+        self.requests.close()
+        self.results.close()
+
+
+class WarmExecutorPool:
+    def __init__(self, env_path: str, workspace_path: str, size: int, timeout: float, memory_limit_mb: int,
+                 max_runs_per_worker: int, preload_modules: list[str]):
+        self.logger = Logger()
+        self.env_path = os.path.abspath(env_path)
+        self.workspace_path = os.path.abspath(workspace_path)
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_runs_per_worker = max_runs_per_worker
+        self.preload_modules = preload_modules
+        self.installed_requirements: set[str] = set()
+        self._idle_workers: queue.Queue[ExecutorWorker] = queue.Queue()
+        self._workers: list[ExecutorWorker] = []
+        self._lock = threading.Lock()
+        self._started = False
+
+    def get_python_path(self) -> str:
+        return os.path.join(self.env_path, "bin", "python")
+
+    def get_fingerprint(self) -> str:
+        # Results of the code depend on the interpreter, the installed requirements and the resource limits.
+        with self._lock:
+            requirements = sorted(self.installed_requirements)
+        fingerprint = json.dumps([self.get_python_path(), requirements, self.memory_limit_mb, self.preload_modules])
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+    def ensure_environment(self):
+        if os.path.isfile(self.get_python_path()):
+            return
+        self.logger.info("Creating the code execution environment in %s", self.env_path)
+        # Packages of the system are visible so that only the missing dependencies are installed.
+        venv.EnvBuilder(system_site_packages=True, with_pip=True, symlinks=sys.platform != "win32").create(
+            self.env_path)
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            self.ensure_environment()
+            for _ in range(self.size):
+                self._idle_workers.put(self.spawn_worker())
+            self._started = True
+        self.logger.debug("Executor pool started with %d warm workers", self.size)
+
+    def spawn_worker(self) -> ExecutorWorker:
+        output_path = os.path.join(self.workspace_path, f"worker-{uuid.uuid4().hex[:8]}.output")
+        worker = ExecutorWorker(self.get_python_path(), output_path, self.memory_limit_mb, self.preload_modules)
+        self._workers.append(worker)
+        return worker
+
+    def recycle_worker(self, worker: ExecutorWorker) -> ExecutorWorker:
+        worker.kill()
+        worker.remove_output()
+        with self._lock:
+            try:
+                new_worker = self.spawn_worker()
+            except Exception as e:
+                # The stopped worker is kept in the pool, so that the pool keeps its size, and replaced on its next run.
+                self.logger.error("Unable to start a new executor worker, retrying on the next run: %s", e)
+                return worker
+            self._workers.remove(worker)
+            return new_worker
+
+    def run_python(self, code: str, workspace: str, timeout: float = None,
+                   cancel_event: threading.Event = None) -> CodeResult:
+        self.start()
+        os.makedirs(workspace, exist_ok=True)
+        worker = self._idle_workers.get()
+        try:
+            # A worker is never shared by two discussions, the modules, environment and patches of the interpreter
+            # would leak from one to the other.
+            if not worker.is_alive() or worker.workspace not in (None, workspace):
+                worker = self.recycle_worker(worker)
+            if cancel_event is not None and cancel_event.is_set():
+                # Cancelled while waiting for an idle worker.
+                return CodeResult(exit_code=CANCELLED_EXIT_CODE, output=CANCELLED_MSG)
+            return worker.run(code, workspace, timeout or self.timeout, cancel_event)
+        finally:
+            # Workers are also replaced after a timeout, a crash or a number of runs, so that the state leaked by the
+            # executed code does not accumulate within a discussion.
+            if not worker.is_alive() or worker.runs >= self.max_runs_per_worker:
+                worker = self.recycle_worker(worker)
+            self._idle_workers.put(worker)
+
+    def release_workspace(self, workspace: str):
+        # The idle workers that served the discussion are replaced now, so that the next discussion does not wait for
+        # a new interpreter.
+        workers = []
+        while True:
+            try:
+                workers.append(self._idle_workers.get_nowait())
+            except queue.Empty:
+                break
+        for worker in workers:
+            if worker.workspace == workspace:
+                worker = self.recycle_worker(worker)
+            self._idle_workers.put(worker)
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    def get_environment_variables(self) -> dict[str, str]:
+        environment = dict(os.environ)
+        environment["VIRTUAL_ENV"] = self.env_path
+        environment["PATH"] = os.pathsep.join([os.path.join(self.env_path, "bin"), environment.get("PATH", "")])
+        return environment
+
+    def skip_installed_requirements(self, code: str) -> tuple[str, set[str]]:
+        requirements = set()
+        lines = []
+        for line in code.splitlines():
+            match = PIP_INSTALL_PATTERN.match(line)
+            if match is None:
+                lines.append(line)
+                continue
+            line_requirements = {argument for argument in shlex.split(match.group("arguments"))
+                                 if not argument.startswith("-")}
+            if line_requirements and line_requirements <= self.installed_requirements:
+                lines.append(f": # {' '.join(sorted(line_requirements))} already installed")
+                continue
+            requirements |= line_requirements
+            lines.append(line)
+        return "\n".join(lines), requirements
+
+    @staticmethod
+    def wait_process(process: subprocess.Popen, timeout: float, cancel_event: threading.Event = None) -> bytes | None:
+        # None when the process is stopped by the timeout or the cancellation.
+        deadline = time.monotonic() + timeout
+        while cancel_event is None or not cancel_event.is_set():
+            remaining_time = deadline - time.monotonic()
+            if remaining_time <= 0:
+                break
+            try:
+                return process.communicate(timeout=remaining_time if cancel_event is None
+                                           else min(remaining_time, CANCEL_POLL_INTERVAL))[0]
+            except subprocess.TimeoutExpired:
+                continue
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        process.communicate()
+        return None
+
+    def run_shell(self, code: str, workspace: str, timeout: float = None,
+                  cancel_event: threading.Event = None) -> CodeResult:
+        self.start()
+        if cancel_event is not None and cancel_event.is_set():
+            return CodeResult(exit_code=CANCELLED_EXIT_CODE, output=CANCELLED_MSG)
+        code, requirements = self.skip_installed_requirements(code)
+        os.makedirs(workspace, exist_ok=True)
+        process = subprocess.Popen(["bash", "-c", code], cwd=workspace, env=self.get_environment_variables(),
+                                   stdout=subprocess.PIPE, stderr=subprocess.STDOUT, start_new_session=True)
+        output = self.wait_process(process, timeout or self.timeout, cancel_event)
+        if output is None:
+            if cancel_event is not None and cancel_event.is_set():
+                return CodeResult(exit_code=CANCELLED_EXIT_CODE, output=CANCELLED_MSG)
+            return CodeResult(exit_code=TIMEOUT_EXIT_CODE, output=TIMEOUT_MSG)
+        if process.returncode == 0:
+            with self._lock:
+                self.installed_requirements |= requirements
+        return CodeResult(exit_code=process.returncode, output=output.decode("utf-8", errors="replace"))
+
+    def close(self):
+        with self._lock:
+            for worker in self._workers:
+                worker.kill()
+                worker.remove_output()
+            self._workers = []
+            self._idle_workers = queue.Queue()
+            self._started = False
+
+
+_executor_pools: dict[str, WarmExecutorPool] = {}
+_executor_pools_lock = threading.Lock()
+
+
+def get_executor_pool(env_path: str, workspace_path: str, size: int, timeout: float, memory_limit_mb: int,
+                      max_runs_per_worker: int, preload_modules: list[str]) -> WarmExecutorPool:
+    with _executor_pools_lock:
+        executor_pool = _executor_pools.get(env_path)
+        if executor_pool is None:
+            executor_pool = WarmExecutorPool(env_path, workspace_path, size, timeout, memory_limit_mb,
+                                             max_runs_per_worker, preload_modules)
+            _executor_pools[env_path] = executor_pool
+        return executor_pool
+
+
+@atexit.register
+def close_executor_pools():
+    with _executor_pools_lock:
+        for executor_pool in _executor_pools.values():
+            executor_pool.close()
@@ -0,0 +1,70 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+import httpx
+from openai import DefaultHttpxClient
+
+from roundtable.models.http_pool_stats import HttpPoolStats
+
+
+class SharedHttpClient:
+    def __init__(self, base_url: str, max_connections: int, timeout: float, connect_timeout: float):
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.http_client = DefaultHttpxClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+        )
+        self.requests = 0
+        self.requests_in_flight = 0
+        self.peak_requests_in_flight = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track_request(self) -> Iterator[None]:
+        with self._lock:
+            self.requests += 1
+            self.requests_in_flight += 1
+            self.peak_requests_in_flight = max(self.peak_requests_in_flight, self.requests_in_flight)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.requests_in_flight -= 1
+
+    def get_stats(self) -> HttpPoolStats:
+        # The connection pool of httpcore is reached through the default transport of the client, other transports
+        # only report the requests.
+        pool = getattr(getattr(self.http_client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        with self._lock:
+            return HttpPoolStats(base_url=self.base_url, max_connections=self.max_connections,
+                                 open_connections=len(connections),
+                                 idle_connections=sum(1 for connection in connections if connection.is_idle()),
+                                 requests_in_flight=self.requests_in_flight,
+                                 peak_requests_in_flight=self.peak_requests_in_flight, requests=self.requests)
+
+    def close(self):
+        self.http_client.close()
+
+
+_shared_http_clients: dict[tuple[str, str], SharedHttpClient] = {}
+_shared_http_clients_lock = threading.Lock()
+
+
+def get_shared_http_client(base_url: str, api_key: str, max_connections: int, timeout: float,
+                           connect_timeout: float) -> SharedHttpClient:
+    # One connection pool per endpoint and credentials is shared by every agent of every room of the process.
+    with _shared_http_clients_lock:
+        shared_http_client = _shared_http_clients.get((base_url, api_key))
+        if shared_http_client is None:
+            shared_http_client = SharedHttpClient(base_url, max_connections, timeout, connect_timeout)
+            _shared_http_clients[(base_url, api_key)] = shared_http_client
+        return shared_http_client
+
+
+def get_http_pool_stats() -> list[HttpPoolStats]:
+    with _shared_http_clients_lock:
+        shared_http_clients = list(_shared_http_clients.values())
+    return [shared_http_client.get_stats() for shared_http_client in shared_http_clients]
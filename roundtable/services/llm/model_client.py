@@ -0,0 +1,165 @@
+import time
+from typing import Any
+
+from autogen import OpenAIWrapper
+from autogen.oai.client import OpenAIClient
+from autogen.token_count_utils import count_token
+from openai import OpenAI
+from openai.types.chat import ChatCompletion
+from openai.types.chat.chat_completion import ChatCompletionMessage, Choice
+from openai.types.completion_usage import CompletionUsage
+
+from roundtable.models.stream_stats import StreamStats
+from roundtable.services.discussion_room.discussion_budget import DiscussionBudget
+from roundtable.services.llm.http_client_registry import SharedHttpClient
+from roundtable.services.llm.model_scheduler import ModelScheduler
+from roundtable.services.llm.response_cache import ResponseCache
+from roundtable.services.llm.stream_listener import StreamListener
+from roundtable.services.metrics.metrics_recorder import MetricsRecorder
+from roundtable.shared.utils.logger import Logger
+
+MODEL_CLIENT_CLS_KEY = "model_client_cls"
+
+
+class RoundtableModelClient(OpenAIClient):
+    def __init__(self, config: dict[str, Any], agent_name: str = None, stream_listener: StreamListener = None,
+                 response_cache: ResponseCache = None, metrics_recorder: MetricsRecorder = None,
+                 shared_http_client: SharedHttpClient = None, model_scheduler: ModelScheduler = None,
+                 discussion_budget: DiscussionBudget = None):
+        openai_config = {key: value for key, value in config.items() if key in OpenAIWrapper.openai_kwargs}
+        if shared_http_client is not None:
+            openai_config["http_client"] = shared_http_client.http_client
+        super().__init__(OpenAI(**openai_config))
+        self.shared_http_client = shared_http_client
+        self.logger = Logger()
+        self.model = config.get("model")
+        self.base_url = config.get("base_url")
+        self.agent_name = agent_name
+        self.stream_listener = stream_listener
+        self.response_cache = response_cache
+        self.metrics_recorder = metrics_recorder
+        self.model_scheduler = model_scheduler
+        self.discussion_budget = discussion_budget
+
+    @staticmethod
+    def get_create_params(params: dict[str, Any]) -> dict[str, Any]:
+        return {key: value for key, value in params.items() if key != MODEL_CLIENT_CLS_KEY}
+
+    def create(self, params: dict[str, Any]) -> ChatCompletion:
+        if self.discussion_budget is not None:
+            self.discussion_budget.check()
+        started_at = time.perf_counter()
+        response, cached = self.create_cached(self.get_create_params(params))
+        duration = time.perf_counter() - started_at
+        prompt_tokens = response.usage.prompt_tokens if response.usage is not None else 0
+        completion_tokens = response.usage.completion_tokens if response.usage is not None else 0
+        self.logger.debug("%s turn prompt tokens: %d", self.agent_name, prompt_tokens)
+        if self.metrics_recorder is not None:
+            self.metrics_recorder.record_llm_call(self.agent_name, response.model, started_at, duration,
+                                                  prompt_tokens, completion_tokens, cached)
+        if self.discussion_budget is not None and not cached:
+            self.discussion_budget.record_tokens(prompt_tokens, completion_tokens)
+        return response
+
+    def create_cached(self, params: dict[str, Any]) -> tuple[ChatCompletion, bool]:
+        if self.response_cache is None:
+            return self.create_uncached(params), False
+        key = self.response_cache.get_key(self.base_url, params)
+        response = self.response_cache.get(key)
+        if response is not None:
+            self.replay_cached_response(response)
+            return response, True
+        response = self.create_uncached(params)
+        if self.is_cacheable(response):
+            self.response_cache.set(key, response)
+        return response, False
+
+    def is_cacheable(self, response: ChatCompletion) -> bool:
+        # A reply cut by the budget of the discussion would be replayed cut to discussions with a larger budget.
+        if self.discussion_budget is None or not response.choices:
+            return True
+        return response.choices[0].finish_reason != "length"
+
+    def replay_cached_response(self, response: ChatCompletion):
+        if self.stream_listener is None:
+            return
+        stats = StreamStats(agent_name=self.agent_name, model=response.model, time_to_first_token=0.0, cached=True)
+        self.stream_listener.on_stream_start(self.agent_name)
+        content = response.choices[0].message.content if response.choices else None
+        if content:
+            stats.chunks = 1
+            self.stream_listener.on_token(self.agent_name, content)
+        self.stream_listener.on_stream_end(self.agent_name, stats)
+
+    def create_uncached(self, params: dict[str, Any]) -> ChatCompletion:
+        if self.discussion_budget is not None:
+            params = self.discussion_budget.limit_params(params)
+        if self.model_scheduler is None:
+            return self.create_tracked(params)
+        model = params.get("model", self.model)
+        remaining_time = self.discussion_budget.get_remaining_time() if self.discussion_budget is not None else None
+        with self.model_scheduler.schedule(model, self.agent_name, timeout=remaining_time) as model_load:
+            if model_load is not None and self.metrics_recorder is not None:
+                self.metrics_recorder.record_model_load(model_load)
+            # Ollama unloads the model once idle for the keep-alive of the last call, 5 minutes when not given.
+            extra_body = {**params.get("extra_body", {}), "keep_alive": self.model_scheduler.keep_alive}
+            return self.create_tracked({**params, "extra_body": extra_body})
+
+    def create_tracked(self, params: dict[str, Any]) -> ChatCompletion:
+        if self.shared_http_client is None:
+            return self.create_response(params)
+        with self.shared_http_client.track_request():
+            return self.create_response(params)
+
+    def create_response(self, params: dict[str, Any]) -> ChatCompletion:
+        if self.stream_listener is None or "messages" not in params:
+            return super().create({**params, "stream": False})
+        return self.create_streaming(params)
+
+    def create_streaming(self, params: dict[str, Any]) -> ChatCompletion:
+        started_at = time.perf_counter()
+        stats = StreamStats(agent_name=self.agent_name, model=params.get("model", self.model))
+        content = ""
+        finish_reason = "stop"
+        chunk = None
+        usage = None
+        self.stream_listener.on_stream_start(self.agent_name)
+        stream_params = {**params, "stream": True, "n": 1, "stream_options": {"include_usage": True}}
+        with self._oai_client.chat.completions.create(**stream_params) as stream:
+            for chunk in stream:
+                if chunk.usage is not None:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                finish_reason = choice.finish_reason or finish_reason
+                token = choice.delta.content
+                if not token:
+                    continue
+                if stats.time_to_first_token is None:
+                    stats.time_to_first_token = time.perf_counter() - started_at
+                stats.chunks += 1
+                content += token
+                self.stream_listener.on_token(self.agent_name, token)
+                if self.discussion_budget is not None and self.discussion_budget.get_remaining_time() == 0:
+                    # The timeout of the call only bounds the wait between two chunks, the reply is cut here.
+                    finish_reason = "length"
+                    break
+        stats.duration = time.perf_counter() - started_at
+        self.stream_listener.on_stream_end(self.agent_name, stats)
+
+        if usage is None:
+            # The server did not report the usage (older servers, or a reply cut before the final chunk).
+            prompt_tokens = count_token(params["messages"], stats.model)
+            completion_tokens = count_token(content, stats.model)
+            usage = CompletionUsage(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                                    total_tokens=prompt_tokens + completion_tokens)
+        return ChatCompletion(
+            id=chunk.id if chunk else "",
+            model=chunk.model if chunk else stats.model,
+            created=chunk.created if chunk else int(time.time()),
+            object="chat.completion",
+            choices=[Choice(index=0, finish_reason=finish_reason, logprobs=None,
+                            message=ChatCompletionMessage(role="assistant", content=content))],
+            usage=usage,
+        )
@@ -0,0 +1,167 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import httpx
+
+from roundtable.models.model_load import ModelLoad
+from roundtable.shared.exceptions.discussion_budget_exhausted_exception import DiscussionBudgetExhaustedException
+from roundtable.shared.utils.logger import Logger
+
+OPENAI_API_SUFFIX = "/v1"
+LOAD_PATH = "/api/generate"
+
+
+class ModelScheduler:
+    # Ollama keeps a limited number of models in memory and unloads one of them to serve a call to another model.
+    # Calls to resident models run right away. Calls to other models wait until the calls to the model to be evicted
+    # end, meanwhile new calls to that model wait too, and the calls waiting for the loaded model are granted together.
+    # The model with most waiting calls is loaded first.
+    def __init__(self, base_url: str, http_client: httpx.Client = None, max_loaded_models: int = 1,
+                 keep_alive: int = -1):
+        self.logger = Logger()
+        self.base_url = base_url
+        self.http_client = http_client
+        self.max_loaded_models = max(1, max_loaded_models)
+        self.keep_alive = keep_alive
+        self.resident_models: OrderedDict[str, float] = OrderedDict()
+        self.calls_in_flight: dict[str, int] = {}
+        self.pending_calls: dict[str, int] = {}
+        self.batch: dict[str, int] = {}
+        self._condition = threading.Condition()
+        self._load_api_available = http_client is not None
+
+    def get_load_url(self) -> str:
+        base_url = self.base_url.rstrip("/")
+        if base_url.endswith(OPENAI_API_SUFFIX):
+            base_url = base_url[:-len(OPENAI_API_SUFFIX)]
+        return f"{base_url}{LOAD_PATH}"
+
+    def get_resident_models(self) -> list[str]:
+        with self._condition:
+            self.drop_expired_models()
+            return list(self.resident_models)
+
+    def get_pending_calls(self) -> dict[str, int]:
+        with self._condition:
+            return dict(self.pending_calls)
+
+    def drop_expired_models(self):
+        # Ollama unloads the models left idle for longer than the keep-alive.
+        if self.keep_alive < 0:
+            return
+        now = time.monotonic()
+        for model, last_used in list(self.resident_models.items()):
+            if not self.calls_in_flight.get(model) and now - last_used > self.keep_alive:
+                del self.resident_models[model]
+
+    def get_next_model(self) -> str | None:
+        waiting_models = [model for model in self.pending_calls if model not in self.resident_models]
+        return max(waiting_models, key=self.pending_calls.get) if waiting_models else None
+
+    def get_evicted_model(self) -> str | None:
+        if len(self.resident_models) < self.max_loaded_models:
+            return None
+        # Least recently used first, models without calls in flight are evicted before the others.
+        idle_models = [model for model in self.resident_models if not self.calls_in_flight.get(model)]
+        return (idle_models or list(self.resident_models))[0]
+
+    def get_batch_calls(self, model: str) -> int:
+        # Calls that gave up waiting do not hold the model anymore.
+        return min(self.batch.get(model, 0), self.pending_calls.get(model, 0))
+
+    def can_run(self, model: str) -> bool:
+        self.drop_expired_models()
+        next_model = self.get_next_model()
+        evicted_model = self.get_evicted_model()
+        if model in self.resident_models:
+            return next_model is None or model != evicted_model or self.get_batch_calls(model) > 0
+        return model == next_model and (evicted_model is None or not self.calls_in_flight.get(evicted_model)
+                                        and not self.get_batch_calls(evicted_model))
+
+    @contextmanager
+    def schedule(self, model: str, agent_name: str = None, timeout: float = None) -> Iterator[Optional[ModelLoad]]:
+        # The timeout is the time left to the discussion of the call, the call is not made once it expires.
+        model_load = None
+        with self._condition:
+            self.pending_calls[model] = self.pending_calls.get(model, 0) + 1
+            try:
+                if not self._condition.wait_for(lambda: self.can_run(model), timeout):
+                    raise DiscussionBudgetExhaustedException(f"deadline reached waiting for the model {model}")
+                if model not in self.resident_models:
+                    evicted_model = self.get_evicted_model()
+                    if evicted_model is not None:
+                        del self.resident_models[evicted_model]
+                    model_load = ModelLoad(model=model, evicted_model=evicted_model)
+                    # The calls already waiting for the model run with this one, before the model is evicted again.
+                    self.batch = {model: self.pending_calls[model] - 1}
+                elif self.get_batch_calls(model) > 0:
+                    self.batch[model] -= 1
+                self.resident_models[model] = time.monotonic()
+                self.resident_models.move_to_end(model)
+                self.calls_in_flight[model] = self.calls_in_flight.get(model, 0) + 1
+            finally:
+                self.pending_calls[model] -= 1
+                if not self.pending_calls[model]:
+                    del self.pending_calls[model]
+                self._condition.notify_all()
+        try:
+            if model_load is not None:
+                model_load.load_time = self.load(model)
+                self.logger.debug("Model %s loaded for %s in %.2fs, evicting %s", model, agent_name,
+                                  model_load.load_time, model_load.evicted_model)
+            yield model_load
+        finally:
+            with self._condition:
+                self.calls_in_flight[model] -= 1
+                if not self.calls_in_flight[model]:
+                    del self.calls_in_flight[model]
+                if model in self.resident_models:
+                    self.resident_models[model] = time.monotonic()
+                    self.resident_models.move_to_end(model)
+                self._condition.notify_all()
+
+    def load(self, model: str) -> float:
+        # Loads the model through the native API of Ollama with the keep-alive, the call to the model does not pay
+        # for it anymore. Other servers only expose the OpenAI compatible API and load models on the first call.
+        started_at = time.perf_counter()
+        if not self._load_api_available:
+            return 0.0
+        try:
+            self.http_client.post(self.get_load_url(),
+                                  json={"model": model, "keep_alive": self.keep_alive}).raise_for_status()
+        except httpx.HTTPStatusError as e:
+            self._load_api_available = False
+            self.logger.debug("Models of %s cannot be loaded in advance: %s", self.base_url, e)
+            return 0.0
+        except httpx.HTTPError as e:
+            self.logger.warning("Model %s not loaded in advance: %s", model, e)
+            return 0.0
+        return time.perf_counter() - started_at
+
+    def warm_up(self, models: list[str]):
+        # Models are listed by first use, the first ones are loaded last to be the last ones evicted. Models that do
+        # not fit in memory with them would only be evicted before being used.
+        models = list(dict.fromkeys(models))[:self.max_loaded_models]
+        for model in reversed(models):
+            with self.schedule(model) as model_load:
+                if model_load is not None:
+                    self.logger.info("Model %s warmed up in %.2fs", model, model_load.load_time)
+
+
+_model_schedulers: dict[str, ModelScheduler] = {}
+_model_schedulers_lock = threading.Lock()
+
+
+def get_model_scheduler(base_url: str, http_client: httpx.Client, max_loaded_models: int,
+                        keep_alive: int) -> ModelScheduler:
+    # The models of an endpoint are shared by every discussion of the process, so is the scheduler of their calls.
+    with _model_schedulers_lock:
+        model_scheduler = _model_schedulers.get(base_url)
+        if model_scheduler is None:
+            model_scheduler = ModelScheduler(base_url, http_client, max_loaded_models=max_loaded_models,
+                                             keep_alive=keep_alive)
+            _model_schedulers[base_url] = model_scheduler
+        return model_scheduler
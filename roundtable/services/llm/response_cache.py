@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Optional
+
+from autogen._pydantic import model_dump
+from openai.types.chat import ChatCompletion
+
+from roundtable.models.response_cache_stats import ResponseCacheStats
+
+IGNORED_KEY_PARAMS = {"stream"}
+
+
+class ResponseCache:
+    def __init__(self, path: str, max_entries: int = 1024):
+        self.path = path
+        self.max_entries = max_entries
+        self.stats = ResponseCacheStats()
+        self._memory: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @staticmethod
+    def get_key(base_url: str, params: dict[str, Any]) -> str:
+        request = {key: value for key, value in params.items() if key not in IGNORED_KEY_PARAMS}
+        request["base_url"] = base_url
+        serialized_request = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(serialized_request.encode("utf-8")).hexdigest()
+
+    def get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value BLOB)")
+        return self._connection
+
+    def get(self, key: str) -> Optional[ChatCompletion]:
+        with self._lock:
+            response = self._memory.get(key)
+            if response is not None:
+                self._memory.move_to_end(key)
+                self.stats.memory_hits += 1
+                return ChatCompletion(**response)
+            row = self.get_connection().execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            response = json.loads(zlib.decompress(row[0]))
+            self.stats.disk_hits += 1
+            self.remember(key, response)
+            return ChatCompletion(**response)
+
+    def set(self, key: str, response: ChatCompletion):
+        # Responses are kept as plain dicts so every hit builds a new object that callers are free to modify.
+        response = model_dump(response)
+        value = zlib.compress(json.dumps(response).encode("utf-8"))
+        with self._lock:
+            connection = self.get_connection()
+            connection.execute("INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)", (key, value))
+            connection.commit()
+            self.stats.writes += 1
+            self.remember(key, response)
+
+    def remember(self, key: str, response: dict[str, Any]):
+        self._memory[key] = response
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+_response_caches: dict[str, ResponseCache] = {}
+_response_caches_lock = threading.Lock()
+
+
+def get_response_cache(path: str, max_entries: int) -> ResponseCache:
+    with _response_caches_lock:
+        response_cache = _response_caches.get(path)
+        if response_cache is None:
+            response_cache = ResponseCache(path, max_entries)
+            _response_caches[path] = response_cache
+        return response_cache
@@ -0,0 +1,61 @@
+import sys
+
+from roundtable.models.stream_stats import StreamStats
+
+
+class StreamListener:
+    def on_stream_start(self, agent_name: str):
+        pass
+
+    def on_token(self, agent_name: str, token: str):
+        pass
+
+    def on_stream_end(self, agent_name: str, stats: StreamStats):
+        pass
+
+
+class StreamRelay(StreamListener):
+    def __init__(self, listener: StreamListener = None):
+        self.listener = listener
+        self.stats: list[StreamStats] = []
+
+    def reset(self):
+        self.stats = []
+
+    def on_stream_start(self, agent_name: str):
+        if self.listener:
+            self.listener.on_stream_start(agent_name)
+
+    def on_token(self, agent_name: str, token: str):
+        if self.listener:
+            self.listener.on_token(agent_name, token)
+
+    def on_stream_end(self, agent_name: str, stats: StreamStats):
+        self.stats.append(stats)
+        if self.listener:
+            self.listener.on_stream_end(agent_name, stats)
+
+    def get_time_to_first_token(self) -> dict[str, float]:
+        times: dict[str, list[float]] = {}
+        for stats in self.stats:
+            if stats.time_to_first_token is not None and not stats.cached:
+                times.setdefault(stats.agent_name, []).append(stats.time_to_first_token)
+        return {agent_name: sum(values) / len(values) for agent_name, values in times.items()}
+
+
+class ConsoleStreamListener(StreamListener):
+    def __init__(self, output=sys.stdout):
+        self.output = output
+
+    def on_stream_start(self, agent_name: str):
+        self.output.write(f"\n{agent_name}: ")
+        self.output.flush()
+
+    def on_token(self, agent_name: str, token: str):
+        self.output.write(token)
+        self.output.flush()
+
+    def on_stream_end(self, agent_name: str, stats: StreamStats):
+        time_to_first_token = "n/a" if stats.time_to_first_token is None else f"{stats.time_to_first_token:.2f}s"
+        self.output.write(f"\n[{agent_name} :: first token {time_to_first_token}, total {stats.duration:.2f}s]\n")
+        self.output.flush()
@@ -0,0 +1,78 @@
+import os
+import re
+
+from roundtable.models.discussion_metrics import DiscussionMetrics
+
+PROMETHEUS_PREFIX = "roundtable"
+DISCUSSION_METRICS = [
+    ("wall_time", "discussion_seconds", "gauge", "Wall time of the discussion"),
+    ("model_loads", "model_loads_total", "counter", "Models loaded for the calls of the discussion"),
+    ("model_swaps", "model_swaps_total", "counter", "Models loaded in place of another model"),
+    ("model_load_time", "model_load_seconds_total", "counter", "Time spent loading models"),
+]
+AGENT_METRICS = [
+    ("turns", "turns_total", "counter", "Turns taken by the agent"),
+    ("wall_time", "turn_seconds_total", "counter", "Wall time spent in the turns of the agent"),
+    ("wait_time", "wait_seconds_total", "counter", "Time spent in the turns of the agent before calling the model"),
+    ("llm_time", "llm_seconds_total", "counter", "Time spent waiting for the model"),
+    ("retrieval_time", "retrieval_seconds_total", "counter", "Time spent retrieving documents"),
+    ("llm_calls", "llm_calls_total", "counter", "Model calls"),
+    ("cached_llm_calls", "cached_llm_calls_total", "counter", "Model calls served by the response cache"),
+    ("prompt_tokens", "prompt_tokens_total", "counter", "Prompt tokens sent to the model"),
+    ("completion_tokens", "completion_tokens_total", "counter", "Completion tokens generated by the model"),
+]
+HTTP_POOL_METRICS = [
+    ("max_connections", "max_connections", "gauge", "Maximum connections of the pool"),
+    ("open_connections", "open_connections", "gauge", "Connections open in the pool"),
+    ("idle_connections", "idle_connections", "gauge", "Idle keep-alive connections of the pool"),
+    ("requests_in_flight", "requests_in_flight", "gauge", "Requests waiting for a reply"),
+    ("peak_requests_in_flight", "peak_requests_in_flight", "gauge", "Peak of concurrent requests"),
+    ("requests", "requests_total", "counter", "Requests sent through the pool"),
+]
+
+
+class MetricsExporter:
+    @staticmethod
+    def to_json(metrics: DiscussionMetrics) -> str:
+        return metrics.json(indent=2)
+
+    @staticmethod
+    def escape_label(value: str) -> str:
+        return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+    @staticmethod
+    def to_prometheus(metrics: DiscussionMetrics) -> str:
+        discussion_id = MetricsExporter.escape_label(metrics.discussion_id)
+        lines = []
+        for field, name, metric_type, description in DISCUSSION_METRICS:
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_{name} {description}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name} {metric_type}")
+            lines.append(f'{PROMETHEUS_PREFIX}_{name}{{discussion="{discussion_id}"}} {getattr(metrics, field)}')
+        for field, name, metric_type, description in AGENT_METRICS:
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_agent_{name} {description}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_agent_{name} {metric_type}")
+            for agent in metrics.agents:
+                labels = (f'discussion="{discussion_id}",agent="{MetricsExporter.escape_label(agent.agent_name)}",'
+                          f'model="{MetricsExporter.escape_label(agent.model or "")}"')
+                lines.append(f"{PROMETHEUS_PREFIX}_agent_{name}{{{labels}}} {getattr(agent, field)}")
+        for field, name, metric_type, description in HTTP_POOL_METRICS if metrics.http_pools else []:
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_http_pool_{name} {description}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_http_pool_{name} {metric_type}")
+            for pool in metrics.http_pools:
+                labels = f'base_url="{MetricsExporter.escape_label(pool.base_url)}"'
+                lines.append(f"{PROMETHEUS_PREFIX}_http_pool_{name}{{{labels}}} {getattr(pool, field)}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def export(metrics: DiscussionMetrics, directory: str) -> tuple[str, str]:
+        os.makedirs(directory, exist_ok=True)
+        file_name = re.sub(r"[^\w.-]", "_", metrics.discussion_id)
+        json_path = os.path.join(directory, f"{file_name}.json")
+        prometheus_path = os.path.join(directory, f"{file_name}.prom")
+        for path, content in ((json_path, MetricsExporter.to_json(metrics)),
+                              (prometheus_path, MetricsExporter.to_prometheus(metrics))):
+            temporary_path = f"{path}.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as metrics_file:
+                metrics_file.write(content)
+            os.replace(temporary_path, path)
+        return json_path, prometheus_path
@@ -0,0 +1,105 @@
+import threading
+import time
+import uuid
+
+from roundtable.models.agent_metrics import AgentMetrics
+from roundtable.models.code_candidate_metrics import CodeCandidateMetrics
+from roundtable.models.discussion_metrics import DiscussionMetrics
+from roundtable.models.model_load import ModelLoad
+from roundtable.models.turn_metrics import TurnMetrics
+
+
+class MetricsRecorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.discussion_id = str(uuid.uuid4())
+        self.started_at = time.perf_counter()
+        self.turn_started_at = self.started_at
+        self.retrieval_time = 0.0
+        self.model_loads = 0
+        self.model_swaps = 0
+        self.model_load_time = 0.0
+        self.turns: list[TurnMetrics] = []
+        self.pending_turns: dict[str, TurnMetrics] = {}
+        self.code_candidates: list[CodeCandidateMetrics] = []
+
+    def reset(self, discussion_id: str = None):
+        with self._lock:
+            self.discussion_id = discussion_id or str(uuid.uuid4())
+            self.started_at = time.perf_counter()
+            self.turn_started_at = self.started_at
+            self.retrieval_time = 0.0
+            self.model_loads = 0
+            self.model_swaps = 0
+            self.model_load_time = 0.0
+            self.turns = []
+            self.pending_turns = {}
+            self.code_candidates = []
+
+    def get_pending_turn(self, agent_name: str) -> TurnMetrics:
+        if agent_name not in self.pending_turns:
+            self.pending_turns[agent_name] = TurnMetrics(agent_name=agent_name)
+        return self.pending_turns[agent_name]
+
+    def record_llm_call(self, agent_name: str, model: str, started_at: float, duration: float,
+                        prompt_tokens: int = 0, completion_tokens: int = 0, cached: bool = False):
+        with self._lock:
+            turn = self.get_pending_turn(agent_name)
+            if turn.llm_calls == 0:
+                # Time spent in the turn before the first model call: hooks, retrieval, human input and the
+                # selection of the speaker.
+                turn.wait_time = max(started_at - self.turn_started_at, 0.0)
+            turn.model = model
+            turn.llm_calls += 1
+            turn.cached_llm_calls += int(cached)
+            turn.llm_time += duration
+            turn.prompt_tokens += prompt_tokens
+            turn.completion_tokens += completion_tokens
+
+    def record_retrieval(self, agent_name: str, duration: float):
+        with self._lock:
+            self.get_pending_turn(agent_name).retrieval_time += duration
+            self.retrieval_time += duration
+
+    def record_model_load(self, model_load: ModelLoad):
+        with self._lock:
+            self.model_loads += 1
+            self.model_swaps += int(model_load.evicted_model is not None)
+            self.model_load_time += model_load.load_time
+
+    def record_code_candidate(self, candidate: CodeCandidateMetrics):
+        with self._lock:
+            candidate.turn = len(self.turns)
+            self.code_candidates.append(candidate)
+
+    def end_turn(self, agent_name: str):
+        with self._lock:
+            now = time.perf_counter()
+            turn = self.pending_turns.pop(agent_name, None) or TurnMetrics(agent_name=agent_name)
+            turn.wall_time = now - self.turn_started_at
+            if turn.llm_calls == 0:
+                turn.wait_time = turn.wall_time
+            self.turns.append(turn)
+            self.turn_started_at = now
+
+    def get_metrics(self) -> DiscussionMetrics:
+        with self._lock:
+            turns = [turn.copy() for turn in self.turns]
+            agents: dict[str, AgentMetrics] = {}
+            for turn in turns:
+                agent = agents.setdefault(turn.agent_name, AgentMetrics(agent_name=turn.agent_name))
+                agent.model = turn.model or agent.model
+                agent.turns += 1
+                agent.wall_time += turn.wall_time
+                agent.wait_time += turn.wait_time
+                agent.llm_time += turn.llm_time
+                agent.retrieval_time += turn.retrieval_time
+                agent.llm_calls += turn.llm_calls
+                agent.cached_llm_calls += turn.cached_llm_calls
+                agent.prompt_tokens += turn.prompt_tokens
+                agent.completion_tokens += turn.completion_tokens
+            return DiscussionMetrics(discussion_id=self.discussion_id, wall_time=time.perf_counter() - self.started_at,
+                                     retrieval_time=self.retrieval_time, model_loads=self.model_loads,
+                                     model_swaps=self.model_swaps, model_load_time=self.model_load_time,
+                                     turns=turns, agents=list(agents.values()),
+                                     code_candidates=[candidate.copy() for candidate in self.code_candidates])
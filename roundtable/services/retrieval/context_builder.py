@@ -0,0 +1,102 @@
+import hashlib
+import json
+import re
+
+from autogen.agentchat.contrib.vectordb.base import QueryResults
+
+from roundtable.services.discussion_room.conversation_compactor import estimate_tokens
+from roundtable.shared.utils.logger import Logger
+
+PASSAGE_SEPARATOR = re.compile(r"\n\s*\n")
+WORD_PATTERN = re.compile(r"\w+")
+SHINGLE_SIZE = 3
+MIN_QUERY_TERM_LENGTH = 3
+QUERY_TERMS_WEIGHT = 0.5
+
+
+def count_context_tokens(text: str, model: str = None) -> int:
+    # Token count function of the retrieve config, the context is trimmed with the same estimate.
+    return estimate_tokens(text)
+
+
+class ContextBuilder:
+    # Post-processing of the chunks retrieved for a problem before they are injected in the conversation: near-identical
+    # chunks and repeated passages are dropped, the remaining passages are ranked by the distance of their chunk and the
+    # terms of the problem they contain, and the best ones are kept within the token budget.
+    def __init__(self, max_tokens: int, similarity: float, index_version: str = None):
+        self.logger = Logger()
+        self.max_tokens = max_tokens
+        self.similarity = similarity
+        self.index_version = index_version
+
+    def get_key(self, problem: str, n_results: int, search_string: str) -> str:
+        query = {"index_version": self.index_version, "problem": problem, "n_results": n_results,
+                 "search_string": search_string, "max_tokens": self.max_tokens, "similarity": self.similarity}
+        return hashlib.sha256(json.dumps(query, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def get_words(text: str) -> list[str]:
+        return WORD_PATTERN.findall(text.lower())
+
+    @staticmethod
+    def get_shingles(words: list[str]) -> set[tuple[str, ...]]:
+        if len(words) < SHINGLE_SIZE:
+            return {tuple(words)}
+        return {tuple(words[index:index + SHINGLE_SIZE]) for index in range(len(words) - SHINGLE_SIZE + 1)}
+
+    @staticmethod
+    def get_similarity(shingles: set, other_shingles: set) -> float:
+        union = len(shingles | other_shingles)
+        return len(shingles & other_shingles) / union if union else 1.0
+
+    def remove_duplicate_chunks(self, chunks: list[tuple[dict, float]]) -> list[tuple[dict, float]]:
+        # The same document is often indexed from several sources (e.g. a README and its copy in the assets).
+        unique_chunks = []
+        unique_shingles = []
+        for document, distance in chunks:
+            shingles = self.get_shingles(self.get_words(document["content"]))
+            if any(self.get_similarity(shingles, other) >= self.similarity for other in unique_shingles):
+                continue
+            unique_chunks.append((document, distance))
+            unique_shingles.append(shingles)
+        return unique_chunks
+
+    def build(self, results: QueryResults, problem: str) -> QueryResults:
+        chunks = results[0] if results else []
+        unique_chunks = self.remove_duplicate_chunks(chunks)
+        query_terms = {word for word in self.get_words(problem) if len(word) >= MIN_QUERY_TERM_LENGTH}
+        passages = []
+        seen_passages = set()
+        for rank, (document, distance) in enumerate(unique_chunks):
+            for position, passage in enumerate(PASSAGE_SEPARATOR.split(document["content"])):
+                passage = passage.strip()
+                normalized_passage = " ".join(self.get_words(passage))
+                if not normalized_passage or normalized_passage in seen_passages:
+                    continue
+                seen_passages.add(normalized_passage)
+                words = set(normalized_passage.split())
+                coverage = len(query_terms & words) / len(query_terms) if query_terms else 0.0
+                score = 1 / (1 + max(distance, 0.0)) + QUERY_TERMS_WEIGHT * coverage
+                passages.append((score, rank, position, passage))
+
+        selected_passages = []
+        total_tokens = sum(estimate_tokens(document["content"]) for document, _ in chunks)
+        remaining_tokens = self.max_tokens
+        for score, rank, position, passage in sorted(passages, key=lambda passage: (-passage[0], passage[1],
+                                                                                       passage[2])):
+            tokens = estimate_tokens(passage)
+            if self.max_tokens and tokens > remaining_tokens:
+                continue
+            remaining_tokens -= tokens
+            selected_passages.append((rank, position, passage))
+
+        # Chunks keep the order of the vector store, passages the order of their chunk.
+        contents: dict[int, list[str]] = {}
+        for rank, position, passage in sorted(selected_passages):
+            contents.setdefault(rank, []).append(passage)
+        context = [({**unique_chunks[rank][0], "content": "\n\n".join(chunk_passages)}, unique_chunks[rank][1])
+                   for rank, chunk_passages in contents.items()]
+        self.logger.debug("Retrieval context: %d of %d chunks, %d duplicate chunks removed, ~%d of ~%d tokens kept",
+                          len(context), len(chunks), len(chunks) - len(unique_chunks),
+                          sum(estimate_tokens(document["content"]) for document, _ in context), total_tokens)
+        return [context]
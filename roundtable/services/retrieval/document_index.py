@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+from typing import Callable
+
+from autogen.agentchat.contrib.vectordb.base import Document
+from autogen.agentchat.contrib.vectordb.chromadb import ChromaVectorDB
+from autogen.retrieve_utils import TEXT_FORMATS, get_file_from_url, get_files_from_dir, split_files_to_chunks
+from chromadb.api.types import EmbeddingFunction
+from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
+
+from roundtable.models.discussion_room_config import DiscussionRoomConfig
+from roundtable.models.index_refresh_report import IndexRefreshReport
+from roundtable.services.retrieval.context_builder import count_context_tokens
+from roundtable.shared.utils.logger import Logger
+
+REMOTE_DOCUMENTS = [
+    "https://raw.githubusercontent.com/lucafulgenzi/lucafulgenzi/main/README.md",
+    "https://raw.githubusercontent.com/ZappaBoy/ZappaBoy/main/README.md",
+]
+LOCAL_DOCUMENTS = [
+    os.path.join(os.path.dirname(__file__), "..", "..", "..", "assets"),
+]
+
+CHUNK_MODE = "multi_lines"
+MUST_BREAK_AT_EMPTY_LINE = True
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+MANIFEST_FILE_NAME = "manifest.json"
+
+
+class DocumentIndex:
+    def __init__(self, config: DiscussionRoomConfig, remote_documents: list[str] = None,
+                 local_documents: list[str] = None, embedding_function: EmbeddingFunction = None,
+                 token_count_function: Callable[[str], int] = None):
+        self.logger = Logger()
+        self.config = config
+        self.remote_documents = REMOTE_DOCUMENTS if remote_documents is None else remote_documents
+        self.local_documents = LOCAL_DOCUMENTS if local_documents is None else local_documents
+        self.embedding_function = embedding_function
+        # Documents are chunked with the tiktoken encoding of autogen unless another token count is given.
+        self.token_count_function = token_count_function
+        self.index_path = config.retrieval_index_path
+        self.mirror_path = config.retrieval_docs_mirror_path
+        self.collection_name = config.retrieval_collection_name
+        self.manifest_path = os.path.join(self.index_path, MANIFEST_FILE_NAME)
+        self.chunking_key = self.get_chunking_key()
+        self._vector_db = None
+
+    def get_chunking_key(self) -> str:
+        chunking = {
+            "chunk_token_size": self.config.retrieval_chunk_token_size,
+            "chunk_mode": CHUNK_MODE,
+            "must_break_at_empty_line": MUST_BREAK_AT_EMPTY_LINE,
+            "embedding_model": EMBEDDING_MODEL if self.embedding_function is None
+            else type(self.embedding_function).__name__,
+        }
+        if self.token_count_function is not None:
+            chunking["token_count_function"] = self.token_count_function.__name__
+        return hashlib.sha256(json.dumps(chunking, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get_vector_db(self) -> ChromaVectorDB:
+        if self._vector_db is None:
+            os.makedirs(self.index_path, exist_ok=True)
+            embedding_function = self.embedding_function
+            if embedding_function is None:
+                embedding_function = SentenceTransformerEmbeddingFunction(EMBEDDING_MODEL)
+            vector_db = ChromaVectorDB(path=self.index_path, embedding_function=embedding_function)
+            # `ChromaVectorDB.create_collection` reopens existing collections without their embedding function, so
+            # the collection is opened here to embed queries with the same model used to index the documents.
+            vector_db.active_collection = vector_db.client.get_or_create_collection(
+                self.collection_name, embedding_function=vector_db.embedding_function, metadata=vector_db.metadata)
+            self._vector_db = vector_db
+        return self._vector_db
+
+    def is_built(self) -> bool:
+        manifest = self.load_manifest()
+        return manifest.get("chunking") == self.chunking_key
+
+    def get_index_version(self) -> str:
+        # Changes whenever a document is added, updated or removed, or the chunking changes.
+        manifest = self.load_manifest()
+        return hashlib.sha256(json.dumps(manifest, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get_retrieve_config(self) -> dict:
+        if not self.is_built():
+            self.logger.warning("Retrieval index not found or outdated, building it now. "
+                                "Run `roundtable --index` to build it ahead of time.")
+            self.refresh(offline=self.config.use_offline_retrieval)
+        vector_db = self.get_vector_db()
+        retrieve_config = {
+            "vector_db": vector_db,
+            "client": vector_db.client,
+            "collection_name": self.collection_name,
+            "docs_path": None,
+            "chunk_token_size": self.config.retrieval_chunk_token_size,
+            "get_or_create": True,
+            "overwrite": False,
+        }
+        if self.config.retrieval_context_max_tokens:
+            # The context is already trimmed to the budget, it is counted with the same estimate to be kept whole.
+            retrieve_config["context_max_tokens"] = self.config.retrieval_context_max_tokens
+            retrieve_config["custom_token_count_function"] = count_context_tokens
+        return retrieve_config
+
+    def load_manifest(self) -> dict:
+        if not os.path.isfile(self.manifest_path):
+            return {}
+        with open(self.manifest_path, "r", encoding="utf-8") as manifest_file:
+            return json.load(manifest_file)
+
+    def save_manifest(self, manifest: dict):
+        os.makedirs(self.index_path, exist_ok=True)
+        temporary_path = f"{self.manifest_path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+        os.replace(temporary_path, self.manifest_path)
+
+    def get_mirror_file_path(self, url: str) -> str:
+        url_hash = hashlib.blake2b(url.encode("utf-8")).hexdigest()[:8]
+        return os.path.join(self.mirror_path, f"{url_hash}_{os.path.basename(url)}")
+
+    def mirror_remote_documents(self, offline: bool = False) -> dict[str, str]:
+        os.makedirs(self.mirror_path, exist_ok=True)
+        documents = {}
+        for url in self.remote_documents:
+            mirror_file_path = self.get_mirror_file_path(url)
+            if not offline and get_file_from_url(url, save_path=mirror_file_path) is None:
+                self.logger.warning("Unable to download %s, using the local mirror if available", url)
+            if os.path.isfile(mirror_file_path):
+                documents[url] = mirror_file_path
+            else:
+                self.logger.warning("No local mirror available for %s, skipping", url)
+        return documents
+
+    def collect_documents(self, offline: bool = False) -> dict[str, str]:
+        documents = self.mirror_remote_documents(offline=offline)
+        for local_path in self.local_documents:
+            if not os.path.exists(local_path):
+                continue
+            for file_path in get_files_from_dir(local_path, TEXT_FORMATS):
+                documents[os.path.normpath(file_path)] = file_path
+        return documents
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        with open(file_path, "rb") as document_file:
+            return hashlib.sha256(document_file.read()).hexdigest()
+
+    def get_document_ids(self, source: str, content_hash: str, chunks_count: int) -> list[str]:
+        key = hashlib.blake2b(f"{source}:{content_hash}:{self.chunking_key}".encode("utf-8")).hexdigest()[:16]
+        return [f"{key}-{index}" for index in range(chunks_count)]
+
+    def split_text(self, text: str) -> list[str]:
+        # Lines are grouped in chunks of at most the chunk token size, counted with the given token count function.
+        chunks = []
+        lines, tokens = [], 0
+        for line in text.splitlines():
+            line_tokens = self.token_count_function(line)
+            if lines and tokens + line_tokens > self.config.retrieval_chunk_token_size:
+                chunks.append("\n".join(lines).strip())
+                lines, tokens = [], 0
+            lines.append(line)
+            tokens += line_tokens
+        chunks.append("\n".join(lines).strip())
+        return [chunk for chunk in chunks if chunk]
+
+    def delete_documents(self, ids: list[str]):
+        if ids:
+            self.get_vector_db().delete_docs(ids, collection_name=self.collection_name)
+
+    def refresh(self, offline: bool = False) -> IndexRefreshReport:
+        report = IndexRefreshReport()
+        manifest = self.load_manifest()
+        vector_db = self.get_vector_db()
+        if manifest.get("chunking") != self.chunking_key:
+            if manifest:
+                self.logger.info("Chunking parameters changed, rebuilding the retrieval index")
+                vector_db.delete_collection(self.collection_name)
+                self._vector_db = None
+                vector_db = self.get_vector_db()
+            manifest = {"chunking": self.chunking_key, "documents": {}}
+            report.rebuilt = True
+
+        indexed_documents: dict = manifest["documents"]
+        current_documents = self.collect_documents(offline=offline)
+
+        for source in list(indexed_documents):
+            if source not in current_documents:
+                self.delete_documents(indexed_documents.pop(source)["ids"])
+                report.removed.append(source)
+
+        for source, file_path in current_documents.items():
+            content_hash = self.hash_file(file_path)
+            indexed_document = indexed_documents.get(source)
+            if indexed_document is not None and indexed_document["hash"] == content_hash:
+                report.unchanged.append(source)
+                continue
+
+            split_function = self.split_text if self.token_count_function is not None else None
+            chunks, _ = split_files_to_chunks([(file_path, source)], self.config.retrieval_chunk_token_size,
+                                              CHUNK_MODE, MUST_BREAK_AT_EMPTY_LINE,
+                                              custom_text_split_function=split_function)
+            ids = self.get_document_ids(source, content_hash, len(chunks))
+            if indexed_document is not None:
+                self.delete_documents(indexed_document["ids"])
+                report.updated.append(source)
+            else:
+                report.added.append(source)
+            documents = [Document(id=document_id, content=chunk, metadata={"source": source})
+                         for document_id, chunk in zip(ids, chunks)]
+            vector_db.insert_docs(documents, collection_name=self.collection_name, upsert=True)
+            indexed_documents[source] = {"hash": content_hash, "ids": ids}
+            report.embedded_chunks += len(chunks)
+
+        self.save_manifest(manifest)
+        self.logger.info("Retrieval index refreshed: %d added, %d updated, %d removed, %d unchanged, "
+                         "%d chunks embedded", len(report.added), len(report.updated), len(report.removed),
+                         len(report.unchanged), report.embedded_chunks)
+        return report
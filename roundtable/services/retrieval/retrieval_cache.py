@@ -0,0 +1,50 @@
+import copy
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from autogen.agentchat.contrib.vectordb.base import QueryResults
+
+from roundtable.models.retrieval_cache_stats import RetrievalCacheStats
+
+
+class RetrievalCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.stats = RetrievalCacheStats()
+        self._results: OrderedDict[str, QueryResults] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[QueryResults]:
+        with self._lock:
+            results = self._results.get(key)
+            if results is None:
+                self.stats.misses += 1
+                return None
+            self._results.move_to_end(key)
+            self.stats.hits += 1
+        # Agents keep the results of their query, every discussion gets its own copy.
+        return copy.deepcopy(results)
+
+    def set(self, key: str, results: QueryResults):
+        with self._lock:
+            self._results[key] = copy.deepcopy(results)
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+                self.stats.evictions += 1
+
+
+_retrieval_caches: dict[int, RetrievalCache] = {}
+_retrieval_caches_lock = threading.Lock()
+
+
+def get_retrieval_cache(max_entries: int) -> RetrievalCache:
+    # Query results are shared by every room of the process, retried and repeated discussions do not query the
+    # vector store again.
+    with _retrieval_caches_lock:
+        retrieval_cache = _retrieval_caches.get(max_entries)
+        if retrieval_cache is None:
+            retrieval_cache = RetrievalCache(max_entries)
+            _retrieval_caches[max_entries] = retrieval_cache
+        return retrieval_cache
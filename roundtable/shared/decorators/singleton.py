@@ -1,6 +1,9 @@
+import threading
+
+
 class Singleton:
     """
-    A non-thread-safe helper class to ease implementing singletons.
+    A thread-safe helper class to ease implementing singletons.
     This should be used as a decorator -- not a metaclass -- to the
     class that should be a singleton.
 
@@ -16,6 +19,7 @@ class Singleton:
 
     def __init__(self, decorated):
         self._decorated = decorated
+        self._lock = threading.Lock()
 
     def instance(self):
         """
@@ -27,7 +31,10 @@ class Singleton:
         try:
             return self._instance
         except AttributeError:
-            self._instance = self._decorated()
+            with self._lock:
+                # Another thread may have created the instance while this one was waiting for the lock.
+                if not hasattr(self, "_instance"):
+                    self._instance = self._decorated()
             return self._instance
 
     def __call__(self):
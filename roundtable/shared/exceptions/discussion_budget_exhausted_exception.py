@@ -0,0 +1,3 @@
+class DiscussionBudgetExhaustedException(Exception):
+    def __init__(self, reason: str):
+        super().__init__(f"Discussion budget exhausted: {reason}")
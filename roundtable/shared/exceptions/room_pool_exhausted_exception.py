@@ -0,0 +1,3 @@
+class RoomPoolExhaustedException(Exception):
+    def __init__(self, max_rooms: int):
+        super().__init__(f"All the {max_rooms} discussion rooms are busy, try again later")
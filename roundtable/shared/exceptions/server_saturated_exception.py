@@ -0,0 +1,3 @@
+class ServerSaturatedException(Exception):
+    def __init__(self, pending_discussions: int):
+        super().__init__(f"The server is saturated with {pending_discussions} pending discussions, try again later")
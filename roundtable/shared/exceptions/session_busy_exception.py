@@ -0,0 +1,3 @@
+class SessionBusyException(Exception):
+    def __init__(self, session_id: str):
+        super().__init__(f"Session {session_id} is already discussing, wait for the discussion to finish")
@@ -0,0 +1,3 @@
+class TranscriptNotFoundException(Exception):
+    def __init__(self, discussion_id: str):
+        super().__init__(f"No transcript found for discussion {discussion_id}, it cannot be resumed")
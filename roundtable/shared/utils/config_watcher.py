@@ -0,0 +1,29 @@
+import threading
+
+from roundtable.shared.utils.configurator import Configurator
+from roundtable.shared.utils.logger import Logger
+
+
+class ConfigWatcher:
+    def __init__(self, interval: float):
+        self.logger = Logger()
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        if self._thread is not None or self.interval <= 0:
+            return
+        self._thread = threading.Thread(target=self.watch, name="config-watcher", daemon=True)
+        self._thread.start()
+
+    def watch(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                if Configurator.instance().reload_if_changed():
+                    self.logger.info("Configuration reloaded, new discussion rooms use the updated settings")
+            except ValueError as e:
+                self.logger.warning("Configuration not reloaded, the settings are invalid: %s", e)
+
+    def stop(self):
+        self._stopped.set()
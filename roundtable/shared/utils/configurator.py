@@ -1,3 +1,9 @@
+import os
+import threading
+from typing import Any
+
+from pydantic import ValidationError
+
 from roundtable.models.discussion_room_config import DiscussionRoomConfig
 from roundtable.models.log_level import LogLevel
 from roundtable.models.settings.environment import Environment
@@ -8,7 +14,10 @@ from roundtable.shared.decorators.singleton import Singleton
 @Singleton
 class Configurator:
     def __init__(self):
+        self._reload_lock = threading.Lock()
+        self._env_file_mtime = self.get_env_file_mtime()
         self._settings = Settings()
+        self._discussion_room_config = self.build_discussion_room_config(self._settings)
         if self.is_debug_enabled():
             print("Debug enabled")
 
@@ -24,12 +33,105 @@ class Configurator:
     def get_settings(self) -> Settings:
         return self._settings
 
-    def get_discussion_room_config(self) -> DiscussionRoomConfig:
+    def get_discussion_room_config(self, **overrides: Any) -> DiscussionRoomConfig:
+        # Snapshots are immutable and replaced as a whole on reload, readers never wait for a reload to finish.
+        config = self._discussion_room_config
+        if not overrides:
+            return config
+        return config.copy(update=self.validate_overrides(overrides))
+
+    @staticmethod
+    def validate_overrides(overrides: dict[str, Any]) -> dict[str, Any]:
+        # Only the overridden fields are validated, the rest of the snapshot is already valid.
+        validated_overrides = {}
+        for name, value in overrides.items():
+            field = DiscussionRoomConfig.__fields__.get(name)
+            if field is None:
+                raise ValueError(f"Unknown discussion room setting {name}")
+            validated_overrides[name], errors = field.validate(value, validated_overrides, loc=name,
+                                                               cls=DiscussionRoomConfig)
+            if errors:
+                raise ValidationError([errors], DiscussionRoomConfig)
+        return validated_overrides
+
+    @staticmethod
+    def get_env_file_mtime() -> float | None:
+        env_file = Settings.__config__.env_file
+        return os.path.getmtime(env_file) if env_file and os.path.isfile(env_file) else None
+
+    def reload_if_changed(self) -> bool:
+        env_file_mtime = self.get_env_file_mtime()
+        if env_file_mtime == self._env_file_mtime:
+            return False
+        # The file is not read again until it changes, even when its settings turn out to be invalid.
+        self._env_file_mtime = env_file_mtime
+        self.reload()
+        return True
+
+    def reload(self):
+        with self._reload_lock:
+            settings = Settings()
+            discussion_room_config = self.build_discussion_room_config(settings)
+            self._settings = settings
+            self._discussion_room_config = discussion_room_config
+
+    @staticmethod
+    def build_discussion_room_config(settings: Settings) -> DiscussionRoomConfig:
         return DiscussionRoomConfig(
-            base_url=self._settings.ollama_base_url,
-            api_key=self._settings.ollama_api_key,
-            llm_model_name=self._settings.llm_model,
-            code_model_name=self._settings.code_model,
-            use_code_execution=self._settings.code_execution,
-            execute_code_in_docker=self._settings.docker_code_execution,
+            base_url=settings.ollama_base_url,
+            api_key=settings.ollama_api_key,
+            llm_model_name=settings.llm_model,
+            code_model_name=settings.code_model,
+            use_code_execution=settings.code_execution,
+            execute_code_in_docker=settings.docker_code_execution,
+            executor_pool_size=settings.executor_pool_size,
+            executor_timeout=settings.executor_timeout,
+            executor_memory_limit_mb=settings.executor_memory_limit_mb,
+            executor_max_runs_per_worker=settings.executor_max_runs_per_worker,
+            executor_preload_modules=settings.executor_preload_modules,
+            executor_env_path=settings.executor_env_path,
+            executor_workspace_path=settings.executor_workspace_path,
+            use_execution_cache=settings.execution_cache,
+            execution_cache_max_entries=settings.execution_cache_max_entries,
+            execution_cache_max_bytes=settings.execution_cache_max_bytes,
+            code_candidates=settings.code_candidates,
+            code_candidate_temperatures=settings.code_candidate_temperatures,
+            http_max_connections=settings.http_max_connections,
+            http_timeout=settings.http_timeout,
+            http_connect_timeout=settings.http_connect_timeout,
+            use_model_scheduling=settings.model_scheduling,
+            max_loaded_models=settings.ollama_max_loaded_models,
+            model_keep_alive=settings.ollama_keep_alive,
+            use_streaming=settings.stream_responses,
+            use_llm_cache=settings.llm_cache,
+            llm_cache_path=settings.llm_cache_path,
+            llm_cache_max_entries=settings.llm_cache_max_entries,
+            retrieval_index_path=settings.retrieval_index_path,
+            retrieval_docs_mirror_path=settings.retrieval_docs_mirror_path,
+            retrieval_collection_name=settings.retrieval_collection_name,
+            retrieval_chunk_token_size=settings.retrieval_chunk_token_size,
+            use_offline_retrieval=settings.retrieval_offline,
+            retrieval_context_max_tokens=settings.retrieval_context_max_tokens,
+            retrieval_dedup_similarity=settings.retrieval_dedup_similarity,
+            use_retrieval_cache=settings.retrieval_cache,
+            retrieval_cache_max_entries=settings.retrieval_cache_max_entries,
+            speaker_selection_method=settings.speaker_selection,
+            fan_out_agents=settings.fan_out_agents,
+            fan_out_triggers=settings.fan_out_triggers,
+            use_convergence_detection=settings.convergence_detection,
+            convergence_similarity=settings.convergence_similarity,
+            use_conversation_compaction=settings.conversation_compaction,
+            compaction_keep_turns=settings.compaction_keep_turns,
+            compaction_keep_turns_by_role=settings.compaction_keep_turns_by_role,
+            compaction_max_message_tokens=settings.compaction_max_message_tokens,
+            compaction_summary_max_tokens=settings.compaction_summary_max_tokens,
+            discussion_deadline=settings.discussion_deadline,
+            prompt_token_budget=settings.discussion_prompt_token_budget,
+            completion_token_budget=settings.discussion_completion_token_budget,
+            final_answer_timeout=settings.final_answer_timeout,
+            final_answer_max_tokens=settings.final_answer_max_tokens,
+            use_transcript_log=settings.transcript_log,
+            transcripts_path=settings.transcripts_path,
+            export_metrics=settings.metrics_export,
+            metrics_path=settings.metrics_path,
         )
@@ -1,48 +1,147 @@
+import atexit
+import contextvars
+import json
 import logging
+import queue
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO
 
 from roundtable.models.log_level import LogLevel
 from roundtable.shared.utils.configurator import Configurator
 
+TEXT_FORMAT = '%(levelname)-5s :: %(message)s'
+JSON_FORMAT = "json"
+LOGGING_LEVELS = {
+    LogLevel.ERROR: logging.ERROR,
+    LogLevel.WARNING: logging.WARNING,
+    LogLevel.INFO: logging.INFO,
+    LogLevel.DEBUG: logging.DEBUG,
+}
+
+_log_context: contextvars.ContextVar[dict] = contextvars.ContextVar("log_context", default={})
+_project_logger: logging.Logger | None = None
+_configure_lock = threading.Lock()
+
+
+@contextmanager
+def log_context(**fields):
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class ContextQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Runs on the calling thread: the message is rendered here because its arguments may change once the call
+        # returns, the context is captured here because it lives in the caller. Formatting is left to the listener.
+        # The record is updated in place instead of copied, the rendered message is the same for every handler.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.context = _log_context.get()
+        return record
+
+
+class TextFormatter(logging.Formatter):
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        message = super().formatMessage(record)
+        context = getattr(record, "context", None)
+        if not context:
+            return message
+        fields = " ".join(f"{key}={value}" for key, value in context.items())
+        return f"{message} [{fields}]"
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+            **getattr(record, "context", {}),
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+def build_queue_handler(stream: IO[str], log_format: str = None) -> tuple[ContextQueueHandler, QueueListener]:
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(JsonFormatter() if log_format == JSON_FORMAT else TextFormatter(TEXT_FORMAT))
+    log_queue = queue.SimpleQueue()
+    return ContextQueueHandler(log_queue), QueueListener(log_queue, stream_handler)
+
+
+def configure_logging() -> logging.Logger:
+    global _project_logger
+    if _project_logger is not None:
+        return _project_logger
+    with _configure_lock:
+        if _project_logger is None:
+            settings = Configurator.instance().get_settings()
+            # Records of every logger are written by a background thread, callers only pay for queueing them.
+            queue_handler, listener = build_queue_handler(sys.stderr, settings.log_format)
+            logging.getLogger().addHandler(queue_handler)
+            listener.start()
+            atexit.register(listener.stop)
+            project_logger = logging.getLogger(settings.title)
+            set_log_level(project_logger, settings.log_level)
+            _project_logger = project_logger
+    return _project_logger
+
+
+def set_log_level(logger: logging.Logger, log_level: LogLevel):
+    if log_level == LogLevel.DISABLED:
+        logging.disable(logging.CRITICAL)
+    else:
+        logger.setLevel(LOGGING_LEVELS[log_level])
+
 
 class Logger:
-    def __init__(self, log_level: LogLevel | int = LogLevel.INFO):
-        self.log_level = log_level
-        project_name = Configurator.instance().get_project_name()
-        self.logger = logging.getLogger(project_name)
-        self.set_log_level(log_level)
-        self.format = '%(levelname)-5s :: %(message)s'
-        logging.basicConfig(format=self.format)
+    def __init__(self, log_level: LogLevel | int = None):
+        self.logger = configure_logging()
+        if log_level is not None:
+            self.set_log_level(log_level)
 
     def set_log_level(self, log_level: LogLevel | int = LogLevel.INFO):
         if isinstance(log_level, int):
             log_level = LogLevel.from_value(log_level)
-        if log_level == LogLevel.DISABLED:
-            self.disable()
-        else:
-            self.logger.setLevel(level=log_level.get_value())
+        set_log_level(self.logger, log_level)
 
     @staticmethod
     def disable():
         logging.disable(logging.CRITICAL)
 
-    @staticmethod
-    def format_log(log):
-        return log
+    def is_debug_enabled(self) -> bool:
+        return self.logger.isEnabledFor(logging.DEBUG)
+
+    # Arguments are formatted lazily with the `%` style, only once the level of the record is known to be enabled.
+    def log(self, level: int, log, args: tuple, exc_info: bool = False):
+        if self.logger.isEnabledFor(level):
+            self.logger._log(level, log, args, exc_info=exc_info, stacklevel=3)
 
-    def info(self, log):
-        logging.info(self.format_log(log))
+    def info(self, log, *args):
+        self.log(logging.INFO, log, args)
 
-    def warning(self, log):
-        logging.warning(self.format_log(log))
+    def warning(self, log, *args):
+        self.log(logging.WARNING, log, args)
 
-    def error(self, log):
-        logging.error(self.format_log(log))
+    def error(self, log, *args):
+        self.log(logging.ERROR, log, args)
 
-    def debug(self, log):
-        logging.debug(self.format_log(log))
+    def debug(self, log, *args):
+        self.log(logging.DEBUG, log, args)
 
-    def critical(self, log):
-        logging.critical(self.format_log(log))
+    def critical(self, log, *args):
+        self.log(logging.CRITICAL, log, args)
 
-    def exception(self, log):
-        logging.exception(self.format_log(log))
+    def exception(self, log, *args):
+        self.log(logging.ERROR, log, args, exc_info=True)
@@ -0,0 +1,11 @@
+TRUNCATION_MARKER = "\n[... {omitted} characters omitted ...]\n"
+
+
+def truncate_middle(content: str, max_length: int) -> str:
+    if len(content) <= max_length:
+        return content
+    # Head and tail are kept, errors and results of executions are usually at the end of the output.
+    head_length = max_length // 2
+    tail_length = max_length - head_length
+    omitted = len(content) - max_length
+    return content[:head_length] + TRUNCATION_MARKER.format(omitted=omitted) + content[-tail_length:]
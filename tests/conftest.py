@@ -1,7 +1,30 @@
+from typing import Callable
+
 import pytest
+from autogen import ConversableAgent, GroupChat
 from dotenv import load_dotenv
 
+from roundtable.services.discussion_room.roles import TERMINATE
+from roundtable.services.discussion_room.trackable_agent import CallbackGroupChatManager
+
 
 @pytest.fixture(scope='session', autouse=True)
 def load_env():
     load_dotenv()
+
+
+def build_scripted_agent(name: str, reply: Callable[[list[dict]], str]) -> ConversableAgent:
+    # Agent replying without a model, `reply` receives the messages of the conversation.
+    agent = ConversableAgent(name, llm_config=False, human_input_mode="NEVER")
+
+    def reply_function(recipient, messages=None, sender=None, config=None):
+        return True, reply(messages)
+
+    agent.register_reply([ConversableAgent, None], reply_function)
+    return agent
+
+
+def build_group_chat_manager(agents: list[ConversableAgent], max_round: int = 10) -> CallbackGroupChatManager:
+    group_chat = GroupChat(agents=agents, messages=[], max_round=max_round, speaker_selection_method="round_robin")
+    return CallbackGroupChatManager(groupchat=group_chat, llm_config=False,
+                                    is_termination_msg=lambda message: TERMINATE in message.get("content", ""))
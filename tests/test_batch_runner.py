@@ -0,0 +1,40 @@
+import json
+
+from roundtable.models.discussion_result import DiscussionResult
+from roundtable.services.batch import batch_runner
+from roundtable.services.batch.batch_runner import BatchRunner
+from roundtable.shared.utils.configurator import Configurator
+
+
+class FakeDiscussionRoom:
+    def __init__(self, config):
+        self.config = config
+
+    def run(self, problem_id: str, problem: str) -> DiscussionResult:
+        return DiscussionResult(id=problem_id, problem=problem, completed=True, answer=problem.upper(), rounds=1)
+
+
+class FakeDocumentIndex:
+    def __init__(self, config):
+        pass
+
+    def is_built(self) -> bool:
+        return True
+
+
+def test_batch_resumes_from_completed_results(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_runner, "DiscussionRoom", FakeDiscussionRoom)
+    monkeypatch.setattr(batch_runner, "DocumentIndex", FakeDocumentIndex)
+    input_path = tmp_path / "problems.jsonl"
+    output_path = tmp_path / "results.jsonl"
+    input_path.write_text("\n".join(json.dumps({"id": str(i), "problem": f"problem {i}"}) for i in range(4)))
+    output_path.write_text(DiscussionResult(id="0", problem="problem 0", completed=True).json() + "\n"
+                           + DiscussionResult(id="1", problem="problem 1", error="timeout").json() + "\n"
+                           + '{"id": "2", "prob')
+    config = Configurator.instance().get_discussion_room_config()
+
+    results = BatchRunner(config, str(input_path), str(output_path), concurrency=2).run()
+
+    assert sorted(result.id for result in results) == ["1", "2", "3"]
+    assert all(result.answer == result.problem.upper() for result in results)
+    assert BatchRunner(config, str(input_path), str(output_path), concurrency=2).run() == []
@@ -0,0 +1,13 @@
+from benchmarks.benchmark_runner import BenchmarkRunner
+from benchmarks.scenarios import SCENARIOS
+
+
+def test_benchmark_suite_runs_offline(tmp_path):
+    runner = BenchmarkRunner({"no_code": SCENARIOS["no_code"]}, str(tmp_path), repetitions=1, logging_iterations=10)
+
+    report = runner.run()
+
+    assert [scenario.name for scenario in report.scenarios] == ["no_code"]
+    assert report.scenarios[0].rounds > 0 and report.scenarios[0].llm_calls > 0
+    assert report.index_build_time > 0
+    assert set(report.logging_costs)
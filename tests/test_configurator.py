@@ -0,0 +1,39 @@
+import os
+
+import pytest
+from pydantic import ValidationError
+
+from roundtable.shared.utils.configurator import Configurator
+
+
+def test_snapshots_are_shared_and_overrides_do_not_change_them():
+    configurator = Configurator.instance()
+    config = configurator.get_discussion_room_config()
+    overridden_config = configurator.get_discussion_room_config(llm_model_name="llama3", use_code_execution="true")
+
+    assert configurator.get_discussion_room_config() is config
+    assert overridden_config.llm_model_name == "llama3" and overridden_config.use_code_execution is True
+    assert config.llm_model_name != "llama3"
+    with pytest.raises(TypeError):
+        config.llm_model_name = "llama3"
+    with pytest.raises(ValidationError):
+        configurator.get_discussion_room_config(executor_timeout="never")
+    with pytest.raises(ValueError):
+        configurator.get_discussion_room_config(unknown_setting=True)
+
+
+def test_settings_are_reloaded_when_the_env_file_changes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    env_file = tmp_path / ".env"
+    env_file.write_text("LLM_MODEL=first\n")
+    # A fresh instance reading the `.env` of the test, the process wide singleton is left untouched.
+    configurator = Configurator._decorated()
+    config = configurator.get_discussion_room_config()
+
+    assert not configurator.reload_if_changed()
+    env_file.write_text("LLM_MODEL=second\n")
+    os.utime(env_file, (os.path.getmtime(env_file) + 1, os.path.getmtime(env_file) + 1))
+
+    assert configurator.reload_if_changed()
+    assert configurator.get_discussion_room_config().llm_model_name == "second"
+    assert config.llm_model_name == "first"
@@ -0,0 +1,47 @@
+from roundtable.services.retrieval.context_builder import ContextBuilder
+from roundtable.services.retrieval.retrieval_cache import RetrievalCache
+
+README = "Roundtable simulates a discussion between agents.\n\nInstall it with poetry install."
+LICENSE = "Released under the MIT license."
+CHANGELOG = "Version 0.1.0 adds the batch mode.\n\n" + LICENSE
+
+
+def build_results() -> list:
+    return [[
+        ({"id": "readme", "content": README, "metadata": {"source": "README.md"}}, 0.1),
+        ({"id": "readme-copy", "content": README + "\n", "metadata": {"source": "assets/README.md"}}, 0.2),
+        ({"id": "license", "content": LICENSE, "metadata": {"source": "LICENSE"}}, 0.5),
+        ({"id": "changelog", "content": CHANGELOG, "metadata": {"source": "CHANGELOG.md"}}, 0.6),
+    ]]
+
+
+def test_duplicates_are_removed_and_passages_kept_in_order():
+    results = ContextBuilder(max_tokens=0, similarity=0.8).build(build_results(), "How do I install roundtable?")
+
+    assert [(document["id"], document["content"]) for document, _ in results[0]] == [
+        ("readme", README), ("license", LICENSE), ("changelog", "Version 0.1.0 adds the batch mode.")]
+
+
+def test_passages_are_trimmed_to_the_token_budget():
+    context_builder = ContextBuilder(max_tokens=10, similarity=0.8)
+
+    results = context_builder.build(build_results(), "How do I install roundtable?")
+
+    # The passage about the installation matches the problem and fits in the budget, the others do not.
+    assert [(document["id"], document["content"]) for document, _ in results[0]] == [
+        ("readme", "Install it with poetry install.")]
+
+
+def test_context_is_cached_per_problem():
+    context_builder = ContextBuilder(max_tokens=0, similarity=0.8, index_version="1")
+    retrieval_cache = RetrievalCache(max_entries=1)
+    key = context_builder.get_key("How do I install roundtable?", 20, "")
+    retrieval_cache.set(key, context_builder.build(build_results(), "How do I install roundtable?"))
+
+    cached_results = retrieval_cache.get(key)
+    cached_results[0].clear()
+
+    assert len(retrieval_cache.get(key)[0]) == 3
+    assert retrieval_cache.get(ContextBuilder(max_tokens=0, similarity=0.8, index_version="2").get_key(
+        "How do I install roundtable?", 20, "")) is None
+    assert (retrieval_cache.stats.hits, retrieval_cache.stats.misses) == (2, 1)
@@ -0,0 +1,64 @@
+from roundtable.services.discussion_room.convergence_detector import ConvergenceDetector
+from roundtable.services.discussion_room.discussion_room import DiscussionRoom
+from roundtable.services.discussion_room.roles import ADMIN, ASSISTANT, CRITIC, ENGINEER, EXECUTOR, NO_CODE_EXECUTED, \
+    SUPERVISOR
+from roundtable.services.execution.execution_cache import CACHED_RESULT_MARKER
+
+
+def message(name: str, content: str) -> dict:
+    return {"role": "user", "name": name, "content": content}
+
+
+def test_termination_message_ignores_trailing_punctuation():
+    assert DiscussionRoom.is_termination_message(message(ASSISTANT, "The answer is 4. TERMINATE."))
+    assert DiscussionRoom.is_termination_message(message(ASSISTANT, "The answer is 4.\n**TERMINATE**\n"))
+    assert not DiscussionRoom.is_termination_message(message(ASSISTANT, "TERMINATE once the answer is verified"))
+    assert not DiscussionRoom.is_termination_message(message(ASSISTANT, None))
+
+
+def test_unchanged_assistant_answer_converges():
+    detector = ConvergenceDetector(similarity_threshold=0.9)
+    answer = "The sum of the numbers from 0 to 9 is 45, computed by the script of the Engineer."
+    messages = [message(ASSISTANT, answer), message(SUPERVISOR, "The plan is to sum the numbers with a script.")]
+    assert not detector.update(messages)
+    messages.append(message(ASSISTANT, answer + " "))
+    assert detector.update(messages)
+    assert detector.reason == f"{ASSISTANT} answer unchanged across cycles"
+
+
+def test_repeated_continue_converges_once_answered_and_new_discussions_reset():
+    detector = ConvergenceDetector(similarity_threshold=0.9)
+    approvals = [message(CRITIC, "CONTINUE"), message(ENGINEER, "Approved, go ahead."), message(SUPERVISOR, "CONTINUE")]
+    assert not detector.update(approvals)
+    messages = approvals + [message(ASSISTANT, "The sum of the numbers from 0 to 9 is 45.")] + approvals[:2]
+    assert not detector.update(messages)
+    messages.append(approvals[2])
+    assert detector.update(messages)
+    assert not detector.update(messages[:1])
+
+
+def test_no_code_replies_are_not_stable_outputs():
+    detector = ConvergenceDetector(similarity_threshold=0.9)
+    messages = [message(SUPERVISOR, "The answer does not need code."), message(ENGINEER, "NO CODE PROVIDED"),
+                message(EXECUTOR, NO_CODE_EXECUTED), message(ASSISTANT, "Roundtable is written by ZappaBoy."),
+                message(SUPERVISOR, "Revise the answer to list both authors."), message(ENGINEER, "NO CODE PROVIDED"),
+                message(EXECUTOR, NO_CODE_EXECUTED + ".")]
+    assert not detector.update(messages)
+    messages.append(message(ASSISTANT, "Roundtable is written by ZappaBoy and Luca Fulgenzi."))
+    assert not detector.update(messages)
+
+
+def test_stable_executor_output_converges_only_once_answered():
+    detector = ConvergenceDetector(similarity_threshold=0.9)
+    code = "```python\nprint(1 / 0)\n```"
+    output = "exitcode: 1 (execution failed)\nCode output: Traceback\nZeroDivisionError: division by zero"
+    cached_output = f"exitcode: 1 (execution failed)\nCode output: {CACHED_RESULT_MARKER}Traceback\n" \
+                    "ZeroDivisionError: division by zero"
+    messages = [message(ADMIN, "Divide 1 by 0"), message(ENGINEER, code), message(EXECUTOR, output),
+                message(ENGINEER, code), message(EXECUTOR, output)]
+    assert not detector.update(messages)
+    messages += [message(ASSISTANT, "The division fails since 1 cannot be divided by 0 in Python."),
+                 message(ENGINEER, f"Running the script again to confirm the error:\n{code}"),
+                 message(EXECUTOR, cached_output)]
+    assert detector.update(messages)
+    assert detector.reason == f"{EXECUTOR} output stable across cycles"
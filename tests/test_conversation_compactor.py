@@ -0,0 +1,59 @@
+from benchmarks.benchmark_runner import BenchmarkRunner
+from benchmarks.stub_server import StubOpenAIServer
+from roundtable.services.discussion_room.conversation_compactor import ConversationCompactor, SUMMARY_HEADER
+from roundtable.services.discussion_room.discussion_room import DiscussionRoom
+from roundtable.services.discussion_room.roles import ADMIN, ASSISTANT, CRITIC, ENGINEER, EXECUTOR, SUPERVISOR, \
+    TERMINATE
+from roundtable.shared.utils.configurator import Configurator
+
+
+def build_messages(turns: int) -> list[dict]:
+    messages = [{"role": "user", "name": ADMIN, "content": "Solve the problem"}]
+    for turn in range(turns):
+        messages.append({"role": "user", "name": EXECUTOR, "content": f"Turn {turn}. " + "output " * 1000})
+    return messages
+
+
+def test_prompt_size_is_bounded():
+    compactor = ConversationCompactor(EXECUTOR, keep_turns=2, max_message_tokens=100, summary_max_tokens=200)
+    sizes = []
+    for turns in range(1, 40):
+        compacted_messages = compactor.compact(build_messages(turns))
+        assert compacted_messages[0]["content"] == "Solve the problem"
+        assert compacted_messages[-1]["content"].startswith(f"Turn {turns - 1}.")
+        sizes.append(compactor.count_tokens(compacted_messages))
+    assert compacted_messages[1]["content"].startswith(SUMMARY_HEADER)
+    assert "earlier turns omitted" in compacted_messages[1]["content"]
+    assert max(sizes) <= 1 + 200 + 2 * 110
+
+
+def test_engineer_code_is_not_truncated_and_reset_clears_the_summary():
+    compactor = ConversationCompactor(ENGINEER, keep_turns=1, max_message_tokens=10, summary_max_tokens=100)
+    code = "```python\n" + "print(1)\n" * 100 + "```"
+    compacted_messages = compactor.compact(build_messages(5) + [{"role": "user", "name": ENGINEER, "content": code}])
+    assert compacted_messages[-1]["content"] == code
+    compactor.reset()
+    assert SUMMARY_HEADER not in compactor.compact(build_messages(1))[1]["content"]
+
+
+def test_each_discussion_of_a_room_is_summarized_on_its_own(tmp_path):
+    with StubOpenAIServer() as server:
+        config = Configurator.instance().get_discussion_room_config().copy(update={
+            "base_url": server.base_url, "use_human_input": False, "use_code_execution": False,
+            "use_llm_cache": False, "use_model_scheduling": False, "use_transcript_log": False,
+            "export_metrics": False, "use_offline_retrieval": True, "use_convergence_detection": False,
+            "speaker_selection_method": "round_robin", "compaction_keep_turns": 1,
+            "retrieval_index_path": str(tmp_path / "index"), "retrieval_docs_mirror_path": str(tmp_path / "docs"),
+        })
+        discussion_room = DiscussionRoom(config=config, document_index=BenchmarkRunner.get_document_index(config))
+        for discussion in ["first", "second"]:
+            server.set_script({role: [f"{role} reply of the {discussion} discussion."]
+                               for role in [SUPERVISOR, CRITIC, ENGINEER, EXECUTOR]})
+            server.script[ASSISTANT] = [f"The {discussion} discussion is solved. {TERMINATE}"]
+            discussion_room.discuss(f"Solve the {discussion} problem")
+
+    # The Assistant sees as many messages in both discussions, the summary of the first one is not reused.
+    compactor = next(compactor for compactor in discussion_room.conversation_compactors
+                     if compactor.agent_name == ASSISTANT)
+    assert len(compactor.summary_lines) == 3
+    assert all("second discussion" in line for line in compactor.summary_lines)
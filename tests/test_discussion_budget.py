@@ -0,0 +1,58 @@
+from autogen import ConversableAgent, GroupChat
+
+from roundtable.services.discussion_room.discussion_budget import DiscussionBudget
+from roundtable.services.discussion_room.roles import ASSISTANT, CRITIC, ENGINEER, TERMINATE
+from tests.conftest import build_group_chat_manager, build_scripted_agent
+
+
+def build_agent(name: str, reply: str, budget: DiscussionBudget, prompt_tokens: int = 0,
+                check: bool = False) -> ConversableAgent:
+    def reply_function(messages: list[dict]) -> str:
+        # Stands for the model calls of the agent, the second one is refused once the first spent the budget.
+        budget.record_tokens(prompt_tokens, 0)
+        if check:
+            budget.check()
+        return reply if not messages[-1]["content"].startswith("The discussion has to end") else "Best effort."
+
+    return build_scripted_agent(name, reply_function)
+
+
+def run_discussion(budget: DiscussionBudget, check: bool) -> GroupChat:
+    engineer = build_agent(ENGINEER, "print(1)", budget, prompt_tokens=20)
+    critic = build_agent(CRITIC, "Print 2 instead.", budget, prompt_tokens=20, check=check)
+    assistant = build_agent(ASSISTANT, f"The answer is 1. {TERMINATE}", budget)
+    manager = build_group_chat_manager([engineer, critic, assistant])
+    manager.set_discussion_budget(budget, ASSISTANT)
+    engineer.initiate_chat(manager, message="Print 1")
+    return manager.groupchat
+
+
+def test_assistant_gives_the_final_answer_once_the_budget_is_exhausted():
+    budget = DiscussionBudget(prompt_token_budget=15)
+
+    group_chat = run_discussion(budget, check=False)
+
+    assert [message["name"] for message in group_chat.messages] == [ENGINEER, CRITIC, ASSISTANT]
+    assert group_chat.messages[-1]["content"] == "Best effort."
+    assert budget.get_usage().exhausted_reason == "20 of 15 prompt tokens used"
+
+
+def test_refused_calls_hand_the_final_turn_to_the_assistant():
+    budget = DiscussionBudget(prompt_token_budget=10)
+
+    group_chat = run_discussion(budget, check=True)
+
+    assert [message["name"] for message in group_chat.messages] == [ENGINEER, ASSISTANT]
+    assert group_chat.messages[-1]["content"] == "Best effort."
+
+
+def test_calls_are_limited_by_the_remaining_budget():
+    budget = DiscussionBudget(deadline=60, completion_token_budget=100, final_turn_max_tokens=500)
+    budget.record_tokens(0, 70)
+
+    params = budget.limit_params({"model": "mistral", "max_tokens": 50})
+
+    assert params["max_tokens"] == 30
+    assert 59 < params["timeout"] <= 60
+    budget.start_final_turn()
+    assert budget.limit_params({"model": "mistral"}) == {"model": "mistral", "max_tokens": 500}
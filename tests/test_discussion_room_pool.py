@@ -0,0 +1,39 @@
+import pytest
+
+from roundtable.services.discussion_room.discussion_room_pool import DiscussionRoomPool
+from roundtable.shared.exceptions.room_pool_exhausted_exception import RoomPoolExhaustedException
+
+
+def test_room_is_reused_for_the_same_session():
+    pool = DiscussionRoomPool(max_rooms=2, idle_timeout=60)
+    with pool.use("session") as first_room:
+        pass
+    with pool.use("session") as second_room:
+        pass
+    assert first_room is second_room
+    assert len(pool) == 1
+
+
+def test_least_recently_used_room_is_evicted_when_full():
+    pool = DiscussionRoomPool(max_rooms=2, idle_timeout=60)
+    for session_id in ["first", "second", "first", "third"]:
+        with pool.use(session_id):
+            pass
+    assert "second" not in pool
+    assert "first" in pool and "third" in pool
+
+
+def test_idle_rooms_are_evicted():
+    pool = DiscussionRoomPool(max_rooms=2, idle_timeout=0)
+    with pool.use("idle"):
+        pass
+    with pool.use("active"):
+        assert "idle" not in pool
+
+
+def test_busy_rooms_are_never_evicted():
+    pool = DiscussionRoomPool(max_rooms=1, idle_timeout=0)
+    with pool.use("busy"):
+        with pytest.raises(RoomPoolExhaustedException):
+            with pool.use("other"):
+                pass
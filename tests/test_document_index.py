@@ -0,0 +1,72 @@
+from benchmarks.hash_embedding_function import HashEmbeddingFunction
+from roundtable.services.retrieval.context_builder import count_context_tokens
+from roundtable.services.retrieval.document_index import DocumentIndex
+from roundtable.shared.utils.configurator import Configurator
+
+REMOTE_DOCUMENT = "https://example.com/docs/README.md"
+
+
+def build_document_index(tmp_path, chunk_token_size: int = 100) -> DocumentIndex:
+    config = Configurator.instance().get_discussion_room_config().copy(update={
+        "retrieval_index_path": str(tmp_path / "index"),
+        "retrieval_docs_mirror_path": str(tmp_path / "mirror"),
+        "retrieval_chunk_token_size": chunk_token_size,
+    })
+    return DocumentIndex(config, remote_documents=[REMOTE_DOCUMENT], local_documents=[str(tmp_path / "docs")],
+                         embedding_function=HashEmbeddingFunction(), token_count_function=count_context_tokens)
+
+
+def get_indexed_sources(document_index: DocumentIndex) -> list[str]:
+    documents = document_index.get_vector_db().active_collection.get(include=["metadatas"])
+    return sorted({metadata["source"] for metadata in documents["metadatas"]})
+
+
+def test_only_changed_documents_are_embedded_again(tmp_path):
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "install.md").write_text("Install roundtable with poetry install.")
+    (tmp_path / "docs" / "usage.md").write_text("Run roundtable with python -m roundtable.")
+    (tmp_path / "docs" / "license.md").write_text("Released under the MIT license.")
+    document_index = build_document_index(tmp_path)
+
+    report = document_index.refresh(offline=True)
+    assert report.rebuilt and len(report.added) == 3 and document_index.is_built()
+
+    (tmp_path / "docs" / "usage.md").write_text("Run roundtable with the roundtable command.")
+    (tmp_path / "docs" / "license.md").unlink()
+    (tmp_path / "docs" / "batch.md").write_text("Run many problems with roundtable --batch.")
+    report = build_document_index(tmp_path).refresh(offline=True)
+
+    assert not report.rebuilt
+    assert [source.rsplit("/", 1)[-1] for source in report.added + report.updated + report.removed +
+            report.unchanged] == ["batch.md", "usage.md", "license.md", "install.md"]
+    assert report.embedded_chunks == 2
+    assert [source.rsplit("/", 1)[-1] for source in get_indexed_sources(document_index)] == [
+        "batch.md", "install.md", "usage.md"]
+
+
+def test_chunking_changes_rebuild_the_index(tmp_path):
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "guide.md").write_text("\n".join(f"Step {index} of the guide." for index in range(20)))
+    document_index = build_document_index(tmp_path)
+    document_index.refresh(offline=True)
+
+    resized_document_index = build_document_index(tmp_path, chunk_token_size=10)
+    assert not resized_document_index.is_built()
+    report = resized_document_index.refresh(offline=True)
+
+    assert report.rebuilt and report.embedded_chunks > 1
+    documents = resized_document_index.get_vector_db().active_collection.get()
+    assert len(documents["ids"]) == report.embedded_chunks
+
+
+def test_offline_refresh_uses_the_local_mirror(tmp_path):
+    document_index = build_document_index(tmp_path)
+    assert document_index.refresh(offline=True).added == []
+
+    mirror_file_path = document_index.get_mirror_file_path(REMOTE_DOCUMENT)
+    with open(mirror_file_path, "w", encoding="utf-8") as mirror_file:
+        mirror_file.write("Roundtable simulates a discussion between agents.")
+    report = build_document_index(tmp_path).refresh(offline=True)
+
+    assert report.added == [REMOTE_DOCUMENT]
+    assert get_indexed_sources(document_index) == [REMOTE_DOCUMENT]
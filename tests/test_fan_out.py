@@ -0,0 +1,31 @@
+import threading
+
+from autogen import ConversableAgent
+
+from roundtable.services.discussion_room.roles import ASSISTANT, CRITIC, ENGINEER, TERMINATE
+from tests.conftest import build_group_chat_manager, build_scripted_agent
+
+
+def build_agent(name: str, reply: str, barrier: threading.Barrier = None) -> ConversableAgent:
+    def reply_function(messages: list[dict]) -> str:
+        if barrier is not None:
+            # Both reviewers must be running at the same time to pass the barrier.
+            barrier.wait(timeout=5)
+        return reply
+
+    return build_scripted_agent(name, reply_function)
+
+
+def test_fan_out_agents_reply_concurrently_in_deterministic_order():
+    barrier = threading.Barrier(2)
+    engineer = build_agent(ENGINEER, "print(1)")
+    critic = build_agent(CRITIC, "The code is fine.", barrier)
+    assistant = build_agent(ASSISTANT, f"The answer is 1. {TERMINATE}", barrier)
+    manager = build_group_chat_manager([engineer, critic, assistant])
+    manager.set_fan_out([CRITIC, ASSISTANT], [ENGINEER])
+
+    engineer.initiate_chat(manager, message="Print 1")
+
+    group_chat = manager.groupchat
+    assert [message["name"] for message in group_chat.messages] == [ENGINEER, CRITIC, ASSISTANT]
+    assert group_chat.messages[-1]["content"].endswith(TERMINATE)
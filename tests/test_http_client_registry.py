@@ -0,0 +1,23 @@
+from benchmarks.stub_server import StubOpenAIServer
+from roundtable.services.llm.http_client_registry import get_http_pool_stats, get_shared_http_client
+from roundtable.services.llm.model_client import RoundtableModelClient
+
+
+def test_model_clients_share_the_connection_pool_of_their_endpoint():
+    with StubOpenAIServer() as server:
+        shared_http_client = get_shared_http_client(server.base_url, "stub", max_connections=2, timeout=5,
+                                                    connect_timeout=1)
+        assert get_shared_http_client(server.base_url, "stub", max_connections=4, timeout=5,
+                                      connect_timeout=1) is shared_http_client
+        assert get_shared_http_client(server.base_url, "other", max_connections=2, timeout=5,
+                                      connect_timeout=1) is not shared_http_client
+
+        config = {"model": "stub", "base_url": server.base_url, "api_key": "stub"}
+        for agent_name in ["Supervisor", "Critic", "Engineer"]:
+            model_client = RoundtableModelClient(config, agent_name=agent_name, shared_http_client=shared_http_client)
+            model_client.create({"model": "stub", "messages": [{"role": "user", "content": "Hello"}]})
+
+        stats = shared_http_client.get_stats()
+        assert (stats.requests, stats.requests_in_flight, stats.peak_requests_in_flight) == (3, 0, 1)
+        assert stats.open_connections == 1 and stats.idle_connections == 1
+        assert stats in get_http_pool_stats()
@@ -0,0 +1,47 @@
+import io
+import json
+import logging
+from logging.handlers import QueueListener
+
+from roundtable.shared.utils.logger import JSON_FORMAT, Logger, build_queue_handler, log_context
+
+
+class CountingArgument:
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "argument"
+
+
+def build_logger(stream: io.StringIO) -> tuple[Logger, QueueListener]:
+    queue_handler, listener = build_queue_handler(stream, JSON_FORMAT)
+    test_logger = logging.getLogger("roundtable-test")
+    test_logger.propagate = False
+    test_logger.setLevel(logging.INFO)
+    test_logger.handlers = [queue_handler]
+    logger = Logger()
+    logger.logger = test_logger
+    return logger, listener
+
+
+def test_records_are_formatted_lazily_and_carry_the_context():
+    stream = io.StringIO()
+    logger, listener = build_logger(stream)
+    argument = CountingArgument()
+    listener.start()
+    try:
+        logger.debug("Disabled %s", argument)
+        with log_context(session="session", round=3):
+            with log_context(agent="Critic"):
+                logger.info("Enabled %s", argument)
+            logger.warning("Outside of the agent")
+    finally:
+        listener.stop()
+
+    assert argument.formatted == 1
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [record["message"] for record in records] == ["Enabled argument", "Outside of the agent"]
+    assert records[0]["session"] == "session" and records[0]["round"] == 3 and records[0]["agent"] == "Critic"
+    assert "agent" not in records[1]
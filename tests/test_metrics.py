@@ -0,0 +1,32 @@
+from roundtable.services.metrics.metrics_exporter import MetricsExporter
+from roundtable.services.metrics.metrics_recorder import MetricsRecorder
+
+
+def test_turns_are_aggregated_per_agent_and_exported(tmp_path):
+    recorder = MetricsRecorder()
+    recorder.reset("discussion-1")
+    recorder.record_retrieval("Admin", 0.5)
+    recorder.end_turn("Admin")
+    for _ in range(2):
+        recorder.record_llm_call("Engineer", "codellama:latest", recorder.turn_started_at, 1.0, 100, 20)
+        recorder.end_turn("Engineer")
+    recorder.record_llm_call("Critic", "mistral:latest", recorder.turn_started_at, 0.0, 50, 5, cached=True)
+    recorder.end_turn("Critic")
+
+    metrics = recorder.get_metrics()
+    assert [turn.agent_name for turn in metrics.turns] == ["Admin", "Engineer", "Engineer", "Critic"]
+    assert metrics.retrieval_time == 0.5
+    engineer = next(agent for agent in metrics.agents if agent.agent_name == "Engineer")
+    assert (engineer.turns, engineer.llm_calls, engineer.prompt_tokens, engineer.completion_tokens) == (2, 2, 200, 40)
+    assert engineer.llm_time == 2.0
+
+    prometheus = MetricsExporter.to_prometheus(metrics)
+    assert '# TYPE roundtable_agent_prompt_tokens_total counter' in prometheus
+    assert 'roundtable_agent_prompt_tokens_total{discussion="discussion-1",agent="Engineer",' \
+           'model="codellama:latest"} 200' in prometheus
+    assert 'roundtable_agent_cached_llm_calls_total{discussion="discussion-1",agent="Critic",' \
+           'model="mistral:latest"} 1' in prometheus
+
+    json_path, prometheus_path = MetricsExporter.export(metrics, str(tmp_path))
+    assert open(json_path).read() == MetricsExporter.to_json(metrics)
+    assert open(prometheus_path).read() == prometheus
@@ -0,0 +1,79 @@
+import threading
+import time
+
+import pytest
+
+from benchmarks.stub_server import StubOpenAIServer
+from roundtable.services.llm.http_client_registry import SharedHttpClient
+from roundtable.services.llm.model_scheduler import ModelScheduler
+from roundtable.shared.exceptions.discussion_budget_exhausted_exception import DiscussionBudgetExhaustedException
+
+
+def wait_until(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_calls_are_grouped_by_model():
+    scheduler = ModelScheduler("http://localhost:11434/v1", max_loaded_models=1)
+    calls = []
+    loads = []
+    release = threading.Event()
+    lock = threading.Lock()
+
+    def call(model: str, wait: bool = False):
+        with scheduler.schedule(model) as model_load:
+            with lock:
+                calls.append(model)
+                if model_load is not None:
+                    loads.append(model_load)
+            if wait:
+                release.wait(5)
+
+    first_call = threading.Thread(target=call, args=("mistral", True))
+    first_call.start()
+    wait_until(lambda: calls == ["mistral"])
+    threads = [threading.Thread(target=call, args=("codellama",)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    wait_until(lambda: scheduler.get_pending_calls() == {"codellama": 2})
+    # The resident model is evicted next, its new calls wait for the calls to the other model.
+    threads.append(threading.Thread(target=call, args=("mistral",)))
+    threads[-1].start()
+    wait_until(lambda: scheduler.get_pending_calls() == {"codellama": 2, "mistral": 1})
+    release.set()
+    for thread in [first_call] + threads:
+        thread.join(5)
+
+    assert calls == ["mistral", "codellama", "codellama", "mistral"]
+    assert [(load.model, load.evicted_model) for load in loads] == [
+        ("mistral", None), ("codellama", "mistral"), ("mistral", "codellama")]
+
+
+def test_warm_up_loads_the_first_models():
+    with StubOpenAIServer() as server:
+        shared_http_client = SharedHttpClient(server.base_url, max_connections=2, timeout=5, connect_timeout=5)
+        scheduler = ModelScheduler(server.base_url, shared_http_client.http_client, max_loaded_models=1)
+        scheduler.warm_up(["mistral", "mistral", "codellama"])
+        scheduler.warm_up(["mistral", "codellama"])
+        shared_http_client.close()
+
+    assert server.loads == 1
+    assert scheduler.get_resident_models() == ["mistral"]
+
+
+def test_calls_stop_waiting_at_the_deadline():
+    scheduler = ModelScheduler("http://localhost:11434/v1", max_loaded_models=1)
+
+    with scheduler.schedule("mistral"):
+        started_at = time.monotonic()
+        with pytest.raises(DiscussionBudgetExhaustedException):
+            with scheduler.schedule("codellama", timeout=0.2):
+                pass
+
+    assert 0.2 <= time.monotonic() - started_at < 2
+    assert scheduler.get_pending_calls() == {}
+    with scheduler.schedule("codellama") as model_load:
+        assert model_load.evicted_model == "mistral"
@@ -0,0 +1,41 @@
+from openai.types.chat import ChatCompletion
+
+from roundtable.services.llm.response_cache import ResponseCache
+
+BASE_URL = "http://localhost:11434/v1"
+PARAMS = {"model": "mistral:latest", "messages": [{"role": "user", "content": "Hello"}], "temperature": 0}
+
+
+def build_response(content: str) -> ChatCompletion:
+    return ChatCompletion(id="response", model="mistral:latest", created=0, object="chat.completion",
+                          choices=[{"index": 0, "finish_reason": "stop",
+                                    "message": {"role": "assistant", "content": content}}],
+                          usage={"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2})
+
+
+def test_key_depends_on_endpoint_and_sampling_params():
+    key = ResponseCache.get_key(BASE_URL, PARAMS)
+    assert key == ResponseCache.get_key(BASE_URL, {**PARAMS, "stream": True})
+    assert key != ResponseCache.get_key("http://other:11434/v1", PARAMS)
+    assert key != ResponseCache.get_key(BASE_URL, {**PARAMS, "temperature": 0.7})
+
+
+def test_hits_and_misses_are_counted(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), max_entries=4)
+    key = ResponseCache.get_key(BASE_URL, PARAMS)
+    assert cache.get(key) is None
+    cache.set(key, build_response("Hi"))
+    assert cache.get(key).choices[0].message.content == "Hi"
+    assert (cache.stats.misses, cache.stats.memory_hits, cache.stats.writes) == (1, 1, 1)
+
+
+def test_evicted_entries_are_served_from_disk(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), max_entries=1)
+    cache.set("first", build_response("First"))
+    cache.set("second", build_response("Second"))
+    assert cache.get("first").choices[0].message.content == "First"
+    assert cache.stats.disk_hits == 1
+    cache.close()
+
+    reopened_cache = ResponseCache(str(tmp_path / "cache.sqlite"), max_entries=1)
+    assert reopened_cache.get("second").choices[0].message.content == "Second"
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import threading
+
+from tornado.httpclient import AsyncHTTPClient
+from tornado.httpserver import HTTPServer
+from tornado.testing import bind_unused_port
+from tornado.websocket import websocket_connect
+
+from roundtable.models.discussion_result import DiscussionResult
+from roundtable.server.server import Server
+from roundtable.server.session import DISCONNECTED_EVENT, MAX_QUEUED_EVENTS, MAX_STORED_EVENTS, MESSAGE_EVENT, \
+    TOKEN_EVENT, Session
+from roundtable.server.session_manager import SessionManager
+from roundtable.services.discussion_room.roles import ADMIN, ASSISTANT
+
+
+class ScriptedSessionManager(SessionManager):
+    def __init__(self):
+        super().__init__(workers=1, max_queued=1, max_rooms=2, idle_timeout=60)
+        self.release = threading.Event()
+
+    def run_discussion(self, session: Session, message: str) -> DiscussionResult:
+        session.on_message(ADMIN, message)
+        self.release.wait(timeout=5)
+        session.on_message(ASSISTANT, f"Answer to {message}")
+        return DiscussionResult(id="discussion", problem=message, completed=True, answer=f"Answer to {message}")
+
+
+async def discuss_concurrently():
+    session_manager = ScriptedSessionManager()
+    sock, port = bind_unused_port()
+    http_server = HTTPServer(Server("127.0.0.1", port, session_manager).get_application())
+    http_server.add_sockets([sock])
+    base_url = f"http://127.0.0.1:{port}"
+    client = AsyncHTTPClient()
+
+    async def post(path: str, body: dict = None):
+        return await client.fetch(base_url + path, method="POST", body=json.dumps(body or {}), raise_error=False)
+
+    try:
+        session_ids = [json.loads((await post("/sessions")).body)["session_id"] for _ in range(3)]
+        connection = await websocket_connect(f"ws://127.0.0.1:{port}/sessions/{session_ids[0]}/events")
+        statuses = [(await post(f"/sessions/{session_ids[0]}/messages", {"message": "First"})).code,
+                    (await post(f"/sessions/{session_ids[0]}/messages", {"message": "Again"})).code,
+                    (await post(f"/sessions/{session_ids[1]}/messages", {"message": "Second"})).code]
+        saturated_response = await post(f"/sessions/{session_ids[2]}/messages", {"message": "Third"})
+        session_manager.release.set()
+        events = []
+        while not events or events[-1]["type"] != "finished":
+            events.append(json.loads(await asyncio.wait_for(connection.read_message(), timeout=5)))
+        connection.close()
+        return statuses, saturated_response, events
+    finally:
+        http_server.stop()
+        session_manager.close()
+
+
+def test_discussions_are_streamed_queued_and_rejected_when_saturated():
+    statuses, saturated_response, events = asyncio.run(discuss_concurrently())
+
+    assert statuses == [202, 409, 202]
+    assert saturated_response.code == 503
+    assert saturated_response.headers["Retry-After"]
+    assert [event["type"] for event in events] == ["queued", "started", "message", "message", "finished"]
+    assert [event["sender"] for event in events if event["type"] == "message"] == [ADMIN, ASSISTANT]
+    assert events[-1]["answer"] == "Answer to First"
+
+
+def test_slow_subscribers_are_disconnected_and_the_history_is_capped():
+    loop = asyncio.new_event_loop()
+    try:
+        session = Session(loop)
+        slow_subscriber = session.subscribe()
+        for i in range(MAX_QUEUED_EVENTS):
+            session.publish({"type": TOKEN_EVENT, "sender": ASSISTANT, "content": str(i)})
+        assert slow_subscriber in session.subscribers
+        session.publish({"type": MESSAGE_EVENT, "sender": ASSISTANT, "content": "Answer"})
+        assert slow_subscriber not in session.subscribers
+        assert slow_subscriber.qsize() == 1
+        assert slow_subscriber.get_nowait()["type"] == DISCONNECTED_EVENT
+
+        for i in range(MAX_STORED_EVENTS):
+            session.publish({"type": MESSAGE_EVENT, "sender": ADMIN, "content": str(i)})
+        assert len(session.events) == MAX_STORED_EVENTS
+        assert session.to_dict()["events"][-1]["content"] == str(MAX_STORED_EVENTS - 1)
+        assert session.subscribe().qsize() == MAX_STORED_EVENTS
+    finally:
+        loop.close()
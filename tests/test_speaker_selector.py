@@ -0,0 +1,53 @@
+from autogen import ConversableAgent, GroupChat
+
+from roundtable.services.discussion_room.roles import ADMIN, ASSISTANT, CRITIC, ENGINEER, EXECUTOR, NO_CODE_PROVIDED, \
+    SUPERVISOR
+from roundtable.services.discussion_room.speaker_selector import AdaptiveSpeakerSelector
+
+AGENT_NAMES = [ADMIN, SUPERVISOR, CRITIC, ENGINEER, EXECUTOR, ASSISTANT]
+
+
+def build_group_chat() -> GroupChat:
+    agents = [ConversableAgent(name, llm_config=False, human_input_mode="NEVER") for name in AGENT_NAMES]
+    return GroupChat(agents=agents, messages=[], max_round=20)
+
+
+def select(selector: AdaptiveSpeakerSelector, group_chat: GroupChat, speaker_name: str, content: str) -> str:
+    group_chat.append({"role": "user", "content": content, "name": speaker_name},
+                      group_chat.agent_by_name(speaker_name))
+    return selector(group_chat.agent_by_name(speaker_name), group_chat).name
+
+
+def test_dead_turns_are_skipped_and_counted():
+    selector = AdaptiveSpeakerSelector()
+    group_chat = build_group_chat()
+    assert select(selector, group_chat, ENGINEER, NO_CODE_PROVIDED) == ASSISTANT
+    assert selector.skipped_turns == 1
+    assert select(selector, group_chat, ADMIN, "The plan is approved") == ENGINEER
+    assert select(selector, group_chat, ENGINEER, "```python\nprint(1)\n```") == EXECUTOR
+    assert select(selector, group_chat, EXECUTOR, "exitcode: 1 (execution failed)\nCode output: error") == ENGINEER
+    assert select(selector, group_chat, CRITIC, "The plan misses the source URLs, please add them.") == ENGINEER
+    assert selector.turns == 5
+    assert selector.skipped_turns == 1 + 2 + 0 + 0 + 0
+    assert selector.added_turns == 1
+    assert selector.get_turns_saved() == 2
+
+
+def test_critic_reviews_the_executed_code():
+    selector = AdaptiveSpeakerSelector()
+    group_chat = build_group_chat()
+    assert select(selector, group_chat, EXECUTOR, "exitcode: 0 (execution succeeded)\nCode output: 1") == CRITIC
+    assert select(selector, group_chat, CRITIC, "The output ignores the second source, please fix it.") == ENGINEER
+    assert select(selector, group_chat, ENGINEER, "```python\nprint(2)\n```") == EXECUTOR
+    assert select(selector, group_chat, EXECUTOR, "exitcode: 0 (execution succeeded)\nCode output: 2") == CRITIC
+    assert select(selector, group_chat, CRITIC, "Approved, the output is correct.") == ASSISTANT
+    assert selector.skipped_turns == 2
+    assert selector.added_turns == 2
+    assert selector.get_turns_saved() == 0
+
+
+def test_termination_and_rejection():
+    selector = AdaptiveSpeakerSelector()
+    group_chat = build_group_chat()
+    assert select(selector, group_chat, SUPERVISOR, "The task is solved. TERMINATE\nAnything else?") == ASSISTANT
+    assert select(selector, group_chat, ADMIN, "I do not approve, revise the plan") == SUPERVISOR
@@ -0,0 +1,72 @@
+import os
+import sys
+
+from autogen import ConversableAgent, OpenAIWrapper
+
+from benchmarks.stub_server import StubOpenAIServer
+from roundtable.models.code_candidate_metrics import CANCELLED, FAILED, PASSED, CodeCandidateMetrics
+from roundtable.services.discussion_room.roles import ENGINEER
+from roundtable.services.discussion_room.speculative_coder import SpeculativeCoder
+from roundtable.services.execution.warm_code_executor import WarmCodeExecutor
+from roundtable.services.execution.warm_executor_pool import WarmExecutorPool
+from roundtable.services.metrics.metrics_recorder import MetricsRecorder
+
+SLOW_CODE = "```python\nimport time\ntime.sleep(10)\nprint('slow')\n```"
+FAILING_CODE = "```python\nraise ValueError('boom')\n```"
+PASSING_CODE = "```python\nimport time\ntime.sleep(0.5)\nprint('ok')\n```"
+
+
+def build_executor_pool(tmp_path) -> WarmExecutorPool:
+    os.makedirs(tmp_path / "env" / "bin")
+    os.symlink(sys.executable, tmp_path / "env" / "bin" / "python")
+    return WarmExecutorPool(str(tmp_path / "env"), str(tmp_path / "workspaces"), size=3, timeout=20,
+                            memory_limit_mb=0, max_runs_per_worker=10, preload_modules=[])
+
+
+def test_first_passing_candidate_is_kept_and_the_others_cancelled(tmp_path):
+    executor_pool = build_executor_pool(tmp_path)
+    metrics_recorder = MetricsRecorder()
+    try:
+        with StubOpenAIServer() as server:
+            # Candidates are generated concurrently, each one gets one of the replies.
+            server.set_script({ENGINEER: [SLOW_CODE, FAILING_CODE, PASSING_CODE]})
+            candidates = [CodeCandidateMetrics(index=index, model="codellama", temperature=temperature)
+                          for index, temperature in enumerate([0.2, 0.7, 1.0])]
+            clients = [OpenAIWrapper(config_list=[{"base_url": server.base_url, "api_key": "public_access",
+                                                   "model": candidate.model, "temperature": candidate.temperature}],
+                                     cache_seed=None) for candidate in candidates]
+            coder = SpeculativeCoder(clients, candidates, WarmCodeExecutor(executor_pool), metrics_recorder)
+
+            reply = coder.generate([{"role": "system", "content": f"{ENGINEER}. Write code."},
+                                    {"role": "user", "content": "Print ok"}])
+    finally:
+        executor_pool.close()
+
+    assert reply == PASSING_CODE
+    code_candidates = sorted(metrics_recorder.get_metrics().code_candidates, key=lambda candidate: candidate.status)
+    assert [candidate.status for candidate in code_candidates] == [CANCELLED, FAILED, PASSED]
+    assert code_candidates[0].execution_time < 5
+    assert code_candidates[2].exit_code == 0
+
+
+def test_engineer_replies_with_its_model_when_no_candidate_replies(tmp_path):
+    executor_pool = build_executor_pool(tmp_path)
+    try:
+        with StubOpenAIServer() as server:
+            server.set_script({ENGINEER: [PASSING_CODE]})
+            candidates = [CodeCandidateMetrics(index=index, model="codellama", temperature=0.2) for index in range(2)]
+            # The candidates call an endpoint that does not answer, every one of them fails.
+            clients = [OpenAIWrapper(config_list=[{"base_url": "http://127.0.0.1:9/v1", "api_key": "public_access",
+                                                   "model": candidate.model, "max_retries": 0}], cache_seed=None)
+                       for candidate in candidates]
+            coder = SpeculativeCoder(clients, candidates, WarmCodeExecutor(executor_pool))
+            engineer = ConversableAgent(ENGINEER, system_message=f"{ENGINEER}. Write code.", human_input_mode="NEVER",
+                                        llm_config={"config_list": [{"base_url": server.base_url, "model": "codellama",
+                                                                     "api_key": "public_access"}], "cache_seed": None})
+            coder.register(engineer)
+
+            reply = engineer.generate_reply([{"role": "user", "content": "Print ok"}])
+    finally:
+        executor_pool.close()
+
+    assert reply == PASSING_CODE
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold-start budget for importing the package entry point, in microseconds. The lightweight entry point currently
+# imports in a few tens of milliseconds, while pulling in autogen and its retrievechat extras takes seconds.
+STARTUP_IMPORT_BUDGET_US = 300_000
+HEAVY_MODULES = ["autogen", "chromadb", "sentence_transformers", "streamlit", "pydantic"]
+
+
+def run_with_import_time(*args: str) -> tuple[subprocess.CompletedProcess, dict[str, int]]:
+    process = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=PROJECT_ROOT,
+                             capture_output=True, text=True, timeout=60)
+    imports = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        imports[name.strip()] = int(cumulative)
+    return process, imports
+
+
+def assert_no_heavy_imports(imports: dict[str, int]):
+    loaded = [name for name in imports if name.split(".")[0] in HEAVY_MODULES]
+    assert loaded == [], f"Heavy modules imported at startup: {sorted(set(name.split('.')[0] for name in loaded))}"
+
+
+def test_package_import_time_budget():
+    process, imports = run_with_import_time("-c", "import roundtable")
+    assert process.returncode == 0, process.stderr
+    assert_no_heavy_imports(imports)
+    assert imports["roundtable"] < STARTUP_IMPORT_BUDGET_US
+
+
+def test_version_does_not_load_heavy_modules():
+    process, imports = run_with_import_time("-m", "roundtable", "--version")
+    assert process.returncode == 0, process.stderr
+    assert_no_heavy_imports(imports)
+
+
+def test_help_does_not_load_heavy_modules():
+    process, imports = run_with_import_time("-m", "roundtable", "--help")
+    assert process.returncode == 0, process.stderr
+    assert_no_heavy_imports(imports)
@@ -0,0 +1,73 @@
+import io
+
+from openai.types.chat import ChatCompletion
+
+from benchmarks.stub_server import StubOpenAIServer
+from roundtable.gui.interface import StreamlitStreamListener
+from roundtable.services.llm.model_client import RoundtableModelClient
+from roundtable.services.llm.stream_listener import ConsoleStreamListener, StreamRelay
+
+REPLY = "Here is the plan for the task"
+MESSAGES = [{"role": "system", "content": "Engineer. You write code."}, {"role": "user", "content": "Plan the task"}]
+
+
+class ChatMessage:
+    def __init__(self):
+        self.renders: list[str] = []
+        self.captions: list[str] = []
+
+    def empty(self):
+        return self
+
+    def markdown(self, content: str):
+        self.renders.append(content)
+
+    def caption(self, content: str):
+        self.captions.append(content)
+
+
+class ChatParent:
+    def __init__(self):
+        self.messages: dict[str, ChatMessage] = {}
+
+    def chat_message(self, agent_name: str) -> ChatMessage:
+        return self.messages.setdefault(agent_name, ChatMessage())
+
+
+def stream_reply(stream_listener) -> ChatCompletion:
+    with StubOpenAIServer() as server:
+        server.set_script({"Engineer": [REPLY]})
+        client = RoundtableModelClient({"model": "stub", "base_url": server.base_url, "api_key": "stub"},
+                                       agent_name="Engineer", stream_listener=stream_listener)
+        response = client.create({"model": "stub", "messages": MESSAGES})
+    return response
+
+
+def test_streamed_reply_reports_the_usage_of_the_server():
+    output = io.StringIO()
+    relay = StreamRelay(ConsoleStreamListener(output))
+    response = stream_reply(relay)
+
+    assert response.choices[0].message.content.strip() == REPLY
+    prompt_tokens = sum(len(message["content"].split()) for message in MESSAGES)
+    assert response.usage.prompt_tokens == prompt_tokens
+    assert response.usage.completion_tokens == len(REPLY.split())
+    assert response.usage.total_tokens == prompt_tokens + len(REPLY.split())
+    assert relay.stats[0].chunks == len(REPLY.split())
+    assert output.getvalue().startswith(f"\nEngineer: {REPLY}")
+    assert "[Engineer :: first token" in output.getvalue()
+    relay.reset()
+    assert relay.get_time_to_first_token() == {}
+
+
+def test_streamlit_listener_renders_the_streamed_reply():
+    listener = StreamlitStreamListener()
+    listener.parent = ChatParent()
+    stream_reply(listener)
+
+    message = listener.parent.messages["Engineer"]
+    assert message.renders[0].endswith("▌")
+    assert message.renders[-1].strip() == REPLY
+    assert message.captions[0].startswith("First token after")
+    assert listener.was_streamed("Engineer")
+    assert not listener.was_streamed("Engineer")
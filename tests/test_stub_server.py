@@ -0,0 +1,22 @@
+from openai import OpenAI
+
+from benchmarks.stub_server import DEFAULT_REPLY, StubOpenAIServer
+
+
+def test_replies_follow_the_script_of_each_role():
+    with StubOpenAIServer() as server:
+        server.set_script({"Engineer": ["first", "second"]})
+        client = OpenAI(base_url=server.base_url, api_key="stub")
+
+        def ask(system_message: str, stream: bool = False) -> str:
+            messages = [{"role": "system", "content": system_message}, {"role": "user", "content": "Go"}]
+            response = client.chat.completions.create(model="stub", messages=messages, stream=stream)
+            if stream:
+                return "".join(chunk.choices[0].delta.content or "" for chunk in response).strip()
+            return response.choices[0].message.content
+
+        assert ask("\nEngineer. You write code.") == "first"
+        assert ask("Engineer. You write code.", stream=True) == "second"
+        assert ask("Engineer. You write code.") == "second"
+        assert ask("Critic. Double check.") == DEFAULT_REPLY
+        assert server.requests == 4
@@ -0,0 +1,66 @@
+from roundtable.services.discussion_room.roles import ASSISTANT, CRITIC, ENGINEER, TERMINATE
+from roundtable.services.discussion_room.trackable_agent import CallbackGroupChatManager
+from roundtable.services.discussion_room.transcript_log import TranscriptLog
+from tests.conftest import build_group_chat_manager, build_scripted_agent
+
+
+def build_discussion(replies: dict[str, list[str]], calls: list[str],
+                     max_round: int = 10) -> CallbackGroupChatManager:
+    agents = []
+    for name, agent_replies in replies.items():
+        def reply_function(messages: list[dict], name: str = name, agent_replies: list[str] = agent_replies) -> str:
+            calls.append(name)
+            if not agent_replies:
+                raise KeyboardInterrupt
+            return agent_replies.pop(0)
+
+        agents.append(build_scripted_agent(name, reply_function))
+    return build_group_chat_manager(agents, max_round=max_round)
+
+
+def test_interrupted_discussion_is_resumed_without_replaying_replies(tmp_path):
+    calls = []
+    manager = build_discussion({ENGINEER: [], CRITIC: ["Print(1) prints 1."], ASSISTANT: []}, calls)
+    transcript_log = TranscriptLog(str(tmp_path), "discussion")
+    transcript_log.start("Print 1")
+    manager.set_transcript_log(transcript_log)
+    engineer = manager.groupchat.agent_by_name(ENGINEER)
+    try:
+        engineer.initiate_chat(manager, message="Print 1")
+    except KeyboardInterrupt:
+        pass
+    transcript_log.close()
+    with open(transcript_log.path, "a", encoding="utf-8") as log_file:
+        log_file.write('{"sender":"Assistant","mess')
+
+    calls = []
+    manager = build_discussion({ENGINEER: [], CRITIC: [], ASSISTANT: [f"The answer is 1. {TERMINATE}"]}, calls)
+    transcript_log = TranscriptLog(str(tmp_path), "discussion")
+    problem, entries, valid_size = transcript_log.load()
+    assert problem == "Print 1"
+    assert [sender for sender, _ in entries] == [ENGINEER, CRITIC]
+    transcript_log.reopen(valid_size)
+    manager.set_transcript_log(transcript_log)
+    manager.resume_chat(entries)
+    transcript_log.close()
+
+    assert calls == [ASSISTANT]
+    assert [message["name"] for message in manager.groupchat.messages] == [ENGINEER, CRITIC, ASSISTANT]
+    assistant = manager.groupchat.agent_by_name(ASSISTANT)
+    assert [message["content"] for message in assistant.chat_messages[manager]][:2] == ["Print 1", "Print(1) prints 1."]
+    assert len(transcript_log.load()[1]) == 3
+
+
+def test_resumed_discussion_runs_only_the_remaining_rounds():
+    calls = []
+    manager = build_discussion({ENGINEER: ["print(1)"] * 5, CRITIC: ["Looks fine."] * 5, ASSISTANT: ["1"] * 5}, calls,
+                               max_round=6)
+    entries = [(ENGINEER, {"content": "Print 1", "role": "user", "name": ENGINEER}),
+               (CRITIC, {"content": "Use print.", "role": "user", "name": CRITIC}),
+               (ASSISTANT, {"content": "Waiting for the code.", "role": "user", "name": ASSISTANT}),
+               (ENGINEER, {"content": "print(1)", "role": "user", "name": ENGINEER})]
+
+    manager.resume_chat(entries)
+
+    assert calls == [CRITIC, ASSISTANT]
+    assert len(manager.groupchat.messages) == 6
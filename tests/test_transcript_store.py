@@ -0,0 +1,33 @@
+from roundtable.gui.transcript_store import TranscriptStore
+from roundtable.models.transcript_section import CODE, OUTPUT, TEXT
+
+
+def build_store() -> TranscriptStore:
+    return TranscriptStore(page_size=3, max_entries=5, collapse_lines=10, max_section_chars=100)
+
+
+def test_long_code_and_outputs_are_collapsed_and_truncated():
+    store = build_store()
+    code = "\n".join(f"print({index})" for index in range(20))
+
+    engineer_entry = store.add("Engineer", f"Run this:\n```python\n{code}\n```\nIt prints the numbers.")
+    executor_entry = store.add("Executor", "exitcode: 0 (execution succeeded)\nCode output: " + "x" * 200)
+
+    assert [(section.kind, section.language, section.collapsed) for section in engineer_entry.sections] == [
+        (TEXT, "", False), (CODE, "python", True), (TEXT, "", False)]
+    assert engineer_entry.sections[1].get_preview(2) == "print(0)\nprint(1)"
+    output = executor_entry.sections[0]
+    assert (output.kind, output.collapsed, output.omitted_characters) == (OUTPUT, False, 147)
+    assert output.content.endswith("x" * 50)
+
+
+def test_pages_start_from_the_latest_messages_and_memory_is_bounded():
+    store = build_store()
+    for index in range(7):
+        store.add("Critic", f"Message {index + 1}")
+
+    assert store.dropped_entries == 2
+    assert store.get_page_count() == 2
+    assert [entry.sections[0].content for entry in store.get_page(0)] == ["Message 5", "Message 6", "Message 7"]
+    assert [entry.sections[0].content for entry in store.get_page(1)] == ["Message 3", "Message 4"]
+    assert store.get_page_label(1) == "Messages 3-4"
@@ -0,0 +1,128 @@
+import os
+import sys
+import time
+
+from autogen.coding.base import CodeBlock
+
+from roundtable.services.execution.execution_cache import CACHED_RESULT_MARKER, ExecutionCache
+from roundtable.services.execution.warm_code_executor import WarmCodeExecutor
+from roundtable.services.execution.warm_executor_pool import TIMEOUT_EXIT_CODE, WORKER_FAILED_MSG, \
+    WarmExecutorPool
+
+
+def build_executor_pool(tmp_path, timeout: float = 5, max_runs_per_worker: int = 10) -> WarmExecutorPool:
+    # The interpreter running the tests is used as execution environment, the virtual environment is not created.
+    os.makedirs(tmp_path / "env" / "bin")
+    os.symlink(sys.executable, tmp_path / "env" / "bin" / "python")
+    return WarmExecutorPool(str(tmp_path / "env"), str(tmp_path / "workspaces"), size=1, timeout=timeout,
+                            memory_limit_mb=0, max_runs_per_worker=max_runs_per_worker,
+                            preload_modules=[])
+
+
+def test_code_blocks_of_a_discussion_share_a_workspace(tmp_path):
+    executor_pool = build_executor_pool(tmp_path)
+    executor = WarmCodeExecutor(executor_pool)
+    try:
+        code = "import os\nprint(os.listdir('.'))\nopen('result.txt', 'w').write('45')\nos.system('echo child')"
+        result = executor.execute_code_blocks([CodeBlock(code=code, language="python")])
+        assert (result.exit_code, result.output) == (0, "[]\nchild\n")
+        result = executor.execute_code_blocks([CodeBlock(code="echo 42 > data.txt", language="sh"),
+                                               CodeBlock(code="print(open('data.txt').read())", language="python")])
+        assert result.output == "42\n\n"
+        result = executor.execute_code_blocks([
+            CodeBlock(code="# filename: hello.py\nprint('hello')", language="python"),
+            CodeBlock(code="python hello.py && cat result.txt", language="sh")])
+        assert (result.exit_code, result.output) == (0, "hello\nhello\n45")
+        result = executor.execute_code_blocks([CodeBlock(code="# filename: ../escape.py\nprint(1)", language="python")])
+        assert result.exit_code == 1 and not os.path.exists(os.path.join(executor_pool.workspace_path, "escape.py"))
+
+        result = executor.execute_code_blocks([CodeBlock(code="print('a')", language="python"),
+                                               CodeBlock(code="raise ValueError('boom')", language="python"),
+                                               CodeBlock(code="print('b')", language="python")])
+        assert result.exit_code == 1
+        assert result.output.startswith("a\nTraceback") and result.output.endswith("ValueError: boom\n")
+    finally:
+        executor_pool.close()
+
+
+def test_discussions_do_not_share_files_or_interpreters(tmp_path):
+    executor_pool = build_executor_pool(tmp_path)
+    executor = WarmCodeExecutor(executor_pool)
+    try:
+        code = "import os, sys\nos.environ['LEAKED'] = '1'\nsys.modules['leaked'] = sys\nopen('data.txt', 'w')"
+        assert executor.execute_code_blocks([CodeBlock(code=code, language="python")]).exit_code == 0
+        workspace = executor.workspace
+        executor.reset()
+        assert not os.path.exists(workspace)
+        code = "import os, sys\nprint(os.listdir('.'), 'LEAKED' in os.environ, 'leaked' in sys.modules)"
+        result = executor.execute_code_blocks([CodeBlock(code=code, language="python")])
+        assert result.output == "[] False False\n"
+    finally:
+        executor_pool.close()
+
+
+def test_timed_out_workers_are_replaced(tmp_path):
+    executor_pool = build_executor_pool(tmp_path, timeout=0.5)
+    workspace = str(tmp_path / "discussion")
+    try:
+        result = executor_pool.run_python("import time\ntime.sleep(5)", workspace)
+        assert result.exit_code == TIMEOUT_EXIT_CODE
+        assert executor_pool.run_python("print('still running')", workspace).output == "still running\n"
+    finally:
+        executor_pool.close()
+
+
+def test_identical_code_blocks_return_the_cached_result(tmp_path):
+    executor_pool = build_executor_pool(tmp_path)
+    executor = WarmCodeExecutor(executor_pool, execution_cache=ExecutionCache(max_entries=8, max_bytes=1024))
+    try:
+        code = "import random\nprint(random.random())"
+        result = executor.execute_code_blocks([CodeBlock(code=code, language="python")])
+        cached_result = executor.execute_code_blocks([CodeBlock(code=f"\n{code}  \r\n", language="Python")])
+        assert cached_result.output == CACHED_RESULT_MARKER + result.output
+        assert executor.execute_code_blocks([CodeBlock(code=code + "\n", language="python")]).output != result.output
+        executor_pool.installed_requirements.add("numpy")
+        assert executor.execute_code_blocks([CodeBlock(code=code, language="python")]).output != cached_result.output
+        executor.execution_cache.clear()
+        assert not executor.execute_code_blocks([CodeBlock(code=code, language="python")]).output.startswith(
+            CACHED_RESULT_MARKER)
+        assert executor.execution_cache.stats.misses == 1
+    finally:
+        executor_pool.close()
+
+
+def test_output_outside_of_the_runs_and_reads_of_stdin_do_not_break_the_protocol(tmp_path):
+    executor_pool = build_executor_pool(tmp_path)
+    workspace = str(tmp_path / "discussion")
+    try:
+        code = ("import sys, threading, time\n"
+                "threading.Thread(target=lambda: [time.sleep(0.1), print('late output')], daemon=True).start()\n"
+                "print(repr(sys.stdin.read()))")
+        assert executor_pool.run_python(code, workspace).output == "''\n"
+        time.sleep(0.3)
+        assert executor_pool.run_python("print('next run')", workspace).output == "next run\n"
+
+        # A line that is not a result of the protocol is a failure of the worker, which is replaced.
+        code = "import json, os, sys\nos.write(json.loads(sys.argv[1])['result_fd'], b'not a result\\n')"
+        assert executor_pool.run_python(code, workspace).output == WORKER_FAILED_MSG
+        assert executor_pool.run_python("print('replaced')", workspace).output == "replaced\n"
+    finally:
+        executor_pool.close()
+
+
+def test_workers_that_cannot_be_replaced_are_retried(tmp_path, monkeypatch):
+    executor_pool = build_executor_pool(tmp_path, max_runs_per_worker=1)
+    workspace = str(tmp_path / "discussion")
+    try:
+        executor_pool.start()
+        spawn_worker = executor_pool.spawn_worker
+
+        def fail_to_spawn_worker():
+            raise RuntimeError("The executor worker did not start")
+
+        monkeypatch.setattr(executor_pool, "spawn_worker", fail_to_spawn_worker)
+        assert executor_pool.run_python("print(1)", workspace).output == "1\n"
+        monkeypatch.setattr(executor_pool, "spawn_worker", spawn_worker)
+        assert executor_pool.run_python("print(2)", workspace).output == "2\n"
+    finally:
+        executor_pool.close()